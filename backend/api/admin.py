@@ -1,3 +1,19 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import Trip, TripJob
+
+
+@admin.register(Trip)
+class TripAdmin(admin.ModelAdmin):
+    list_display = ('trip_date', 'driver_id', 'pickup_location', 'dropoff_location', 'total_distance')
+    list_filter = ('trip_date',)
+    search_fields = ('driver_id', 'pickup_location', 'dropoff_location')
+    # Keep the changelist on the (trip_date, id) index and skip the full COUNT(*)
+    show_full_result_count = False
+
+
+@admin.register(TripJob)
+class TripJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'status', 'created_at', 'finished_at', 'expires_at')
+    list_filter = ('status',)
+    readonly_fields = ('request_key', 'request', 'result', 'error')
@@ -0,0 +1,193 @@
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timezone
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.runner import DiscoverRunner
+from django.test.utils import setup_test_environment, teardown_test_environment
+from api.services.fleet import FleetSimulator
+from api.services.hos_calculator import HOSCalculator
+from api.services.log_generator import LogGenerator
+from api.services.poi_index import BUNDLED_FACILITIES, POIIndex
+from api.services.response_cache import get_response_cache
+from api.services.route_cache import get_route_cache
+from logs.log_drawer import LogSheetDrawer
+from logs.svg_drawer import SVGLogSheetDrawer
+
+PLAN_DISTANCES = (50, 250, 500, 1000, 2500, 5000)
+MULTI_DAY_DISTANCE = 2500
+FLEET_SIZE = 2000
+FLEET_LOAD = {'pickup_location': 'Chicago, IL', 'dropoff_location': 'Dallas, TX'}
+TRIP_REQUEST = {
+    'current_location': 'San Francisco, CA',
+    'pickup_location': 'Sacramento, CA',
+    'dropoff_location': 'Los Angeles, CA',
+    'current_cycle_hours': 10,
+}
+
+
+def _route(distance):
+    return {
+        'total_distance': distance,
+        'points': [{'lat': 37.7749, 'lng': -122.4194}, {'lat': 34.0522, 'lng': -118.2437}],
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark the planner, log rendering and the calculate-trip endpoint, and compare with a baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--baseline', default=str(settings.BASE_DIR / 'benchmark_baseline.json'),
+                            help="Baseline JSON file to compare against (and write with --save)")
+        parser.add_argument('--save', action='store_true', help="Write this run as the new baseline")
+        parser.add_argument('--threshold', type=float, default=0.25,
+                            help="Allowed slowdown / memory growth over the baseline, as a fraction")
+        parser.add_argument('--repeat', type=int, default=20, help="Timed runs per benchmark")
+        parser.add_argument('--only', help="Run only benchmarks whose name contains this text")
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        runner = DiscoverRunner(verbosity=0)
+        # The endpoint benchmark saves trips; keep them out of the real database
+        old_config = runner.setup_databases()
+        try:
+            results = self._run(options)
+        finally:
+            runner.teardown_databases(old_config)
+            teardown_test_environment()
+
+        report = {
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'repeat': options['repeat'],
+            'results': results,
+        }
+        regressions = self._compare(results, options['baseline'], options['threshold'])
+        if options['save']:
+            with open(options['baseline'], 'w') as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+            self.stdout.write(f"Baseline written to {options['baseline']}")
+        if regressions and not options['save']:
+            raise CommandError(f"{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+
+    def _cases(self):
+        calculator = HOSCalculator()
+        for distance in PLAN_DISTANCES:
+            route = _route(distance)
+            yield f'plan_trip[{distance}mi]', lambda route=route: calculator.plan_trip(route, 10)
+        snapping = HOSCalculator(poi_index=POIIndex.from_csv(BUNDLED_FACILITIES))
+        route = _route(MULTI_DAY_DISTANCE)
+        yield f'plan_trip_snapped[{MULTI_DAY_DISTANCE}mi]', lambda: snapping.plan_trip(route, 10)
+        # A generous budget, so the case always times a completed search
+        yield (f'plan_trip_optimized[{MULTI_DAY_DISTANCE}mi]',
+               lambda: calculator.plan_trip_optimized(route, 10, time_budget=1.0))
+
+        drawer = LogSheetDrawer()
+        generator = LogGenerator()
+        plan = calculator.plan_trip(_route(MULTI_DAY_DISTANCE), 10)
+        day_data, day = next(generator.iter_days(plan, date(2024, 1, 1)))
+        yield 'draw_log_sheet', lambda: drawer.draw_log_sheet(day_data, day, {'name': 'Driver'})
+        svg_drawer = SVGLogSheetDrawer()
+        yield 'render_svg', lambda: svg_drawer.render_svg(day_data, day, {'name': 'Driver'})
+        yield (f'generate_logs[{MULTI_DAY_DISTANCE}mi]',
+               lambda: generator.generate_logs(plan, start_date=date(2024, 1, 1)))
+
+        # Serial, so the result does not depend on the machine's core count
+        simulator = FleetSimulator(executor='serial')
+        fleet = [
+            {'driver_id': f'driver-{i}', 'lat': 30 + i % 15, 'lng': -120 + i % 40, 'current_cycle_hours': i % 71}
+            for i in range(FLEET_SIZE)
+        ]
+        yield f'fleet_rank[{FLEET_SIZE} drivers]', lambda: simulator.rank(FLEET_LOAD, fleet)
+
+        client = Client()
+        route_cache = get_route_cache()
+        response_cache = get_response_cache()
+
+        def post_trip():
+            response = client.post('/api/calculate-trip/', TRIP_REQUEST, content_type='application/json')
+            if response.status_code != 200:
+                raise CommandError(f"calculate-trip returned {response.status_code}: {response.content[:200]}")
+
+        def calculate_trip():
+            route_cache.clear()
+            response_cache.clear()
+            post_trip()
+        yield 'calculate_trip_view', calculate_trip
+        # Served from the response cache: the lookup plus the history write
+        yield 'calculate_trip_view[cached]', post_trip
+
+    @staticmethod
+    def _calibrate(func, min_seconds=0.01):
+        """Calls per timed run, so sub-millisecond benchmarks are not lost in timer noise"""
+        func()  # warm-up: imports, templates, caches
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            if time.perf_counter() - start >= min_seconds or number >= 10000:
+                return number
+            number *= 10
+
+    def _run(self, options):
+        results = {}
+        for name, func in self._cases():
+            if options['only'] and options['only'] not in name:
+                continue
+            number = self._calibrate(func)
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                for _ in range(number):
+                    func()
+                timings.append((time.perf_counter() - start) / number)
+            # Separate traced run so tracemalloc overhead does not skew timings
+            tracemalloc.start()
+            func()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results[name] = {
+                'median_ms': statistics.median(timings) * 1000,
+                'min_ms': min(timings) * 1000,
+                'peak_kb': peak / 1024,
+            }
+            self.stdout.write(
+                f"{name:<28} median {results[name]['median_ms']:9.3f} ms  "
+                f"min {results[name]['min_ms']:9.3f} ms  peak {results[name]['peak_kb']:9.1f} KiB"
+            )
+            sys.stdout.flush()
+        return results
+
+    def _compare(self, results, path, threshold):
+        """Names of benchmarks slower or hungrier than baseline * (1 + threshold)"""
+        if not os.path.exists(path):
+            self.stdout.write(f"No baseline at {path}; run with --save to create one")
+            return []
+        with open(path) as fh:
+            baseline = json.load(fh).get('results', {})
+        regressions = []
+        for name, current in results.items():
+            previous = baseline.get(name)
+            if previous is None:
+                continue
+            for metric in ('median_ms', 'peak_kb'):
+                limit = previous[metric] * (1 + threshold)
+                if current[metric] > limit:
+                    regressions.append(name)
+                    self.stdout.write(self.style.ERROR(
+                        f"REGRESSION {name} {metric}: {current[metric]:.3f} > {limit:.3f} "
+                        f"(baseline {previous[metric]:.3f})"
+                    ))
+                    break
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(f"No regressions beyond {threshold:.0%} of {path}"))
+        return regressions
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from api.services.route_stub import make_stub_server, stub_base_url
+
+
+class Command(BaseCommand):
+    help = "Run a local stub routing server for ROUTE_PROVIDER=http"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8090)
+        parser.add_argument('--latency', type=float, default=0.0,
+                            help="Artificial delay per leg request in seconds")
+
+    def handle(self, *args, **options):
+        server = make_stub_server(options['host'], options['port'], options['latency'])
+        base_url = stub_base_url(server)
+        self.stdout.write(f"Stub route server on {base_url} (ROUTE_PROVIDER=http ROUTE_PROVIDER_URL={base_url})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-17 10:41
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Trip',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('driver_id', models.CharField(blank=True, default='', max_length=64)),
+                ('trip_date', models.DateField(default=datetime.date.today, help_text='Calendar date of the first log sheet')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('current_location', models.CharField(max_length=255)),
+                ('pickup_location', models.CharField(max_length=255)),
+                ('dropoff_location', models.CharField(max_length=255)),
+                ('current_cycle_hours', models.FloatField()),
+                ('total_distance', models.FloatField()),
+                ('total_time', models.FloatField()),
+                ('num_days', models.PositiveSmallIntegerField()),
+                ('stops', models.JSONField(default=list)),
+                ('log_sheet_ids', models.JSONField(default=list, help_text='SHA-256 digests of stored log sheet PNGs')),
+            ],
+            options={
+                'ordering': ['-trip_date', '-id'],
+                'indexes': [models.Index(fields=['driver_id', '-trip_date', '-id'], name='trip_driver_date_idx'), models.Index(fields=['-trip_date', '-id'], name='trip_date_idx')],
+            },
+        ),
+    ]
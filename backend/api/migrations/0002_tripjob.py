@@ -0,0 +1,39 @@
+# Generated by Django 4.2.7 on 2026-10-17 11:28
+
+import datetime
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TripJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('request_key', models.CharField(help_text='Canonical hash of the request and plan date', max_length=64)),
+                ('request', models.JSONField(help_text='Validated trip request with cycle hours resolved')),
+                ('plan_date', models.DateField(default=datetime.date.today)),
+                ('status', models.CharField(choices=[('queued', 'queued'), ('running', 'running'), ('succeeded', 'succeeded'), ('failed', 'failed')], default='queued', max_length=16)),
+                ('result', models.JSONField(blank=True, null=True)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, help_text='Finished jobs are purged after this', null=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['expires_at'], name='tripjob_expires_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='tripjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['queued', 'running'])), fields=('request_key',), name='tripjob_one_in_flight_per_key'),
+        ),
+    ]
@@ -1,3 +1,80 @@
+import uuid
+from datetime import date
+
 from django.db import models
+from django.db.models import Q
+
+
+class Trip(models.Model):
+    """
+    A calculated trip. Only the request, the summary figures and the stops
+    are kept; rendered log sheets stay in the sheet store and are referenced
+    by digest, so history queries never touch image data.
+    """
+    driver_id = models.CharField(max_length=64, blank=True, default='')
+    trip_date = models.DateField(default=date.today, help_text="Calendar date of the first log sheet")
+    created_at = models.DateTimeField(auto_now_add=True)
+    current_location = models.CharField(max_length=255)
+    pickup_location = models.CharField(max_length=255)
+    dropoff_location = models.CharField(max_length=255)
+    current_cycle_hours = models.FloatField()
+    total_distance = models.FloatField()
+    total_time = models.FloatField()
+    num_days = models.PositiveSmallIntegerField()
+    stops = models.JSONField(default=list)
+    log_sheet_ids = models.JSONField(default=list, help_text="SHA-256 digests of stored log sheet PNGs")
+
+    class Meta:
+        ordering = ['-trip_date', '-id']
+        indexes = [
+            # Keyset pagination walks (trip_date, id) descending, optionally per driver
+            models.Index(fields=['driver_id', '-trip_date', '-id'], name='trip_driver_date_idx'),
+            models.Index(fields=['-trip_date', '-id'], name='trip_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.pickup_location} -> {self.dropoff_location} ({self.trip_date})"
+
+
+class TripJob(models.Model):
+    """
+    A trip planned in the background. While a job is queued or running,
+    identical requests (same request_key) share it; the partial unique
+    constraint enforces that across worker processes. Finished jobs keep
+    their result until expires_at.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(s, s) for s in (QUEUED, RUNNING, SUCCEEDED, FAILED)]
+    IN_FLIGHT = (QUEUED, RUNNING)
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    request_key = models.CharField(max_length=64, help_text="Canonical hash of the request and plan date")
+    request = models.JSONField(help_text="Validated trip request with cycle hours resolved")
+    plan_date = models.DateField(default=date.today)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=QUEUED)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True, help_text="Finished jobs are purged after this")
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['request_key'], condition=Q(status__in=['queued', 'running']),
+                                    name='tripjob_one_in_flight_per_key'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at'], name='tripjob_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.id} ({self.status})"
 
-# Create your models here.
+    @property
+    def finished(self) -> bool:
+        return self.status not in self.IN_FLIGHT
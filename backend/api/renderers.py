@@ -0,0 +1,71 @@
+# backend/api/renderers.py
+import base64
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; ORJSONRenderer falls back to the stock encoder
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; MessagePackRenderer is only enabled when installed
+    msgpack = None
+
+_fallback_encoder = JSONEncoder()
+
+
+def _json_default(obj):
+    """Types orjson does not know: raw sheet bytes become base64, the rest follows DRF"""
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return base64.b64encode(obj).decode()
+    return _fallback_encoder.default(obj)
+
+
+def _msgpack_default(obj):
+    """Dates, decimals, lazy strings etc. in their DRF JSON form; bytes stay binary"""
+    return _fallback_encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in JSONRenderer backed by orjson, several times faster on the large
+    nested route and log payloads. Any `indent` media type parameter selects
+    orjson's two-space indentation.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        # Datetimes go through DRF's encoder so their format matches JSONRenderer
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_json_default, option=option)
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    application/msgpack responses. Views check `binary_images` and hand
+    inline log sheets over as raw bytes, which are packed as bin instead of
+    base64 text.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    binary_images = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_msgpack_default, use_bin_type=True)
+
+
+def binary_images(request) -> bool:
+    """Whether the negotiated renderer wants inline log sheets as raw bytes"""
+    return getattr(getattr(request, 'accepted_renderer', None), 'binary_images', False)
@@ -1,6 +1,8 @@
 # backend/api/serializers.py
+from django.conf import settings
 from rest_framework import serializers
 from drf_spectacular.utils import extend_schema_serializer, OpenApiExample
+from .services.trip_history import DEFAULT_FIELDS, HISTORY_FIELDS, decode_cursor
 
 @extend_schema_serializer(
     examples=[
@@ -34,8 +36,143 @@ class TripRequestSerializer(serializers.Serializer):
     current_cycle_hours = serializers.FloatField(
         min_value=0, 
         max_value=70,
+        required=False,
         help_text="Hours already used in current 70-hour/8-day cycle"
     )
+    driver_id = serializers.CharField(
+        max_length=64,
+        required=False,
+        help_text="Driver whose logged cycle is used when current_cycle_hours is omitted"
+    )
+    log_image_mode = serializers.ChoiceField(
+        choices=['inline', 'url'],
+        default='inline',
+        help_text="'inline' embeds the sheets in the response; 'url' returns cacheable sheet URLs"
+    )
+    log_image_format = serializers.ChoiceField(
+        choices=['png', 'svg'],
+        default='png',
+        help_text="'png' raster sheets, or 'svg' vector sheets (a few KB each, inlined as log_svg)"
+    )
+    planning_mode = serializers.ChoiceField(
+        choices=['greedy', 'optimized'],
+        default='greedy',
+        help_text="'optimized' searches split sleeper-berth rests and break placement for a faster plan "
+                  "within a time budget, falling back to the greedy plan"
+    )
+
+    def validate(self, attrs):
+        if 'current_cycle_hours' not in attrs and not attrs.get('driver_id'):
+            raise serializers.ValidationError({
+                'current_cycle_hours': "Provide current_cycle_hours or a driver_id with logged duty days."
+            })
+        return attrs
+
+class BulkTripRequestSerializer(serializers.Serializer):
+    trips = TripRequestSerializer(
+        many=True,
+        allow_empty=False,
+        help_text="Trips to plan; results stream back in the same order"
+    )
+    include_logs = serializers.BooleanField(
+        default=False,
+        help_text="Render ELD log sheets for every trip (slow for large batches)"
+    )
+
+    def validate_trips(self, value):
+        max_trips = settings.BULK_TRIP_MAX_TRIPS
+        if len(value) > max_trips:
+            raise serializers.ValidationError(f"At most {max_trips} trips per request.")
+        return value
+
+class FleetLoadSerializer(serializers.Serializer):
+    pickup_location = serializers.CharField(max_length=200)
+    dropoff_location = serializers.CharField(max_length=200)
+
+class FleetDriverSerializer(serializers.Serializer):
+    driver_id = serializers.CharField(max_length=64)
+    current_location = serializers.CharField(
+        max_length=200,
+        required=False,
+        help_text="Driver's current city; alternatively send lat and lng"
+    )
+    lat = serializers.FloatField(min_value=-90, max_value=90, required=False)
+    lng = serializers.FloatField(min_value=-180, max_value=180, required=False)
+    current_cycle_hours = serializers.FloatField(
+        min_value=0,
+        max_value=70,
+        required=False,
+        help_text=("Hours used in the 70-hour/8-day cycle; read from the driver's logged duty days "
+                   "as of available_at when omitted")
+    )
+    available_at = serializers.DateTimeField(
+        required=False,
+        help_text="When the driver can start (defaults to now)"
+    )
+
+    def validate(self, attrs):
+        if ('lat' in attrs) != ('lng' in attrs):
+            raise serializers.ValidationError({'lng': "Send lat and lng together."})
+        if 'lat' not in attrs and not attrs.get('current_location'):
+            raise serializers.ValidationError({'current_location': "Provide current_location or lat and lng."})
+        return attrs
+
+class FleetSimulationRequestSerializer(serializers.Serializer):
+    load = FleetLoadSerializer()
+    drivers = FleetDriverSerializer(
+        many=True,
+        allow_empty=False,
+        help_text="Candidate drivers with their position and cycle state"
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        required=False,
+        help_text="Return only the first limit drivers of the ranking"
+    )
+
+    def validate_drivers(self, value):
+        max_drivers = settings.FLEET_SIM_MAX_DRIVERS
+        if len(value) > max_drivers:
+            raise serializers.ValidationError(f"At most {max_drivers} drivers per request.")
+        return value
+
+class DutySegmentSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=['off_duty', 'sleeper_berth', 'driving', 'on_duty_not_driving'])
+    duration = serializers.FloatField(min_value=0, max_value=24 * 60, help_text="Duration in minutes")
+
+class DutyDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    on_duty_hours = serializers.FloatField(
+        min_value=0,
+        max_value=24,
+        required=False,
+        help_text="Driving plus on-duty (not driving) hours for the day"
+    )
+    segments = DutySegmentSerializer(
+        many=True,
+        required=False,
+        help_text="Chronological duty-status segments; enables exact 34-hour restart detection"
+    )
+
+    def validate(self, attrs):
+        segments = attrs.get('segments')
+        if segments:
+            if sum(s['duration'] for s in segments) > 24 * 60:
+                raise serializers.ValidationError({'segments': "Segments exceed 24 hours."})
+            attrs['on_duty_hours'] = sum(
+                s['duration'] for s in segments if s['status'] in ('driving', 'on_duty_not_driving')
+            ) / 60
+        elif 'on_duty_hours' not in attrs:
+            raise serializers.ValidationError({'on_duty_hours': "Provide on_duty_hours or segments."})
+        return attrs
+
+class CycleStatusSerializer(serializers.Serializer):
+    driver_id = serializers.CharField()
+    as_of = serializers.DateField()
+    used_hours = serializers.FloatField()
+    remaining_hours = serializers.FloatField()
+    last_logged_day = serializers.DateField(allow_null=True)
+    last_restart = serializers.DateField(allow_null=True)
 
 class StopSerializer(serializers.Serializer):
     type = serializers.ChoiceField(choices=['rest', 'fuel', 'break', 'pickup', 'dropoff'])
@@ -43,6 +180,10 @@ class StopSerializer(serializers.Serializer):
     duration = serializers.IntegerField(help_text="Duration in minutes")
     description = serializers.CharField()
     location = serializers.DictField(required=False)
+    facility = serializers.DictField(
+        required=False,
+        help_text="Truck stop or fuel station the stop was placed at: name, type, offset_miles from the route"
+    )
 
 class LogSheetSerializer(serializers.Serializer):
     day = serializers.IntegerField()
@@ -51,7 +192,9 @@ class LogSheetSerializer(serializers.Serializer):
     on_duty_hours = serializers.FloatField()
     off_duty_hours = serializers.FloatField()
     sleeper_berth_hours = serializers.FloatField(default=0)
-    log_image = serializers.CharField(help_text="Base64 encoded log sheet image")
+    log_image = serializers.CharField(required=False, help_text="Base64 encoded log sheet image")
+    log_svg = serializers.CharField(required=False, help_text="SVG markup when log_image_format is 'svg'")
+    log_image_url = serializers.URLField(required=False, help_text="URL of the sheet when log_image_mode is 'url'")
 
 class TripResponseSerializer(serializers.Serializer):
     route = serializers.JSONField(help_text="Route coordinates and details")
@@ -59,4 +202,61 @@ class TripResponseSerializer(serializers.Serializer):
     log_sheets = LogSheetSerializer(many=True)
     total_distance = serializers.FloatField(help_text="Total trip distance in miles")
     total_time = serializers.FloatField(help_text="Total trip time in hours")
-    fuel_stops = StopSerializer(many=True)
\ No newline at end of file
+    fuel_stops = StopSerializer(many=True)
+    planner = serializers.DictField(
+        required=False,
+        help_text="With planning_mode 'optimized': which plan was used, why, hours saved and search effort"
+    )
+
+class TripJobSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    status = serializers.ChoiceField(choices=['queued', 'running', 'succeeded', 'failed'])
+    status_url = serializers.URLField(help_text="Poll here (GET, optionally with ?wait=seconds)")
+    deduplicated = serializers.BooleanField(
+        required=False,
+        help_text="On submit: an identical request was already in flight and this is its job"
+    )
+    created_at = serializers.DateTimeField()
+    started_at = serializers.DateTimeField(allow_null=True)
+    finished_at = serializers.DateTimeField(allow_null=True)
+    expires_at = serializers.DateTimeField(allow_null=True, help_text="When a finished job's result is deleted")
+    result = TripResponseSerializer(required=False, help_text="The calculate-trip response, once succeeded")
+    error = serializers.CharField(required=False, help_text="Why the job failed")
+
+class TripJobQuerySerializer(serializers.Serializer):
+    wait = serializers.FloatField(
+        min_value=0,
+        default=0,
+        help_text="Seconds to wait for an unfinished job before answering (capped by TRIP_JOB_MAX_WAIT)"
+    )
+
+class TripHistoryQuerySerializer(serializers.Serializer):
+    start_date = serializers.DateField(required=False)
+    end_date = serializers.DateField(required=False)
+    driver_id = serializers.CharField(max_length=64, required=False)
+    cursor = serializers.CharField(required=False, help_text="next_cursor from the previous page")
+    limit = serializers.IntegerField(min_value=1, max_value=500, default=50)
+    fields = serializers.CharField(
+        required=False,
+        help_text=f"Comma-separated subset of: {', '.join(HISTORY_FIELDS)}"
+    )
+
+    def validate_cursor(self, value):
+        try:
+            decode_cursor(value)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+        return value
+
+    def validate_fields(self, value):
+        fields = [f.strip() for f in value.split(',') if f.strip()]
+        unknown = sorted(set(fields) - set(HISTORY_FIELDS))
+        if unknown:
+            raise serializers.ValidationError(f"Unknown fields: {', '.join(unknown)}")
+        return fields
+
+    def validate(self, attrs):
+        attrs.setdefault('fields', list(DEFAULT_FIELDS))
+        if 'start_date' in attrs and 'end_date' in attrs and attrs['start_date'] > attrs['end_date']:
+            raise serializers.ValidationError({'end_date': "end_date must not be before start_date."})
+        return attrs
@@ -0,0 +1,176 @@
+# backend/api/services/fleet.py
+import math
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from django.conf import settings
+from django.utils import timezone
+from .geocoder import OfflineGeocoder, get_geocoder
+from .hos_calculator import HOSCalculator
+from .metrics import StageTimings
+from .pools import EXECUTOR_PROCESS, EXECUTOR_SERIAL, EXECUTOR_THREAD, get_pool
+from .route_calculator import RouteCalculator
+from .route_geometry import distances_to
+from .trip_planner import TripPlanner
+
+# Road miles per great-circle mile for the deadhead leg to pickup
+DEADHEAD_CIRCUITY = 1.2
+
+# Planner used by pool workers (one per worker process / shared by threads)
+_worker_calculator = None
+
+
+def _simulate_chunk(rows: Sequence[Tuple[int, float, float]]) -> List[Tuple[int, float, int, int]]:
+    """
+    Plan (index, total_distance, cycle_hours) rows in a pool worker.
+    Returns (index, elapsed_minutes, rest_stops, restarts) per row; only
+    plain numbers cross the process boundary.
+    """
+    global _worker_calculator
+    if _worker_calculator is None:
+        _worker_calculator = HOSCalculator()
+    return [_simulate_row(_worker_calculator, row) for row in rows]
+
+
+def _simulate_row(calculator: HOSCalculator, row: Tuple[int, float, float]) -> Tuple[int, float, int, int]:
+    index, distance, cycle_hours = row
+    plan = calculator.plan_trip({'total_distance': distance}, cycle_hours, start_minute=0)
+    rests = restarts = 0
+    for stop in plan.stops:
+        if stop.type == 'rest':
+            if stop.duration == calculator.RESTART_HOURS * 60:
+                restarts += 1
+            else:
+                rests += 1
+    return index, plan.timeline[-1].end_minute, rests, restarts
+
+
+_fleet_simulator = None
+_fleet_simulator_lock = threading.Lock()
+
+
+class FleetSimulator:
+    """
+    Ranks drivers by the earliest HOS-compliant delivery of one load.
+    The loaded leg is routed once; each driver's deadhead to pickup is a
+    great-circle estimate, and every driver's trip is then planned against
+    their own cycle hours, spread over a worker pool in chunks.
+    """
+
+    def __init__(self, route_calculator: RouteCalculator = None, geocoder: OfflineGeocoder = None,
+                 executor: Optional[str] = None, max_workers: Optional[int] = None,
+                 min_parallel_drivers: Optional[int] = None):
+        """
+        executor: 'serial', 'thread' or 'process' (settings.FLEET_SIM_EXECUTOR
+        by default). Fleets smaller than min_parallel_drivers are planned serially.
+        """
+        executor = executor or settings.FLEET_SIM_EXECUTOR
+        if executor not in (EXECUTOR_SERIAL, EXECUTOR_THREAD, EXECUTOR_PROCESS):
+            raise ValueError(f"Unknown fleet simulation executor: {executor}")
+        self.route_calculator = route_calculator or RouteCalculator()
+        self.geocoder = geocoder or get_geocoder()
+        self.hos_calculator = HOSCalculator()
+        self.executor = executor
+        self.max_workers = max_workers or settings.FLEET_SIM_WORKERS or os.cpu_count() or 1
+        self.min_parallel_drivers = (settings.FLEET_SIM_MIN_PARALLEL_DRIVERS
+                                     if min_parallel_drivers is None else min_parallel_drivers)
+
+    def rank(self, load: Dict, drivers: List[Dict], now: Optional[datetime] = None,
+             limit: Optional[int] = None, timings: Optional[StageTimings] = None) -> Dict:
+        """
+        load: {'pickup_location', 'dropoff_location'}; drivers: dicts with
+        'driver_id', 'current_location' or 'lat'/'lng', and optionally
+        'current_cycle_hours' (else read from the driver's ledger) and
+        'available_at' (else now). Returns the ranked arrivals plus the
+        drivers whose position could not be resolved.
+        """
+        timings = timings or StageTimings()
+        now = now or timezone.now()
+        with timings.stage('cycle'):
+            # Each ledger is read as of the day that driver becomes available
+            by_date = {}
+            for driver in drivers:
+                by_date.setdefault((driver.get('available_at') or now).date(), []).append(driver)
+            for as_of, group in by_date.items():
+                TripPlanner.resolve_cycle_hours(group, as_of)
+        with timings.stage('route'):
+            pickup, loaded_miles = self._loaded_leg(load)
+            located, unresolved = self._locate(drivers)
+            deadhead = distances_to([d[1] for d in located], [d[2] for d in located], pickup['lat'], pickup['lng'])
+        rows = [
+            (index, round(miles * DEADHEAD_CIRCUITY, 1) + loaded_miles, drivers[index]['current_cycle_hours'])
+            for (index, _, _), miles in zip(located, deadhead)
+        ]
+        with timings.stage('simulate'):
+            simulated = self._simulate(rows)
+
+        distances = {index: distance for index, distance, _ in rows}
+        rankings = []
+        for index, elapsed, rests, restarts in simulated:
+            driver = drivers[index]
+            rankings.append({
+                'driver_id': driver['driver_id'],
+                'arrival': (driver.get('available_at') or now) + timedelta(minutes=elapsed),
+                'elapsed_hours': round(elapsed / 60, 2),
+                'deadhead_miles': round(distances[index] - loaded_miles, 1),
+                'total_miles': round(distances[index], 1),
+                'current_cycle_hours': driver['current_cycle_hours'],
+                'rest_stops': rests,
+                'restarts': restarts,
+            })
+        rankings.sort(key=lambda r: (r['arrival'], r['driver_id']))
+        if limit is not None:
+            rankings = rankings[:limit]
+        for rank, entry in enumerate(rankings, 1):
+            entry['rank'] = rank
+        return {
+            'pickup_location': load['pickup_location'],
+            'dropoff_location': load['dropoff_location'],
+            'loaded_miles': loaded_miles,
+            'drivers_ranked': len(simulated),
+            'rankings': rankings,
+            'unresolved': unresolved,
+        }
+
+    def _loaded_leg(self, load: Dict) -> Tuple[Dict, float]:
+        pickup = self.geocoder.resolve(load['pickup_location'])
+        if pickup is None:
+            raise ValueError(f"Unknown pickup location: {load['pickup_location']}")
+        # Same leg numbering as calculate-trip, where pickup -> dropoff is the second leg
+        leg = self.route_calculator.calculate_leg(load['pickup_location'], load['dropoff_location'], index=1)
+        return pickup, leg['distance']
+
+    def _locate(self, drivers: List[Dict]) -> Tuple[List[Tuple[int, float, float]], List[Dict]]:
+        located, unresolved = [], []
+        for index, driver in enumerate(drivers):
+            if driver.get('lat') is not None:
+                located.append((index, driver['lat'], driver['lng']))
+                continue
+            point = self.geocoder.resolve(driver['current_location'])
+            if point is None:
+                unresolved.append({'driver_id': driver['driver_id'],
+                                   'error': f"Unknown location: {driver['current_location']}"})
+            else:
+                located.append((index, point['lat'], point['lng']))
+        return located, unresolved
+
+    def _simulate(self, rows: List[Tuple[int, float, float]]) -> List[Tuple[int, float, int, int]]:
+        workers = min(self.max_workers, len(rows))
+        if self.executor == EXECUTOR_SERIAL or workers < 2 or len(rows) < self.min_parallel_drivers:
+            return [_simulate_row(self.hos_calculator, row) for row in rows]
+        # A few chunks per worker: amortizes pickling while keeping the tail short
+        size = math.ceil(len(rows) / (workers * 4))
+        chunks = [rows[i:i + size] for i in range(0, len(rows), size)]
+        pool = get_pool(self.executor, self.max_workers)
+        return [result for chunk in pool.map(_simulate_chunk, chunks) for result in chunk]
+
+
+def get_fleet_simulator() -> FleetSimulator:
+    """Process-wide simulator configured from settings"""
+    global _fleet_simulator
+    if _fleet_simulator is None:
+        with _fleet_simulator_lock:
+            if _fleet_simulator is None:
+                _fleet_simulator = FleetSimulator()
+    return _fleet_simulator
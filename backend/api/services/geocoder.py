@@ -0,0 +1,138 @@
+# backend/api/services/geocoder.py
+import csv
+import difflib
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.conf import settings
+from .route_cache import normalize_location
+
+BUNDLED_GAZETTEER = Path(__file__).resolve().parent.parent / 'data' / 'us_cities.csv'
+
+STATE_ABBREVIATIONS = {
+    'alabama': 'al', 'alaska': 'ak', 'arizona': 'az', 'arkansas': 'ar', 'california': 'ca',
+    'colorado': 'co', 'connecticut': 'ct', 'delaware': 'de', 'district of columbia': 'dc',
+    'florida': 'fl', 'georgia': 'ga', 'hawaii': 'hi', 'idaho': 'id', 'illinois': 'il',
+    'indiana': 'in', 'iowa': 'ia', 'kansas': 'ks', 'kentucky': 'ky', 'louisiana': 'la',
+    'maine': 'me', 'maryland': 'md', 'massachusetts': 'ma', 'michigan': 'mi', 'minnesota': 'mn',
+    'mississippi': 'ms', 'missouri': 'mo', 'montana': 'mt', 'nebraska': 'ne', 'nevada': 'nv',
+    'new hampshire': 'nh', 'new jersey': 'nj', 'new mexico': 'nm', 'new york': 'ny',
+    'north carolina': 'nc', 'north dakota': 'nd', 'ohio': 'oh', 'oklahoma': 'ok', 'oregon': 'or',
+    'pennsylvania': 'pa', 'rhode island': 'ri', 'south carolina': 'sc', 'south dakota': 'sd',
+    'tennessee': 'tn', 'texas': 'tx', 'utah': 'ut', 'vermont': 'vt', 'virginia': 'va',
+    'washington': 'wa', 'west virginia': 'wv', 'wisconsin': 'wi', 'wyoming': 'wy',
+}
+_STATE_CODES = set(STATE_ABBREVIATIONS.values())
+_COUNTRY_SUFFIX = re.compile(r'(,\s*|\s+)(usa|us|united states( of america)?)$')
+_SAINT = re.compile(r'\b(saint|st)\b\.?')
+
+
+def canonical_location(location: str) -> str:
+    """
+    Canonical "city, st" key: case/whitespace folded, country suffix dropped,
+    state names abbreviated and "Saint"/"St." unified ("St. Louis, Missouri" -> "st louis, mo")
+    """
+    text = _COUNTRY_SUFFIX.sub('', normalize_location(location))
+    text = _SAINT.sub('st', text).replace('.', '')
+    if ',' in text:
+        city, _, state = text.rpartition(',')
+        state = state.strip()
+        return f"{city.strip()}, {STATE_ABBREVIATIONS.get(state, state)}"
+    # "Philadelphia PA" / "Trenton New Jersey" without a comma
+    words = text.split(' ')
+    for n in (3, 2, 1):
+        if len(words) > n:
+            tail = ' '.join(words[-n:])
+            state = STATE_ABBREVIATIONS.get(tail) or (tail if tail in _STATE_CODES else None)
+            if state:
+                return f"{' '.join(words[:-n])}, {state}"
+    return text
+
+
+class OfflineGeocoder:
+    """
+    In-memory gazetteer index for US "City, ST" locations.
+    Keys are kept in one sorted list (exact lookups via a dict, prefix search
+    via bisect) and coordinates in packed float arrays, so the whole index
+    stays compact and every lookup avoids network calls.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[str, str, float, float]]):
+        entries = {}
+        for city, state, lat, lng in rows:
+            name = f"{city.strip()}, {state.strip().upper()}"
+            entries.setdefault(canonical_location(name), (name, float(lat), float(lng)))
+        self._keys = sorted(entries)
+        self._names = [entries[key][0] for key in self._keys]
+        self._lat = array('d', (entries[key][1] for key in self._keys))
+        self._lng = array('d', (entries[key][2] for key in self._keys))
+        self._index = {key: i for i, key in enumerate(self._keys)}
+        # Fuzzy candidates are bucketed by first letter to keep difflib cheap
+        self._buckets = {}
+        for key in self._keys:
+            self._buckets.setdefault(key[:1], []).append(key)
+
+    @classmethod
+    def from_csv(cls, path) -> 'OfflineGeocoder':
+        """Load a gazetteer CSV with city, state, lat, lng columns"""
+        with open(path, newline='', encoding='utf-8') as fh:
+            reader = csv.DictReader(fh)
+            return cls((row['city'], row['state'], row['lat'], row['lng']) for row in reader)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _result(self, i: int) -> Dict:
+        return {'name': self._names[i], 'lat': self._lat[i], 'lng': self._lng[i]}
+
+    def lookup(self, location: str) -> Optional[Dict]:
+        """Exact match on the canonical form"""
+        i = self._index.get(canonical_location(location))
+        return None if i is None else self._result(i)
+
+    def prefix(self, text: str, limit: int = 10) -> List[Dict]:
+        """Locations whose canonical key starts with text (autocomplete)"""
+        query = canonical_location(text) if ',' in text else normalize_location(text).replace('.', '')
+        query = _SAINT.sub('st', query)
+        results = []
+        i = bisect_left(self._keys, query)
+        while i < len(self._keys) and len(results) < limit and self._keys[i].startswith(query):
+            results.append(self._result(i))
+            i += 1
+        return results
+
+    def fuzzy(self, text: str, limit: int = 5, cutoff: float = 0.85) -> List[Dict]:
+        """Closest keys by similarity ratio, for typos such as "Philadelpia, PA" """
+        query = canonical_location(text)
+        candidates = self._buckets.get(query[:1], ())
+        matches = difflib.get_close_matches(query, candidates, n=limit, cutoff=cutoff)
+        return [self._result(self._index[key]) for key in matches]
+
+    def resolve(self, location: str, cutoff: float = 0.85) -> Optional[Dict]:
+        """Exact match, then an unambiguous prefix, then the best fuzzy match"""
+        result = self.lookup(location)
+        if result is not None:
+            return result
+        matches = self.prefix(location, limit=2)
+        if matches:
+            # Several prefix hits ("Portland") are ambiguous, not typos
+            return matches[0] if len(matches) == 1 else None
+        matches = self.fuzzy(location, limit=1, cutoff=cutoff)
+        return matches[0] if matches else None
+
+
+_geocoder = None
+_geocoder_lock = threading.Lock()
+
+
+def get_geocoder() -> OfflineGeocoder:
+    """Process-wide geocoder loaded from settings.GEOCODER['GAZETTEER'] (or the bundled CSV)"""
+    global _geocoder
+    if _geocoder is None:
+        with _geocoder_lock:
+            if _geocoder is None:
+                _geocoder = OfflineGeocoder.from_csv(settings.GEOCODER['GAZETTEER'] or BUNDLED_GAZETTEER)
+    return _geocoder
@@ -0,0 +1,163 @@
+# backend/api/services/hos_batch.py
+import math
+from typing import Dict, List, Sequence
+from .optional_deps import numpy
+from .trip_plan import DutyDay
+
+
+class BatchTripPlan:
+    """
+    Column-oriented result of planning many trips at once.
+    Every attribute is an array (or list) with one entry per trip; use
+    days(i) / summary(i) to expand a single trip into plan_trip's shape.
+    """
+
+    __slots__ = (
+        'distances', 'cycle_hours', 'num_days', 'break_stops', 'rest_stops',
+        'fuel_stops', 'last_day_break', 'last_day_driving', 'total_driving', 'total_on_duty_not_driving',
+        'total_time', '_max_driving', '_chunk_miles', '_fuel_interval', '_fuel_hours', '_pickup_hours',
+        '_dropoff_hours', '_scalar_days',
+    )
+
+    def __len__(self):
+        return len(self.distances)
+
+    def days(self, i: int) -> List[DutyDay]:
+        """Per-day totals for trip i, identical to plan_trip(...).days"""
+        if i in self._scalar_days:
+            return self._scalar_days[i]
+        n = int(self.num_days[i])
+        distance = float(self.distances[i])
+        days = []
+        fuel_before = 0
+        for j in range(n):
+            last = j == n - 1
+            # Fuel stops between this day's first mile and the next day's
+            fuel_after = self._fuel_stops_before(distance if last else (j + 1) * self._chunk_miles, distance)
+            days.append(DutyDay(
+                driving=float(self.last_day_driving[i]) if last else self._max_driving,
+                on_duty_not_driving=((self._pickup_hours if j == 0 else 0)
+                                     + (fuel_after - fuel_before) * self._fuel_hours
+                                     + (self._dropoff_hours if last else 0)),
+                break_taken=bool(self.last_day_break[i]) if last else True,
+            ))
+            fuel_before = fuel_after
+        return days
+
+    def _fuel_stops_before(self, mile: float, distance: float) -> int:
+        """Fuel stops the greedy plan makes before this mile of a trip of distance miles"""
+        mile = min(mile, distance)
+        return math.ceil(mile / self._fuel_interval) - 1 if mile > 0 else 0
+
+    def summary(self, i: int) -> Dict:
+        return {
+            'distance': float(self.distances[i]),
+            'num_days': int(self.num_days[i]),
+            'break_stops': int(self.break_stops[i]),
+            'rest_stops': int(self.rest_stops[i]),
+            'fuel_stops': int(self.fuel_stops[i]),
+            'total_time': float(self.total_time[i]),
+        }
+
+
+def plan_batch(calculator, distances: Sequence[float], cycle_hours: Sequence[float] = None) -> BatchTripPlan:
+    """
+    Closed-form equivalent of calculator.plan_trip for many trips.
+
+    The greedy planner drives in MAX_DRIVING_HOURS chunks; every chunk that is
+    not the last one has a 30-minute break after BREAK_AFTER_DRIVING_HOURS and
+    ends with a 10-hour rest, and a fuel stop falls at every FUEL_INTERVAL_MILES
+    multiple short of the destination, counted as on-duty time of the day it
+    falls in. The last day gets a break when it drives longer than
+    BREAK_AFTER_DRIVING_HOURS. With the regulation constants the 11-hour
+    driving limit always binds before the 14-hour duty window, so each trip
+    reduces to a handful of array ops.
+    Trips whose on-duty time would exceed the remaining 70-hour cycle need
+    34-hour restarts; those rows (usually a small minority) are planned with
+    plan_trip and written back into the columns.
+    """
+    speed = calculator.AVERAGE_SPEED_MPH
+    max_driving = calculator.MAX_DRIVING_HOURS
+    chunk_miles = max_driving * speed
+    fuel_interval = calculator.FUEL_INTERVAL_MILES
+    # A last day driving longer than this (beyond float slack) takes the break
+    break_hours = calculator.BREAK_AFTER_DRIVING_HOURS + calculator.HOURS_EPSILON
+    fixed_hours = calculator.PICKUP_HOURS + calculator.DROPOFF_HOURS
+
+    if cycle_hours is None:
+        cycle_hours = [0.0] * len(distances)
+    if len(cycle_hours) != len(distances):
+        raise ValueError("distances and cycle_hours must have the same length")
+
+    plan = BatchTripPlan()
+    plan._max_driving = max_driving
+    plan._chunk_miles = chunk_miles
+    plan._fuel_interval = fuel_interval
+    plan._pickup_hours = calculator.PICKUP_HOURS
+    plan._dropoff_hours = calculator.DROPOFF_HOURS
+    plan._scalar_days = {}
+    fuel_hours = calculator.FUEL_STOP_MINUTES / 60
+    plan._fuel_hours = fuel_hours
+    # Trips that use the cycle exactly are left to plan_trip, whose running
+    # float total may fall just short and take a restart
+    cycle_limit = calculator.MAX_WEEKLY_HOURS - 1e-9
+
+    np = numpy()
+    if np is not None:
+        d = np.asarray(distances, dtype=np.float64)
+        hours = d / speed
+        num_days = np.where(d > 0, np.ceil(hours / max_driving), 1).astype(np.int64)
+        num_days = np.maximum(num_days, 1)
+        boundaries = num_days - 1
+        plan.distances = d
+        plan.cycle_hours = np.asarray(cycle_hours, dtype=np.float64)
+        plan.num_days = num_days
+        plan.break_stops = boundaries.copy()
+        plan.rest_stops = boundaries.copy()
+        plan.fuel_stops = np.where(d > 0, np.ceil(d / fuel_interval) - 1, 0).astype(np.int64)
+        plan.last_day_driving = (d - boundaries * chunk_miles) / speed
+        plan.last_day_break = plan.last_day_driving > break_hours
+        plan.break_stops += plan.last_day_break
+        plan.total_driving = hours
+        plan.total_on_duty_not_driving = fixed_hours + plan.fuel_stops * fuel_hours
+        plan.total_time = hours + plan.total_on_duty_not_driving
+        cycle_needed = plan.cycle_hours + plan.total_time
+        for i in np.flatnonzero(cycle_needed > cycle_limit):
+            _plan_scalar_row(calculator, plan, int(i))
+        return plan
+
+    d = [float(x) for x in distances]
+    hours = [x / speed for x in d]
+    num_days = [max(1, math.ceil(h / max_driving)) if x > 0 else 1 for x, h in zip(d, hours)]
+    boundaries = [n - 1 for n in num_days]
+    plan.distances = d
+    plan.cycle_hours = [float(x) for x in cycle_hours]
+    plan.num_days = num_days
+    plan.rest_stops = list(boundaries)
+    plan.fuel_stops = [math.ceil(x / fuel_interval) - 1 if x > 0 else 0 for x in d]
+    plan.last_day_driving = [(x - b * chunk_miles) / speed for x, b in zip(d, boundaries)]
+    plan.last_day_break = [driving > break_hours for driving in plan.last_day_driving]
+    plan.break_stops = [b + brk for b, brk in zip(boundaries, plan.last_day_break)]
+    plan.total_driving = hours
+    plan.total_on_duty_not_driving = [fixed_hours + fuel * fuel_hours for fuel in plan.fuel_stops]
+    plan.total_time = [h + on_duty for h, on_duty in zip(hours, plan.total_on_duty_not_driving)]
+    for i in range(len(d)):
+        if plan.cycle_hours[i] + plan.total_time[i] > cycle_limit:
+            _plan_scalar_row(calculator, plan, i)
+    return plan
+
+
+def _plan_scalar_row(calculator, plan: BatchTripPlan, i: int) -> None:
+    """Plan row i with the scalar engine (cycle restarts) and store it in the columns"""
+    result = calculator.plan_trip({'total_distance': float(plan.distances[i])}, float(plan.cycle_hours[i]))
+    days = result.days
+    types = [stop.type for stop in result.stops]
+    plan.num_days[i] = len(days)
+    plan.break_stops[i] = types.count('break')
+    plan.last_day_break[i] = days[-1].break_taken
+    plan.rest_stops[i] = types.count('rest')
+    plan.fuel_stops[i] = types.count('fuel')
+    plan.last_day_driving[i] = days[-1].driving
+    plan.total_on_duty_not_driving[i] = sum(day.on_duty_not_driving for day in days)
+    plan.total_time[i] = result.total_time
+    plan._scalar_days[i] = days
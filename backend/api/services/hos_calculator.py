@@ -1,5 +1,12 @@
 # backend/api/services/hos_calculator.py
+import math
 from datetime import datetime, timedelta
+from .hos_batch import plan_batch
+from .hos_optimizer import plan_optimized
+from .poi_index import FUEL, REST_AREA, TRUCK_STOP
+from .route_geometry import RouteGeometry
+from .timeline import DRIVING, OFF_DUTY, ON_DUTY_NOT_DRIVING, TimelineBuilder
+from .trip_plan import DutyDay, Stop, TripPlan
 
 class HOSCalculator:
     """
@@ -10,97 +17,213 @@ class HOSCalculator:
     MAX_DRIVING_HOURS = 11  # Maximum driving in 14-hour window
     MAX_DUTY_HOURS = 14     # Maximum on-duty time
     REQUIRED_BREAK_MINUTES = 30  # Required after 8 hours driving
+    BREAK_AFTER_DRIVING_HOURS = 8
     MIN_OFF_DUTY_HOURS = 10  # Minimum consecutive off-duty hours
     MAX_WEEKLY_HOURS = 70   # Maximum in 8 days
+    AVERAGE_SPEED_MPH = 55
+    FUEL_INTERVAL_MILES = 1000
+    PICKUP_HOURS = 1        # On-duty (not driving) time at pickup
+    DROPOFF_HOURS = 1       # On-duty (not driving) time at dropoff
+    FUEL_STOP_MINUTES = 30
+    RESTART_HOURS = 34      # Off-duty period that resets the 70-hour cycle
+    DEFAULT_START_MINUTE = 8 * 60  # Trips start at 08:00 on day one
+    MILE_EPSILON = 1e-6     # Float slack when checking whether a mile mark was reached
+    HOURS_EPSILON = 1e-9    # Float slack when checking whether a driving limit was reached
+    REST_FACILITIES = (TRUCK_STOP, REST_AREA)
+    FUEL_FACILITIES = (TRUCK_STOP, FUEL)
     
-    def plan_trip(self, route_data, current_cycle_hours):
+    def __init__(self, poi_index=None, corridor_miles=10, lookback_miles=60):
+        """
+        poi_index: optional POIIndex. Rests, breaks and fuel stops are then
+        pulled back to the last facility within corridor_miles of the route
+        and at most lookback_miles before the stop falls due. Routes without
+        geometry (and plan_batch) are planned unsnapped.
+        """
+        self.poi_index = poi_index
+        self.corridor_miles = corridor_miles
+        self.lookback_miles = lookback_miles
+    
+    def plan_trip(self, route_data, current_cycle_hours, start_minute=None):
         """
         Plans trip with HOS compliance
-        Returns stops for rest, fuel, and breaks
+        Returns a TripPlan: stops for rest, fuel, and breaks, per-duty-day
+        totals, and a timeline of duty-status Segments counted from midnight
+        of day one.
+        On-duty time is charged against the 70-hour cycle starting from
+        current_cycle_hours; a 34-hour restart is inserted when it runs out.
+        Fuel stops fall every FUEL_INTERVAL_MILES driven. A drive ends after
+        BREAK_AFTER_DRIVING_HOURS until the day's 30-minute break is taken.
         """
         total_distance = route_data['total_distance']
-        driving_hours_needed = total_distance / 55  # Assuming 55 mph average
+        speed = self.AVERAGE_SPEED_MPH
+        geometry = RouteGeometry.from_route(route_data)
+        corridor = None
+        if self.poi_index is not None and len(geometry) > 1:
+            corridor = self.poi_index.corridor(geometry, self.corridor_miles, road_miles=total_distance)
         
         stops = []
         current_driving = 0
         current_on_duty = 0
         days = []
         current_day = self._create_new_day()
+        timeline = TimelineBuilder(self.DEFAULT_START_MINUTE if start_minute is None else start_minute)
+        cycle_remaining = self.MAX_WEEKLY_HOURS - current_cycle_hours
+        remaining_distance = total_distance
+        next_fuel_mile = self.FUEL_INTERVAL_MILES
+        # Stop the last drive was pulled back for, and the facility it ends at
+        snapped = facility = None
         
-        # Add pickup time (1 hour on-duty not driving)
-        current_day['on_duty_not_driving'] += 1
-        current_on_duty += 1
+        def take_restart():
+            nonlocal current_day, current_driving, current_on_duty, cycle_remaining
+            stops.append(self._make_stop(
+                'rest', self.RESTART_HOURS * 60, "34-hour restart",
+                geometry, total_distance, total_distance - remaining_distance, facility
+            ))
+            if current_day.driving or current_day.on_duty_not_driving:
+                days.append(current_day)
+                current_day = self._create_new_day()
+            current_driving = 0
+            current_on_duty = 0
+            cycle_remaining = self.MAX_WEEKLY_HOURS
+            timeline.add(OFF_DUTY, self.RESTART_HOURS * 60)
         
-        remaining_distance = total_distance
+        # Add pickup time (on-duty not driving)
+        if cycle_remaining < self.PICKUP_HOURS:
+            take_restart()
+        current_day.on_duty_not_driving += self.PICKUP_HOURS
+        current_on_duty += self.PICKUP_HOURS
+        cycle_remaining -= self.PICKUP_HOURS
+        timeline.add(ON_DUTY_NOT_DRIVING, self.PICKUP_HOURS * 60)
         
         while remaining_distance > 0:
+            distance_traveled = total_distance - remaining_distance
             # Check if we need 30-minute break
-            if current_driving >= 8 and not current_day['break_taken']:
-                stops.append({
-                    'type': 'break',
-                    'duration': 30,
-                    'location': self._calculate_location(route_data, total_distance - remaining_distance)
-                })
-                current_day['break_taken'] = True
+            if ((current_driving >= self.BREAK_AFTER_DRIVING_HOURS - self.HOURS_EPSILON or snapped == 'break')
+                    and not current_day.break_taken):
+                stops.append(self._make_stop(
+                    'break', self.REQUIRED_BREAK_MINUTES, "30-minute break",
+                    geometry, total_distance, distance_traveled, facility
+                ))
+                current_day.break_taken = True
                 current_on_duty += 0.5
+                timeline.add(OFF_DUTY, self.REQUIRED_BREAK_MINUTES)
+            
+            fuel_due = snapped == 'fuel' or distance_traveled >= next_fuel_mile - self.MILE_EPSILON
             
+            # Check if the 70-hour cycle is used up (a restart also resets the day)
+            if (cycle_remaining <= 0 or snapped == 'restart'
+                    or (fuel_due and cycle_remaining < self.FUEL_STOP_MINUTES / 60)):
+                take_restart()
             # Check if we need to rest
-            if current_driving >= self.MAX_DRIVING_HOURS or current_on_duty >= self.MAX_DUTY_HOURS:
-                stops.append({
-                    'type': 'rest',
-                    'duration': 10 * 60,  # 10 hours in minutes
-                    'location': self._calculate_location(route_data, total_distance - remaining_distance)
-                })
+            elif (current_driving >= self.MAX_DRIVING_HOURS or current_on_duty >= self.MAX_DUTY_HOURS
+                    or snapped == 'rest'):
+                stops.append(self._make_stop(
+                    'rest', self.MIN_OFF_DUTY_HOURS * 60, "10-hour off-duty rest",
+                    geometry, total_distance, distance_traveled, facility
+                ))
                 days.append(current_day)
                 current_day = self._create_new_day()
                 current_driving = 0
                 current_on_duty = 0
+                timeline.add(OFF_DUTY, self.MIN_OFF_DUTY_HOURS * 60)
             
             # Check for fuel stop
-            distance_since_fuel = total_distance - remaining_distance
-            if distance_since_fuel > 0 and distance_since_fuel % 1000 == 0:
-                stops.append({
-                    'type': 'fuel',
-                    'duration': 30,
-                    'location': self._calculate_location(route_data, distance_since_fuel)
-                })
+            if fuel_due:
+                stops.append(self._make_stop(
+                    'fuel', self.FUEL_STOP_MINUTES, "Fuel stop",
+                    geometry, total_distance, distance_traveled, facility
+                ))
                 current_on_duty += 0.5
+                current_day.on_duty_not_driving += self.FUEL_STOP_MINUTES / 60
+                cycle_remaining -= self.FUEL_STOP_MINUTES / 60
+                timeline.add(ON_DUTY_NOT_DRIVING, self.FUEL_STOP_MINUTES)
+                # An early (snapped) fill-up restarts the interval from here
+                next_fuel_mile = (distance_traveled if snapped == 'fuel' else next_fuel_mile) + self.FUEL_INTERVAL_MILES
             
             # Drive for next segment
+            hours_to_go = remaining_distance / speed
+            fuel_hours = (next_fuel_mile - distance_traveled) / speed
+            break_hours = self.BREAK_AFTER_DRIVING_HOURS - current_driving
+            if current_day.break_taken or hours_to_go <= break_hours + self.HOURS_EPSILON:
+                # A last leg ending at the limit needs no break
+                break_hours = math.inf
             drive_hours = min(
                 self.MAX_DRIVING_HOURS - current_driving,
-                remaining_distance / 55
+                hours_to_go,
+                cycle_remaining,
+                fuel_hours,
+                break_hours
             )
+            snapped = facility = None
+            if corridor is not None and drive_hours < hours_to_go:
+                if drive_hours == fuel_hours:
+                    stop_kind, types = 'fuel', self.FUEL_FACILITIES
+                elif drive_hours == break_hours:
+                    stop_kind, types = 'break', self.REST_FACILITIES
+                else:
+                    stop_kind = 'restart' if drive_hours == cycle_remaining else 'rest'
+                    types = self.REST_FACILITIES
+                due_mile = distance_traveled + drive_hours * speed
+                facility = corridor.last_before(
+                    due_mile, max(distance_traveled, due_mile - self.lookback_miles) + self.MILE_EPSILON, types
+                )
+                if facility is not None:
+                    snapped = stop_kind
+                    drive_hours = (facility['mile'] - distance_traveled) / speed
             
             current_driving += drive_hours
             current_on_duty += drive_hours
-            current_day['driving'] += drive_hours
-            remaining_distance -= drive_hours * 55
+            cycle_remaining -= drive_hours
+            current_day.driving += drive_hours
+            timeline.add(DRIVING, drive_hours * 60)
+            if drive_hours == hours_to_go:
+                # Final leg: a float residue must not trigger a phantom break
+                remaining_distance = 0
+            elif facility is not None:
+                remaining_distance = total_distance - facility['mile']
+            else:
+                remaining_distance -= drive_hours * speed
         
         # Add dropoff time
-        current_day['on_duty_not_driving'] += 1
+        if cycle_remaining < self.DROPOFF_HOURS:
+            take_restart()
+        current_day.on_duty_not_driving += self.DROPOFF_HOURS
         days.append(current_day)
+        timeline.add(ON_DUTY_NOT_DRIVING, self.DROPOFF_HOURS * 60)
         
-        return {
-            'stops': stops,
-            'days': days,
-            'total_time': sum(d['driving'] + d['on_duty_not_driving'] + d['off_duty'] for d in days),
-            'fuel_stops': [s for s in stops if s['type'] == 'fuel']
-        }
+        return TripPlan(stops, days, timeline.segments)
+    
+    def plan_batch(self, distances, current_cycle_hours=None):
+        """
+        Plans many trips at once with vectorized closed-form math.
+        Returns a BatchTripPlan whose per-trip stop counts, day totals and
+        total time match plan_trip for the same distance.
+        """
+        return plan_batch(self, distances, current_cycle_hours)
+    
+    def plan_trip_optimized(self, route_data, current_cycle_hours, start_minute=None, time_budget=0.05):
+        """
+        Searches split sleeper-berth rests (7/3, 8/2) and break placement for
+        the fastest compliant plan within time_budget seconds, falling back to
+        plan_trip. The TripPlan's planner reports which plan was used.
+        Stops are not snapped to facilities.
+        """
+        return plan_optimized(self, route_data, current_cycle_hours, start_minute, time_budget)
     
     def _create_new_day(self):
-        return {
-            'driving': 0,
-            'on_duty_not_driving': 0,
-            'sleeper_berth': 0,
-            'off_duty': 0,
-            'break_taken': False
-        }
+        return DutyDay()
+    
+    def _make_stop(self, stop_type, duration, description, geometry, total_distance, distance_traveled,
+                   facility=None):
+        mile_marker = round(distance_traveled, 1)
+        if facility is not None:
+            # Snapped stops sit at the facility itself rather than on the polyline
+            return Stop(stop_type, mile_marker, duration, f"{description} at {facility['name']}",
+                        location={'lat': facility['lat'], 'lng': facility['lng']},
+                        facility={key: facility[key] for key in ('name', 'type', 'offset_miles')})
+        return Stop(stop_type, mile_marker, duration, description,
+                    location=self._calculate_location(geometry, total_distance, distance_traveled))
     
-    def _calculate_location(self, route_data, distance_traveled):
-        # Calculate position along route based on distance
-        # This would use the actual route coordinates
-        return {
-            'lat': 0,  # Calculate from route
-            'lng': 0   # Calculate from route
-        }
\ No newline at end of file
+    def _calculate_location(self, geometry, total_distance, distance_traveled):
+        # Binary search on the route's cumulative-distance index
+        return geometry.locate_mile(distance_traveled, total_distance)
\ No newline at end of file
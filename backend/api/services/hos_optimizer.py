@@ -0,0 +1,349 @@
+# backend/api/services/hos_optimizer.py
+import heapq
+import itertools
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+from .route_geometry import RouteGeometry
+from .timeline import DRIVING, OFF_DUTY, ON_DUTY_NOT_DRIVING, SLEEPER_BERTH, TimelineBuilder
+from .trip_plan import TripPlan
+
+# Split sleeper-berth periods in minutes: sleeper part -> qualifying partner.
+# 7/3 and 8/2 pairs in either order (49 CFR 395.1(g)(1)(ii)).
+SPLIT_PAIRS = {420: 180, 180: 420, 480: 120, 120: 480}
+SLEEPER_PERIODS = (420, 480)
+
+BREAK = 'break'
+FUEL = 'fuel'
+REST = 'rest'
+RESTART = 'restart'
+
+EPSILON = 1e-6
+# The search counts time in 1/11-minute ticks: at 55 mph the 1000-mile fuel
+# interval is 12000/11 minutes, so in ticks every limit is a whole number,
+# sums of them compare exactly and states can be hashed as they are
+TICKS_PER_MINUTE = 11
+# Drives shorter than the binding limit are tried in whole hours, this many
+# steps back, so split periods and rests can land before the limit
+SHORT_DRIVE_STEPS = 3
+
+
+class _BudgetExceeded(Exception):
+    pass
+
+
+class _Search:
+    """
+    A* over duty-status decisions. A state is taken at a stop point:
+    (driven ticks, shift driving, 14-hour window time, driving since the
+    last 30-minute interruption, driving since fuel, cycle time left,
+    pending split period as (minutes, driving after it, window time after
+    it) or None). Each move drives for a while and then takes one stop; the
+    cost is elapsed time, identical states are expanded once and states no
+    better than one already reached are pruned.
+    """
+
+    def __init__(self, calculator, drive_minutes: float, cycle_left: float, deadline: float,
+                 window: float = 0.0):
+        c = calculator
+        t = TICKS_PER_MINUTE
+        self.total = drive_minutes * t
+        self.max_driving = c.MAX_DRIVING_HOURS * 60 * t
+        self.max_window = c.MAX_DUTY_HOURS * 60 * t
+        self.break_after = c.BREAK_AFTER_DRIVING_HOURS * 60 * t
+        self.break_ticks = c.REQUIRED_BREAK_MINUTES * t
+        self.rest_ticks = c.MIN_OFF_DUTY_HOURS * 60 * t
+        self.restart_ticks = c.RESTART_HOURS * 60 * t
+        self.full_cycle = c.MAX_WEEKLY_HOURS * 60 * t
+        self.fuel_drive = c.FUEL_INTERVAL_MILES / c.AVERAGE_SPEED_MPH * 60 * t
+        self.fuel_ticks = c.FUEL_STOP_MINUTES * t
+        self.dropoff_ticks = c.DROPOFF_HOURS * 60 * t
+        self.cycle_left = cycle_left * t
+        self.window = window * t
+        self.deadline = deadline
+        self.expanded = 0
+        self._frontier = {}
+
+    def run(self) -> Tuple[float, List[Tuple[float, Optional[tuple]]]]:
+        """Minimum elapsed minutes after pickup, and the (drive minutes, stop) moves"""
+        start = (0.0, 0.0, self.window, 0.0, 0.0, self.cycle_left, None)
+        best = {start: 0.0}
+        parents = {start: None}
+        # Ties go to the state furthest along the route, which dives through the many
+        # equal-cost orderings of split periods; the counter keeps states uncompared
+        counter = itertools.count()
+        heap = [(self._estimate(start), 0.0, next(counter), 0.0, start)]
+        while heap:
+            _, _, _, elapsed, state = heapq.heappop(heap)
+            if elapsed > best[state]:
+                continue
+            self.expanded += 1
+            if state is None:
+                return elapsed / TICKS_PER_MINUTE, self._moves(parents)
+            for move, cost, next_state in self._successors(state):
+                # Checked for every successor: one dominance scan is the most
+                # the search can overrun by
+                if time.perf_counter() > self.deadline:
+                    raise _BudgetExceeded
+                total = elapsed + cost
+                if total < best.get(next_state, math.inf) and not self._dominated(next_state, total):
+                    best[next_state] = total
+                    parents[next_state] = (state, move)
+                    if next_state is None:
+                        entry = (total, -self.total, next(counter), total, None)
+                    else:
+                        entry = (total + self._estimate(next_state), -next_state[0], next(counter),
+                                 total, next_state)
+                    heapq.heappush(heap, entry)
+        raise _BudgetExceeded  # unreachable with a finite trip: a rest always frees driving time
+
+    def _dominated(self, state, elapsed: float) -> bool:
+        """
+        Whether an equally far along state with the same fuel and pending split
+        period was reached no later and with no tighter limit; otherwise record it
+        """
+        if state is None:
+            return False
+        progress, shift_drive, window, since_break, fuel_used, cycle_left, pending = state
+        if pending is None:
+            bucket, after = (progress, fuel_used, None), (0.0, 0.0)
+        else:
+            bucket, after = (progress, fuel_used, pending[0]), pending[1:]
+        entry = (elapsed, shift_drive, window, since_break, -cycle_left) + after
+        seen = self._frontier.setdefault(bucket, [])
+        for other in seen:
+            if all(a <= b for a, b in zip(other, entry)):
+                return True
+        seen.append(entry)
+        return False
+
+    @staticmethod
+    def _moves(parents) -> List[Tuple[float, Optional[tuple]]]:
+        """Moves leading to the final state (None), in minutes"""
+        moves = []
+        state = None
+        while parents[state] is not None:
+            state, (drive, stop) = parents[state]
+            moves.append((drive, stop / TICKS_PER_MINUTE) if drive == 'end' else (drive / TICKS_PER_MINUTE, stop))
+        moves.reverse()
+        return moves
+
+    def _estimate(self, state) -> float:
+        """Admissible lower bound on the ticks still to come"""
+        progress, shift_drive, window, since_break, fuel_used, cycle_left, pending = state
+        remaining = self.total - progress
+        fuels = max(0, math.ceil((remaining - (self.fuel_drive - fuel_used)) / self.fuel_drive - EPSILON))
+        rest = 0.0
+        available = max(0.0, min(self.max_driving - shift_drive, self.max_window - window))
+        if remaining > available + EPSILON:
+            # Any two consecutive split periods add up to a full rest and the driving
+            # around a split period to one shift, so each full rest's worth of time off
+            # buys at most one more shift of driving. A pending period already counts
+            # towards that, but its partner still has to be taken.
+            rest = self.rest_ticks * math.ceil((remaining - available) / self.max_driving - EPSILON)
+            if pending is not None:
+                unpaired = self.rest_ticks * math.ceil(
+                    (remaining + shift_drive - self.max_driving) / self.max_driving - EPSILON
+                ) - pending[0] * TICKS_PER_MINUTE
+                rest = max(SPLIT_PAIRS[pending[0]] * TICKS_PER_MINUTE, min(rest, unpaired))
+        on_duty = remaining + self.dropoff_ticks + fuels * self.fuel_ticks
+        if on_duty > cycle_left + EPSILON:
+            # Each restart frees one full cycle and also serves as one of the rests
+            restarts = math.ceil((on_duty - cycle_left) / self.full_cycle - EPSILON)
+            rest = restarts * self.restart_ticks + max(0.0, rest - restarts * self.rest_ticks)
+        # Every 8 hours of driving needs an interruption; fuel stops and rest periods
+        # provide some, and n periods take at least floor(n / 2) full rests of time
+        interruptions = math.ceil((remaining - (self.break_after - since_break)) / self.break_after - EPSILON)
+        periods = 2 * int(rest // self.rest_ticks) + 1
+        breaks = max(0, interruptions - fuels - periods)
+        return on_duty + rest + breaks * self.break_ticks
+
+    def _successors(self, state):
+        progress, shift_drive, window, since_break, fuel_used, cycle_left, pending = state
+        remaining = self.total - progress
+        if remaining <= EPSILON:
+            cost = self.dropoff_ticks
+            if cycle_left < self.dropoff_ticks:
+                cost += self.restart_ticks
+            yield ('end', cost), cost, None
+            return
+        limit = max(0.0, min(
+            self.max_driving - shift_drive,
+            self.max_window - window,
+            self.break_after - since_break,
+            self.fuel_drive - fuel_used,
+            cycle_left,
+            remaining,
+        ))
+        drives = [limit]
+        hour = math.ceil(limit / (60 * TICKS_PER_MINUTE) - EPSILON) - 1
+        while len(drives) <= SHORT_DRIVE_STEPS and hour > 0:
+            drives.append(hour * 60.0 * TICKS_PER_MINUTE)
+            hour -= 1
+        for drive in drives:
+            driven = (progress + drive, shift_drive + drive, window + drive, since_break + drive,
+                      fuel_used + drive, cycle_left - drive,
+                      None if pending is None else (pending[0], pending[1] + drive, pending[2] + drive))
+            if drive > EPSILON and remaining - drive <= EPSILON:
+                yield (drive, None), drive, (self.total,) + driven[1:]
+                continue
+            # Breaks and fuel only make sense at the limit; shorter drives end in a rest
+            for stop, cost, next_state in self._stops(driven, remaining - drive, rests_only=drive < limit):
+                yield (drive, stop), drive + cost, next_state
+
+    def _stops(self, state, remaining, rests_only=False):
+        progress, shift_drive, window, since_break, fuel_used, cycle_left, pending = state
+        if not rests_only:
+            if since_break >= self.break_after - EPSILON:
+                yield (BREAK,), self.break_ticks, (
+                    progress, shift_drive, window + self.break_ticks, 0.0, fuel_used, cycle_left,
+                    self._extend(pending, self.break_ticks))
+            # Fuel within a shift's driving of the mark, so an early fill-up can double as the break
+            if self.fuel_drive - fuel_used < self.break_after + EPSILON and cycle_left >= self.fuel_ticks:
+                yield (FUEL,), self.fuel_ticks, (
+                    progress, shift_drive, window + self.fuel_ticks, 0.0, 0.0, cycle_left - self.fuel_ticks,
+                    self._extend(pending, self.fuel_ticks))
+        if shift_drive > EPSILON or pending is not None:
+            yield (REST,), self.rest_ticks, (progress, 0.0, 0.0, 0.0, fuel_used, cycle_left, None)
+            for minutes, partner in SPLIT_PAIRS.items():
+                ticks = minutes * TICKS_PER_MINUTE
+                if pending is not None and pending[0] == partner:
+                    # Pair complete: limits restart from the end of the first period,
+                    # and this period can in turn pair with the next one
+                    yield (minutes,), ticks, (progress, pending[1], pending[2], 0.0, fuel_used, cycle_left,
+                                              (minutes, 0.0, 0.0))
+                else:
+                    yield (minutes,), ticks, (progress, shift_drive, window + ticks, 0.0, fuel_used,
+                                              cycle_left, (minutes, 0.0, 0.0))
+        if cycle_left < remaining + self.dropoff_ticks - EPSILON:
+            yield (RESTART,), self.restart_ticks, (
+                progress, 0.0, 0.0, 0.0, fuel_used, self.full_cycle, None)
+
+    @staticmethod
+    def _extend(pending, ticks):
+        return None if pending is None else (pending[0], pending[1], pending[2] + ticks)
+
+
+def plan_optimized(calculator, route_data: Dict, current_cycle_hours: float, start_minute: Optional[int] = None,
+                   time_budget: float = 0.05) -> TripPlan:
+    """
+    Minimum-elapsed-time plan that may split the 10-hour rest into 7/3 or
+    8/2 sleeper-berth pairs and move breaks (a fuel stop or split period
+    also counts as the 30-minute interruption). time_budget is a soft limit
+    on the greedy plan_trip run, the search and building its plan together:
+    the clock is checked before every successor and before the plan is built,
+    so the overrun is one dominance scan, the plan build and freeing the
+    search state, plus any garbage-collector pause. The greedy plan is
+    returned when the budget runs out, and when the search only finds
+    something slower.
+    On a tie the searched plan is used. plan.planner reports which plan was
+    used.
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget
+    greedy = calculator.plan_trip(route_data, current_cycle_hours, start_minute)
+    speed = calculator.AVERAGE_SPEED_MPH
+    pickup_minutes = calculator.PICKUP_HOURS * 60
+    cycle_left = (calculator.MAX_WEEKLY_HOURS - current_cycle_hours) * 60
+    initial_restart = cycle_left < pickup_minutes
+    if initial_restart:
+        cycle_left = calculator.MAX_WEEKLY_HOURS * 60
+    # The search starts after pickup, which already counts towards the 14-hour window
+    search = _Search(calculator, route_data['total_distance'] / speed * 60, cycle_left - pickup_minutes,
+                     deadline, window=pickup_minutes)
+    planner = {'mode': 'optimized', 'used': 'greedy', 'reason': None}
+    try:
+        if time.perf_counter() > deadline:
+            raise _BudgetExceeded
+        elapsed, moves = search.run()
+        # Building the plan is the last step the budget covers
+        if time.perf_counter() > deadline:
+            raise _BudgetExceeded
+    except _BudgetExceeded:
+        planner['reason'] = 'budget'
+    else:
+        first_minute = calculator.DEFAULT_START_MINUTE if start_minute is None else start_minute
+        greedy_elapsed = greedy.timeline[-1].end_minute - first_minute
+        if initial_restart:
+            elapsed += calculator.RESTART_HOURS * 60
+        if elapsed + pickup_minutes <= greedy_elapsed + EPSILON:
+            plan = _build_plan(calculator, route_data, start_minute, initial_restart, moves)
+            planner['used'] = 'optimized'
+            planner['saved_hours'] = max(0.0, round((greedy_elapsed - elapsed - pickup_minutes) / 60, 2))
+            greedy = plan
+        else:
+            planner['reason'] = 'no_gain'
+    planner['states'] = search.expanded
+    planner['search_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    greedy.planner = planner
+    return greedy
+
+
+def _build_plan(calculator, route_data: Dict, start_minute: Optional[int], initial_restart: bool,
+                moves: List[Tuple[float, Optional[tuple]]]) -> TripPlan:
+    """Replay the searched moves into a TripPlan like plan_trip's"""
+    total_distance = route_data['total_distance']
+    speed = calculator.AVERAGE_SPEED_MPH
+    geometry = RouteGeometry.from_route(route_data)
+    timeline = TimelineBuilder(calculator.DEFAULT_START_MINUTE if start_minute is None else start_minute)
+    stops, days = [], []
+    day = calculator._create_new_day()
+    miles = 0.0
+
+    def stop(stop_type, minutes, description):
+        stops.append(calculator._make_stop(stop_type, minutes, description, geometry, total_distance, miles))
+
+    def restart():
+        nonlocal day
+        stop('rest', calculator.RESTART_HOURS * 60, "34-hour restart")
+        if day.driving or day.on_duty_not_driving:
+            days.append(day)
+            day = calculator._create_new_day()
+        timeline.add(OFF_DUTY, calculator.RESTART_HOURS * 60)
+
+    if initial_restart:
+        restart()
+    day.on_duty_not_driving += calculator.PICKUP_HOURS
+    timeline.add(ON_DUTY_NOT_DRIVING, calculator.PICKUP_HOURS * 60)
+    for drive, action in moves:
+        if drive == 'end':
+            if action > calculator.DROPOFF_HOURS * 60:
+                restart()
+            break
+        day.driving += drive / 60
+        timeline.add(DRIVING, drive)
+        miles = min(total_distance, miles + drive / 60 * speed)
+        if action is None:
+            continue
+        kind = action[0]
+        if kind == BREAK:
+            stop('break', calculator.REQUIRED_BREAK_MINUTES, "30-minute break")
+            day.break_taken = True
+            timeline.add(OFF_DUTY, calculator.REQUIRED_BREAK_MINUTES)
+        elif kind == FUEL:
+            stop('fuel', calculator.FUEL_STOP_MINUTES, "Fuel stop")
+            day.on_duty_not_driving += calculator.FUEL_STOP_MINUTES / 60
+            day.break_taken = True
+            timeline.add(ON_DUTY_NOT_DRIVING, calculator.FUEL_STOP_MINUTES)
+        elif kind == REST:
+            stop('rest', calculator.MIN_OFF_DUTY_HOURS * 60, "10-hour off-duty rest")
+            days.append(day)
+            day = calculator._create_new_day()
+            timeline.add(OFF_DUTY, calculator.MIN_OFF_DUTY_HOURS * 60)
+        elif kind == RESTART:
+            restart()
+        elif kind in SLEEPER_PERIODS:
+            stop('rest', kind, f"{kind // 60}-hour sleeper berth (split)")
+            day.sleeper_berth += kind / 60
+            days.append(day)
+            day = calculator._create_new_day()
+            timeline.add(SLEEPER_BERTH, kind)
+        else:
+            stop('rest', kind, f"{kind // 60}-hour off-duty (split sleeper)")
+            day.break_taken = True
+            timeline.add(OFF_DUTY, kind)
+    miles = total_distance
+    day.on_duty_not_driving += calculator.DROPOFF_HOURS
+    days.append(day)
+    timeline.add(ON_DUTY_NOT_DRIVING, calculator.DROPOFF_HOURS * 60)
+    return TripPlan(stops, days, timeline.segments)
@@ -1,37 +1,124 @@
 # backend/api/services/log_generator.py
-from typing import Dict, List
+import base64
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
 from datetime import date, timedelta
-from logs.log_drawer import LogSheetDrawer
+from logs.svg_drawer import SVGLogSheetDrawer
+from .pools import EXECUTOR_PROCESS, EXECUTOR_SERIAL, EXECUTOR_THREAD, get_pool
+from .sheet_store import SheetStore
+from .timeline import split_by_day
+from .trip_plan import DutyDay, TripPlan
+
+FORMAT_PNG = 'png'
+FORMAT_SVG = 'svg'
+
+# Drawer used by pool workers (one per worker process / shared by threads)
+_worker_drawer = None
+
+
+def _render_sheet(args) -> bytes:
+    """Render one day in a pool worker and return the PNG bytes"""
+    global _worker_drawer
+    if _worker_drawer is None:
+        from logs.log_drawer import LogSheetDrawer
+        _worker_drawer = LogSheetDrawer()
+    day_data, current_date, driver_info = args
+    return _worker_drawer.render_png(day_data, current_date, driver_info)
+
 
 class LogGenerator:
     """
     Generates ELD log sheets
     """
     
-    def __init__(self):
+    def __init__(self, executor: str = EXECUTOR_SERIAL, max_workers: Optional[int] = None,
+                 min_parallel_days: int = 3):
+        """
+        executor: 'serial', 'thread' or 'process'. Trips shorter than
+        min_parallel_days are always rendered serially.
+        """
+        if executor not in (EXECUTOR_SERIAL, EXECUTOR_THREAD, EXECUTOR_PROCESS):
+            raise ValueError(f"Unknown log render executor: {executor}")
+        # Pillow is imported with the first generator, not when the URLconf loads
+        from logs.log_drawer import LogSheetDrawer
         self.drawer = LogSheetDrawer()
+        self.svg_drawer = SVGLogSheetDrawer()
+        self.executor = executor
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_parallel_days = min_parallel_days
+
+    def warm_up(self) -> None:
+        """Prepare the PNG and SVG sheet templates (no pools are started)"""
+        self.drawer.warm_up()
+        self.svg_drawer.warm_up()
 
-    def generate_logs(self, hos_plan: Dict, start_date: date = None, driver_info: Dict = None) -> List[Dict]:
+    def generate_logs(self, hos_plan: TripPlan, start_date: date = None, driver_info: Dict = None,
+                      inline_images: bool = True, image_format: str = FORMAT_PNG,
+                      binary_images: bool = False) -> List[Dict]:
         """
-        Generate log sheets based on HOS plan days. Each element in hos_plan['days'] should
-        include numeric totals for 'driving', 'on_duty_not_driving', 'sleeper_berth', 'off_duty'.
+        Generate log sheets based on HOS plan days. When the plan carries a duty-status
+        timeline it is sliced into calendar days and each sheet plots its exact segments.
+        Otherwise each of hos_plan.days is drawn from its totals.
+        With inline_images=False the PNGs are written to the SheetStore and each log
+        carries a 'log_image_id' digest instead of a base64 'log_image'.
+        With image_format='svg' sheets are SVG markup, inlined as 'log_svg'; they
+        take microseconds to build, so they are never sent to a pool.
+        binary_images=True keeps inline images as raw bytes for binary renderers.
         """
-        if start_date is None:
-            start_date = date.today()
         driver_info = driver_info or {"name": "Driver"}
+        pairs = list(self.iter_days(hos_plan, start_date))
+        days = [day_data for day_data, _ in pairs]
+        dates = [current_date for _, current_date in pairs]
+        if image_format == FORMAT_SVG:
+            images = [self.svg_drawer.render_svg(d, dt, driver_info).encode() for d, dt in zip(days, dates)]
+        else:
+            images = self._render_images(days, dates, driver_info)
+        store = None if inline_images else SheetStore()
 
         logs: List[Dict] = []
-        days = hos_plan.get('days', [])
-        for i, day_data in enumerate(days):
-            current_date = start_date + timedelta(days=i)
-            rendered = self.drawer.draw_log_sheet(day_data, current_date, driver_info)
-            logs.append({
+        for i, (day_data, current_date, image) in enumerate(zip(days, dates, images)):
+            log = {
                 'day': i + 1,
                 'date': current_date.isoformat(),
-                'driving_hours': float(day_data.get('driving', 0)),
-                'on_duty_hours': float(day_data.get('on_duty_not_driving', 0)),
-                'off_duty_hours': float(day_data.get('off_duty', 0)),
-                'sleeper_berth_hours': float(day_data.get('sleeper_berth', 0)),
-                'log_image': rendered['image']
-            })
-        return logs
\ No newline at end of file
+                'driving_hours': float(day_data.driving),
+                'on_duty_hours': float(day_data.on_duty_not_driving),
+                'off_duty_hours': float(day_data.off_duty),
+                'sleeper_berth_hours': float(day_data.sleeper_berth),
+            }
+            if store is not None:
+                log['log_image_id'] = store.save(image, image_format)
+            elif image_format == FORMAT_SVG:
+                log['log_svg'] = image.decode()
+            elif binary_images:
+                log['log_image'] = image
+            else:
+                log['log_image'] = base64.b64encode(image).decode()
+            logs.append(log)
+        return logs
+
+    @staticmethod
+    def iter_days(hos_plan: TripPlan, start_date: date = None) -> Iterator[Tuple[DutyDay, date]]:
+        """
+        Yield (day_data, date) for each calendar day of the plan, slicing the
+        duty-status timeline into per-day segments when there is one
+        """
+        if start_date is None:
+            start_date = date.today()
+        if hos_plan.timeline:
+            for i, segments in enumerate(split_by_day(hos_plan.timeline)):
+                yield DutyDay.from_segments(segments), start_date + timedelta(days=i)
+        else:
+            for i, day_data in enumerate(hos_plan.days):
+                yield day_data, start_date + timedelta(days=i)
+
+    def _render_images(self, days: List[DutyDay], dates: List[date], driver_info: Dict) -> List[bytes]:
+        """Render every day, concurrently when configured, preserving day order"""
+        workers = min(self.max_workers, len(days))
+        if self.executor == EXECUTOR_SERIAL or workers < 2 or len(days) < self.min_parallel_days:
+            return [
+                self.drawer.render_png(day_data, current_date, driver_info)
+                for day_data, current_date in zip(days, dates)
+            ]
+        pool = get_pool(self.executor, self.max_workers)
+        jobs = [(day_data, current_date, driver_info) for day_data, current_date in zip(days, dates)]
+        return list(pool.map(_render_sheet, jobs))
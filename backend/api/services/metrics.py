@@ -0,0 +1,34 @@
+# backend/api/services/metrics.py
+import time
+from contextlib import contextmanager
+from typing import List, Tuple
+from trucking_hos.metrics import Histogram, MetricsRegistry, registry  # noqa: F401 (re-exported)
+
+STAGE_METRIC = 'trip_stage_duration_seconds'
+STAGE_HELP = 'Time spent in each stage of trip calculation'
+
+
+class StageTimings:
+    """
+    Per-request stage timer. Each stage is recorded for the Server-Timing
+    header and observed in the process-wide registry.
+    """
+
+    __slots__ = ('stages',)
+
+    def __init__(self):
+        self.stages: List[Tuple[str, float]] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages.append((name, elapsed))
+            registry.observe(STAGE_METRIC, elapsed, STAGE_HELP, stage=name)
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, durations in milliseconds"""
+        return ', '.join(f"{name};dur={elapsed * 1000:.2f}" for name, elapsed in self.stages)
@@ -0,0 +1,15 @@
+# backend/api/services/optional_deps.py
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def numpy():
+    """
+    The numpy module, or None when it is not installed. Imported on first
+    use rather than at startup; plain-Python fallbacks cover the None case.
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
@@ -0,0 +1,164 @@
+# backend/api/services/poi_index.py
+import csv
+import math
+import threading
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from django.conf import settings
+from .route_geometry import EARTH_RADIUS_MILES, RouteGeometry
+
+BUNDLED_FACILITIES = Path(__file__).resolve().parent.parent / 'data' / 'truck_stops.csv'
+
+TRUCK_STOP = 'truck_stop'
+FUEL = 'fuel'
+REST_AREA = 'rest_area'
+FACILITY_TYPES = (TRUCK_STOP, FUEL, REST_AREA)
+
+MILES_PER_DEGREE = EARTH_RADIUS_MILES * math.pi / 180
+
+
+class Corridor:
+    """
+    Facilities within a fixed distance of one route, sorted by how far along
+    the route they sit, so "last facility before mile M" is a bisect plus a
+    short backwards scan for the wanted types.
+    """
+
+    __slots__ = ('miles', 'offsets', '_facilities')
+
+    def __init__(self, entries: List[Tuple[float, float, Dict]]):
+        entries.sort(key=lambda entry: entry[0])
+        self.miles = array('d', (entry[0] for entry in entries))
+        self.offsets = array('d', (entry[1] for entry in entries))
+        self._facilities = [entry[2] for entry in entries]
+
+    def __len__(self):
+        return len(self.miles)
+
+    def last_before(self, mile: float, after: float = 0.0,
+                    types: Optional[Sequence[str]] = None) -> Optional[Dict]:
+        """
+        Facility furthest along the route in (after, mile], optionally limited
+        to some facility types; None if the corridor has none there.
+        """
+        i = bisect_right(self.miles, mile) - 1
+        while i >= 0 and self.miles[i] > after:
+            facility = self._facilities[i]
+            if types is None or facility['type'] in types:
+                return dict(facility, mile=self.miles[i], offset_miles=round(self.offsets[i], 1))
+            i -= 1
+        return None
+
+
+class POIIndex:
+    """
+    Uniform lat/lng grid over truck stops, fuel stations and rest areas.
+    Each cell lists the facilities inside it, so a corridor query only looks
+    at cells the route passes near instead of the whole dataset.
+    """
+
+    def __init__(self, rows: Iterable[Tuple[str, str, float, float]], cell_degrees: float = 0.25):
+        self.cell_degrees = cell_degrees
+        self._facilities = []
+        self._lat = array('d')
+        self._lng = array('d')
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        for name, facility_type, lat, lng in rows:
+            if facility_type not in FACILITY_TYPES:
+                raise ValueError(f"Unknown facility type for {name}: {facility_type}")
+            lat, lng = float(lat), float(lng)
+            i = len(self._facilities)
+            self._facilities.append({'name': name, 'type': facility_type, 'lat': lat, 'lng': lng})
+            self._lat.append(lat)
+            self._lng.append(lng)
+            self._cells.setdefault(self._cell(lat, lng), []).append(i)
+
+    @classmethod
+    def from_csv(cls, path) -> 'POIIndex':
+        """Load a facilities CSV with name, type, lat, lng columns"""
+        with open(path, newline='', encoding='utf-8') as fh:
+            reader = csv.DictReader(fh)
+            return cls((row['name'], row['type'], row['lat'], row['lng']) for row in reader)
+
+    def __len__(self):
+        return len(self._facilities)
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor(lng / self.cell_degrees)
+
+    def _candidates(self, min_lat: float, max_lat: float, min_lng: float, max_lng: float) -> Iterable[int]:
+        row0, col0 = self._cell(min_lat, min_lng)
+        row1, col1 = self._cell(max_lat, max_lng)
+        for row in range(row0, row1 + 1):
+            for col in range(col0, col1 + 1):
+                yield from self._cells.get((row, col), ())
+
+    def near(self, lat: float, lng: float, radius_miles: float) -> List[Dict]:
+        """Facilities within radius_miles of a point, nearest first"""
+        dlat = radius_miles / MILES_PER_DEGREE
+        dlng = radius_miles / (MILES_PER_DEGREE * max(math.cos(math.radians(abs(lat) + dlat)), 0.01))
+        scale = math.cos(math.radians(lat))
+        found = []
+        for i in self._candidates(lat - dlat, lat + dlat, lng - dlng, lng + dlng):
+            miles = math.hypot(self._lat[i] - lat, (self._lng[i] - lng) * scale) * MILES_PER_DEGREE
+            if miles <= radius_miles:
+                found.append((miles, i))
+        found.sort()
+        return [dict(self._facilities[i], distance_miles=round(miles, 1)) for miles, i in found]
+
+    def corridor(self, geometry: RouteGeometry, width_miles: float,
+                 road_miles: Optional[float] = None) -> Corridor:
+        """
+        Facilities within width_miles of the route polyline, each placed at
+        its projection onto the nearest segment. With road_miles, positions
+        are rescaled from polyline miles to road miles (as locate_mile does).
+        Segments are projected on a local equirectangular plane, which is
+        accurate to well under a mile at corridor widths.
+        """
+        n = len(geometry)
+        if n < 2 or geometry.length <= 0:
+            return Corridor([])
+        lat, lng, cumulative = geometry.lat, geometry.lng, geometry.cumulative
+        dlat = width_miles / MILES_PER_DEGREE
+        best: Dict[int, Tuple[float, float]] = {}
+        for s in range(n - 1):
+            lat0, lng0, lat1, lng1 = lat[s], lng[s], lat[s + 1], lng[s + 1]
+            scale = math.cos(math.radians((lat0 + lat1) / 2))
+            dlng = width_miles / (MILES_PER_DEGREE * max(math.cos(math.radians(max(abs(lat0), abs(lat1)) + dlat)), 0.01))
+            # Segment as a vector in miles on the local plane
+            sx = (lng1 - lng0) * scale * MILES_PER_DEGREE
+            sy = (lat1 - lat0) * MILES_PER_DEGREE
+            length_sq = sx * sx + sy * sy
+            segment_miles = cumulative[s + 1] - cumulative[s]
+            candidates = self._candidates(min(lat0, lat1) - dlat, max(lat0, lat1) + dlat,
+                                          min(lng0, lng1) - dlng, max(lng0, lng1) + dlng)
+            for i in candidates:
+                px = (self._lng[i] - lng0) * scale * MILES_PER_DEGREE
+                py = (self._lat[i] - lat0) * MILES_PER_DEGREE
+                t = min(1.0, max(0.0, (px * sx + py * sy) / length_sq)) if length_sq > 0 else 0.0
+                offset = math.hypot(px - t * sx, py - t * sy)
+                if offset <= width_miles and (i not in best or offset < best[i][1]):
+                    best[i] = (cumulative[s] + t * segment_miles, offset)
+        ratio = road_miles / geometry.length if road_miles else 1.0
+        return Corridor([(mile * ratio, offset, self._facilities[i]) for i, (mile, offset) in best.items()])
+
+
+_poi_index = None
+_poi_index_lock = threading.Lock()
+
+
+def get_poi_index() -> Optional[POIIndex]:
+    """
+    Process-wide facility index loaded from settings.POI['DATASET'] (or the
+    bundled CSV); None when stop snapping is disabled
+    """
+    global _poi_index
+    if not settings.POI['ENABLED']:
+        return None
+    if _poi_index is None:
+        with _poi_index_lock:
+            if _poi_index is None:
+                _poi_index = POIIndex.from_csv(settings.POI['DATASET'] or BUNDLED_FACILITIES)
+    return _poi_index
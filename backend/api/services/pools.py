@@ -0,0 +1,51 @@
+# backend/api/services/pools.py
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+EXECUTOR_SERIAL = 'serial'
+EXECUTOR_THREAD = 'thread'
+EXECUTOR_PROCESS = 'process'
+
+# Pools are shared per process and created lazily, so gunicorn workers each
+# build their own after forking instead of inheriting a broken one.
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _process_context():
+    """
+    Workers are started by a fresh server process (or spawned where there is
+    no forkserver) rather than forked from a threaded web worker, which could
+    copy another thread's held locks into the child.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _setup_django():
+    """Process pool initializer: started workers import Django from scratch"""
+    import django
+    django.setup()
+
+
+def get_pool(kind: str, max_workers: Optional[int], name: str = '') -> Executor:
+    """
+    Process-wide 'thread' or 'process' pool for this worker count. Callers
+    whose tasks wait on another pool's tasks pass their own name, so the two
+    never share (and exhaust) one set of workers.
+    """
+    key = (kind, max_workers, name)
+    pool = _POOLS.get(key)
+    if pool is None:
+        with _POOLS_LOCK:
+            pool = _POOLS.get(key)
+            if pool is None:
+                if kind == EXECUTOR_PROCESS:
+                    pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=_process_context(),
+                                               initializer=_setup_django)
+                else:
+                    pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+                _POOLS[key] = pool
+    return pool
@@ -0,0 +1,108 @@
+# backend/api/services/response_cache.py
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+from django.conf import settings
+from rest_framework.utils.encoders import JSONEncoder
+
+
+def response_key(data: Dict, plan_date: date, media_type: str, base_url: str) -> str:
+    """
+    Canonical hash of everything a trip response depends on: the validated
+    request (with cycle hours already resolved), the plan date, the
+    negotiated media type and the host that absolute sheet URLs point at.
+    Used both as the cache key and as the ETag.
+    """
+    canonical = json.dumps(
+        {'request': data, 'date': plan_date.isoformat(), 'media_type': media_type, 'base_url': base_url},
+        sort_keys=True, separators=(',', ':'), cls=JSONEncoder,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    In-process LRU of rendered trip responses bounded by entry count and by
+    total body bytes, with a per-entry TTL. Stores (content_type, body,
+    history): history is the unsaved Trip recorded when the response was
+    computed, so a cache hit can still be written to trip history.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 32 * 1024 * 1024, ttl: int = 600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Tuple[str, bytes, Any]]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, content_type, body, history = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return content_type, body, history
+                self._remove(key)
+            self.misses += 1
+        return None
+
+    def set(self, key: str, content_type: str, body: bytes, history: Any = None) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, content_type, body, history)
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str) -> None:
+        _, _, body, _ = self._entries.pop(key)
+        self._bytes -= len(body)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+            }
+
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide response cache configured from settings.RESPONSE_CACHE"""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                config = settings.RESPONSE_CACHE
+                _response_cache = ResponseCache(
+                    max_entries=config['MAX_ENTRIES'],
+                    max_bytes=config['MAX_BYTES'],
+                    ttl=config['TTL'],
+                )
+    return _response_cache
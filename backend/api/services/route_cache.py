@@ -0,0 +1,114 @@
+# backend/api/services/route_cache.py
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from django.conf import settings
+from django.core.cache import caches
+
+_WHITESPACE = re.compile(r'\s+')
+_COMMA = re.compile(r'\s*,\s*')
+
+
+def normalize_location(location: str) -> str:
+    """Canonical form of a free-text location ("  new york,NY " -> "new york, ny")"""
+    text = _WHITESPACE.sub(' ', location.casefold()).strip(' .,')
+    return _COMMA.sub(', ', text)
+
+
+class RouteCache:
+    """
+    Two-tier cache for calculated routes.
+    The first tier is an in-process LRU with a per-entry TTL. The optional
+    second tier is a Django cache alias shared by all workers. Cached routes
+    are shared objects and must not be mutated by callers.
+    """
+
+    KEY_PREFIX = 'route:v1:'
+
+    def __init__(self, max_entries: int = 1024, ttl: int = 3600, shared_alias: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.shared = caches[shared_alias] if shared_alias else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def make_key(self, *locations: str) -> str:
+        """Key for a route through locations, in order; single legs and full trips never collide"""
+        raw = '|'.join(normalize_location(loc) for loc in locations)
+        return self.KEY_PREFIX + hashlib.sha1(raw.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, route = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return route
+                del self._entries[key]
+
+        if self.shared is not None:
+            route = self.shared.get(key)
+            if route is not None:
+                self._store_local(key, route, now)
+                with self._lock:
+                    self.shared_hits += 1
+                return route
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, route: Dict) -> None:
+        self._store_local(key, route, time.monotonic())
+        if self.shared is not None:
+            self.shared.set(key, route, timeout=self.ttl)
+
+    def _store_local(self, key: str, route: Dict, now: float) -> None:
+        with self._lock:
+            self._entries[key] = (now + self.ttl, route)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.shared_hits = self.misses = 0
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+            }
+
+
+_route_cache = None
+_route_cache_lock = threading.Lock()
+
+
+def get_route_cache() -> RouteCache:
+    """Process-wide route cache configured from settings.ROUTE_CACHE"""
+    global _route_cache
+    if _route_cache is None:
+        with _route_cache_lock:
+            if _route_cache is None:
+                config = settings.ROUTE_CACHE
+                _route_cache = RouteCache(
+                    max_entries=config['MAX_ENTRIES'],
+                    ttl=config['TTL'],
+                    shared_alias=config['SHARED_ALIAS'],
+                )
+    return _route_cache
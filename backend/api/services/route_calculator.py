@@ -1,40 +1,152 @@
 # backend/api/services/route_calculator.py
-import requests
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Tuple
+from django.conf import settings
+from .geocoder import OfflineGeocoder, get_geocoder
+from .route_cache import RouteCache, get_route_cache
+from .route_providers import RouteProvider, get_route_provider
+
+# Legs of every trip are fetched concurrently on one shared pool per process,
+# sized by ROUTE_PROVIDER['LEG_WORKERS']
+_leg_pool = None
+_leg_pool_lock = threading.Lock()
+
+
+def _get_leg_pool() -> ThreadPoolExecutor:
+    global _leg_pool
+    if _leg_pool is None:
+        with _leg_pool_lock:
+            if _leg_pool is None:
+                _leg_pool = ThreadPoolExecutor(max_workers=settings.ROUTE_PROVIDER['LEG_WORKERS'],
+                                               thread_name_prefix='route-leg')
+    return _leg_pool
+
 
 class RouteCalculator:
     """
-    Calculates routes using free map APIs
+    Calculates routes using a pluggable RouteProvider (mock, generic HTTP or
+    OpenRouteService, see settings.ROUTE_PROVIDER)
     """
     
-    def __init__(self):
-        # We'll use OpenRouteService (free tier available)
-        self.api_key = "your-api-key"  # Get from https://openrouteservice.org/
+    def __init__(self, cache: RouteCache = None, provider: RouteProvider = None,
+                 geocoder: OfflineGeocoder = None):
+        self.cache = cache or get_route_cache()
+        self.provider = provider or get_route_provider()
+        self.geocoder = geocoder or get_geocoder()
         
     def calculate(self, current_location: str, pickup_location: str, 
                   dropoff_location: str) -> Dict:
         """
-        Calculate the complete route from current -> pickup -> dropoff
+        Calculate the complete route from current -> pickup -> dropoff.
+        Results are cached by normalized locations; treat them as read-only.
+        """
+        key = self.cache.make_key(current_location, pickup_location, dropoff_location)
+        route = self.cache.get(key)
+        if route is None:
+            route = self._calculate(current_location, pickup_location, dropoff_location)
+            self.cache.set(key, route)
+        return route
+    
+    def calculate_leg(self, origin: str, destination: str, index: int = 0) -> Dict:
+        """
+        One leg of a route, geocoded offline and cached like calculate().
+        index is the leg's position in its trip, for providers that use it.
+        """
+        key = self.cache.make_key(origin, destination)
+        leg = self.cache.get(key)
+        if leg is None:
+            leg = self.provider.fetch_leg(origin, destination, index=index, origin_point=self.resolve(origin),
+                                          destination_point=self.resolve(destination))
+            self.cache.set(key, leg)
+        return leg
+    
+    async def acalculate(self, current_location: str, pickup_location: str,
+                         dropoff_location: str) -> Dict:
+        """
+        Awaitable calculate(). Legs are awaited concurrently; blocking provider
+        calls and shared-cache lookups run on the bounded leg pool, so a slow
+        route ties up a pool slot rather than the event loop.
         """
-        # For now, return mock data
+        loop = asyncio.get_running_loop()
+        key = self.cache.make_key(current_location, pickup_location, dropoff_location)
+        if self.cache.shared is None:
+            route = self.cache.get(key)
+        else:
+            route = await loop.run_in_executor(_get_leg_pool(), self.cache.get, key)
+        if route is not None:
+            return route
+        locations = [current_location, pickup_location, dropoff_location]
+        waypoints = [self.resolve(location) for location in locations]
+        legs = await asyncio.gather(*(
+            self.provider.afetch_leg(origin, destination, index=i, origin_point=origin_point,
+                                     destination_point=destination_point, executor=_get_leg_pool())
+            for i, (origin, destination, origin_point, destination_point)
+            in enumerate(zip(locations, locations[1:], waypoints, waypoints[1:]))
+        ))
+        route = self.combine_legs(legs)
+        route['waypoints'] = self._waypoints(locations, waypoints)
+        if self.cache.shared is None:
+            self.cache.set(key, route)
+        else:
+            await loop.run_in_executor(_get_leg_pool(), self.cache.set, key, route)
+        return route
+    
+    def _calculate(self, current_location: str, pickup_location: str, 
+                   dropoff_location: str) -> Dict:
+        locations = [current_location, pickup_location, dropoff_location]
+        waypoints = [self.resolve(location) for location in locations]
+        legs = self.fetch_legs(list(zip(locations, locations[1:])), list(zip(waypoints, waypoints[1:])))
+        route = self.combine_legs(legs)
+        route['waypoints'] = self._waypoints(locations, waypoints)
+        return route
+    
+    @staticmethod
+    def _waypoints(locations: List[str], waypoints: List[Dict]) -> List[Dict]:
+        return [
+            {'location': location, 'lat': point['lat'], 'lng': point['lng']} if point else {'location': location}
+            for location, point in zip(locations, waypoints)
+        ]
+    
+    def resolve(self, location: str) -> Dict:
+        """Offline-geocode a location; None if it is not in the gazetteer"""
+        return self.geocoder.resolve(location)
+    
+    def fetch_legs(self, pairs: List[Tuple[str, str]], points: List[Tuple[Dict, Dict]] = None) -> List[Dict]:
+        """Fetch all legs concurrently; latency is the slowest leg, not the sum"""
+        points = points or [(None, None)] * len(pairs)
+        if len(pairs) == 1:
+            (origin, destination), (origin_point, destination_point) = pairs[0], points[0]
+            return [self.provider.fetch_leg(origin, destination, index=0,
+                                            origin_point=origin_point, destination_point=destination_point)]
+        pool = _get_leg_pool()
+        futures = [
+            pool.submit(self.provider.fetch_leg, origin, destination, index=i,
+                        origin_point=origin_point, destination_point=destination_point)
+            for i, ((origin, destination), (origin_point, destination_point)) in enumerate(zip(pairs, points))
+        ]
+        return [future.result() for future in futures]
+    
+    @staticmethod
+    def combine_legs(legs: List[Dict]) -> Dict:
+        """Join legs into the route shape used by the planner and API"""
+        points = []
+        for leg in legs:
+            leg_points = leg['points']
+            if points and leg_points and points[-1] == leg_points[0]:
+                leg_points = leg_points[1:]
+            points.extend(leg_points)
         return {
-            'points': [
-                {'lat': 37.7749, 'lng': -122.4194},  # San Francisco (example)
-                {'lat': 34.0522, 'lng': -118.2437},  # Los Angeles (example)
-            ],
-            'total_distance': 380,  # miles
+            'points': points,
+            'total_distance': sum(leg['distance'] for leg in legs),  # miles
             'segments': [
                 {
-                    'from': current_location,
-                    'to': pickup_location,
-                    'distance': 50,
-                    'duration': 1
-                },
-                {
-                    'from': pickup_location,
-                    'to': dropoff_location,
-                    'distance': 330,
-                    'duration': 6
+                    'from': leg['from'],
+                    'to': leg['to'],
+                    'distance': leg['distance'],
+                    'duration': leg['duration']
                 }
+                for leg in legs
             ]
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,106 @@
+# backend/api/services/route_geometry.py
+import math
+from array import array
+from bisect import bisect_right
+from typing import Dict, Optional, Sequence, Tuple
+import polyline
+from .optional_deps import numpy
+
+EARTH_RADIUS_MILES = 3958.7613
+
+
+def _cumulative_miles(lat: Sequence[float], lng: Sequence[float]) -> array:
+    """Prefix sums of haversine distances between consecutive vertices"""
+    n = len(lat)
+    if n < 2:
+        return array('d', [0.0] * n)
+    np = numpy()
+    if np is not None:
+        la = np.radians(np.asarray(lat, dtype=np.float64))
+        lo = np.radians(np.asarray(lng, dtype=np.float64))
+        a = (np.sin(np.diff(la) / 2) ** 2
+             + np.cos(la[:-1]) * np.cos(la[1:]) * np.sin(np.diff(lo) / 2) ** 2)
+        legs = 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        return array('d', np.concatenate(([0.0], np.cumsum(legs))).tolist())
+    cumulative = array('d', [0.0])
+    total = 0.0
+    for i in range(1, n):
+        lat1, lat2 = math.radians(lat[i - 1]), math.radians(lat[i])
+        dlat = lat2 - lat1
+        dlng = math.radians(lng[i] - lng[i - 1])
+        a = math.sin(dlat / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlng / 2) ** 2
+        total += 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(min(a, 1.0)))
+        cumulative.append(total)
+    return cumulative
+
+
+def distances_to(lat: Sequence[float], lng: Sequence[float], lat0: float, lng0: float) -> array:
+    """Great-circle miles from each (lat, lng) to one point, in a single pass"""
+    np = numpy()
+    if np is not None and len(lat):
+        la = np.radians(np.asarray(lat, dtype=np.float64))
+        lo = np.radians(np.asarray(lng, dtype=np.float64))
+        la0, lo0 = math.radians(lat0), math.radians(lng0)
+        a = np.sin((la - la0) / 2) ** 2 + np.cos(la) * math.cos(la0) * np.sin((lo - lo0) / 2) ** 2
+        return array('d', (2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))).tolist())
+    la0, lo0 = math.radians(lat0), math.radians(lng0)
+    miles = array('d')
+    for point_lat, point_lng in zip(lat, lng):
+        la, lo = math.radians(point_lat), math.radians(point_lng)
+        a = math.sin((la - la0) / 2) ** 2 + math.cos(la) * math.cos(la0) * math.sin((lo - lo0) / 2) ** 2
+        miles.append(2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(min(a, 1.0))))
+    return miles
+
+
+class RouteGeometry:
+    """
+    Route polyline decoded once into packed coordinate arrays plus a
+    cumulative-distance prefix array, so any position along the route is a
+    binary search and a linear interpolation instead of a walk over the points.
+    """
+
+    __slots__ = ('lat', 'lng', 'cumulative', 'length')
+
+    def __init__(self, coordinates: Sequence[Tuple[float, float]]):
+        self.lat = array('d', (c[0] for c in coordinates))
+        self.lng = array('d', (c[1] for c in coordinates))
+        self.cumulative = _cumulative_miles(self.lat, self.lng)
+        self.length = self.cumulative[-1] if len(self.cumulative) else 0.0
+
+    @classmethod
+    def from_route(cls, route_data: Dict) -> 'RouteGeometry':
+        """Build from an encoded 'geometry' polyline if present, else from 'points'"""
+        encoded = route_data.get('geometry')
+        if encoded:
+            return cls(polyline.decode(encoded))
+        return cls([(p['lat'], p['lng']) for p in route_data.get('points', [])])
+
+    def __len__(self):
+        return len(self.lat)
+
+    def locate(self, miles_along: float) -> Optional[Dict]:
+        """Position at a distance along the polyline (clamped to its ends)"""
+        n = len(self.lat)
+        if n == 0:
+            return None
+        if n == 1 or miles_along <= 0:
+            return {'lat': self.lat[0], 'lng': self.lng[0]}
+        if miles_along >= self.length:
+            return {'lat': self.lat[-1], 'lng': self.lng[-1]}
+        i = min(bisect_right(self.cumulative, miles_along) - 1, n - 2)
+        span = self.cumulative[i + 1] - self.cumulative[i]
+        t = (miles_along - self.cumulative[i]) / span if span > 0 else 0.0
+        return {
+            'lat': self.lat[i] + (self.lat[i + 1] - self.lat[i]) * t,
+            'lng': self.lng[i] + (self.lng[i + 1] - self.lng[i]) * t,
+        }
+
+    def locate_mile(self, mile_marker: float, total_distance: float) -> Optional[Dict]:
+        """
+        Position for a road-distance mile marker. Road miles are mapped
+        proportionally onto the polyline, whose length is usually shorter
+        when the geometry is simplified.
+        """
+        if total_distance <= 0:
+            return self.locate(0)
+        return self.locate(self.length * mile_marker / total_distance)
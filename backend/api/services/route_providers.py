@@ -0,0 +1,220 @@
+# backend/api/services/route_providers.py
+import asyncio
+import threading
+from concurrent.futures import Executor
+from functools import partial
+from typing import TYPE_CHECKING, Dict, List, Optional
+from django.conf import settings
+
+if TYPE_CHECKING:
+    import requests
+
+METERS_PER_MILE = 1609.344
+
+
+class RouteProviderError(Exception):
+    """Raised when a route provider cannot produce a leg"""
+
+
+class RouteProvider:
+    """
+    Interface for routing backends. A provider turns one origin/destination
+    pair into a leg dict: {'from', 'to', 'distance' (miles), 'duration'
+    (hours), 'points' ([{'lat', 'lng'}, ...])}. fetch_leg must be thread-safe;
+    RouteCalculator calls it concurrently for every leg of a trip.
+    origin_point/destination_point are offline-geocoded {'lat', 'lng'} dicts,
+    or None when the location was not in the gazetteer.
+    afetch_leg is the awaitable form; by default it runs fetch_leg on the
+    given executor so the event loop is never blocked on network I/O.
+    """
+
+    def fetch_leg(self, origin: str, destination: str, index: int = 0,
+                  origin_point: Optional[Dict] = None, destination_point: Optional[Dict] = None) -> Dict:
+        raise NotImplementedError
+
+    async def afetch_leg(self, origin: str, destination: str, index: int = 0,
+                         origin_point: Optional[Dict] = None, destination_point: Optional[Dict] = None,
+                         executor: Optional[Executor] = None) -> Dict:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, partial(
+            self.fetch_leg, origin, destination, index=index,
+            origin_point=origin_point, destination_point=destination_point,
+        ))
+
+
+class MockRouteProvider(RouteProvider):
+    """Fixed San Francisco -> Los Angeles legs used until a real backend is configured"""
+
+    LEGS = [
+        {'distance': 50, 'duration': 1, 'points': [{'lat': 37.7749, 'lng': -122.4194}]},   # San Francisco (example)
+        {'distance': 330, 'duration': 6, 'points': [{'lat': 34.0522, 'lng': -118.2437}]},  # Los Angeles (example)
+    ]
+
+    def fetch_leg(self, origin: str, destination: str, index: int = 0,
+                  origin_point: Optional[Dict] = None, destination_point: Optional[Dict] = None) -> Dict:
+        leg = self.LEGS[min(index, len(self.LEGS) - 1)]
+        return {
+            'from': origin,
+            'to': destination,
+            'distance': leg['distance'],
+            'duration': leg['duration'],
+            'points': list(leg['points']),
+        }
+
+    async def afetch_leg(self, origin: str, destination: str, index: int = 0,
+                         origin_point: Optional[Dict] = None, destination_point: Optional[Dict] = None,
+                         executor: Optional[Executor] = None) -> Dict:
+        # No I/O, so no need to leave the event loop
+        return self.fetch_leg(origin, destination, index)
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(pool_size: int = 16, retries: int = 2, backoff: float = 0.2) -> 'requests.Session':
+    """
+    Process-wide keep-alive session per configuration. Connections are pooled
+    and idempotent requests are retried on connection errors and 429/5xx.
+    requests is imported here, so processes on the mock backend never load it.
+    """
+    key = (pool_size, retries, backoff)
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                retry = Retry(
+                    total=retries,
+                    backoff_factor=backoff,
+                    status_forcelist=(429, 500, 502, 503, 504),
+                    allowed_methods=frozenset(['GET', 'POST']),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _sessions[key] = session
+    return session
+
+
+class HTTPRouteProvider(RouteProvider):
+    """
+    Generic JSON provider: GET {base_url}/route?from=...&to=... (plus
+    from_coords/to_coords as "lat,lng" when geocoded offline) returning
+    {'distance': miles, 'duration': hours, 'points': [{'lat', 'lng'}, ...]}.
+    This is the contract served by the local stub (manage.py run_route_stub).
+    """
+
+    def __init__(self, base_url: str, timeout: float = 5.0, session: Optional['requests.Session'] = None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = session or get_session()
+
+    def fetch_leg(self, origin: str, destination: str, index: int = 0,
+                  origin_point: Optional[Dict] = None, destination_point: Optional[Dict] = None) -> Dict:
+        params = {'from': origin, 'to': destination}
+        if origin_point and destination_point:
+            params['from_coords'] = f"{origin_point['lat']},{origin_point['lng']}"
+            params['to_coords'] = f"{destination_point['lat']},{destination_point['lng']}"
+        import requests
+        try:
+            response = self.session.get(
+                f"{self.base_url}/route",
+                params=params,
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()
+            return {
+                'from': origin,
+                'to': destination,
+                'distance': data['distance'],
+                'duration': data['duration'],
+                'points': data.get('points', []),
+            }
+        except (requests.RequestException, ValueError) as exc:
+            raise RouteProviderError(f"Route lookup failed for {origin} -> {destination}: {exc}") from exc
+        except (KeyError, TypeError) as exc:
+            raise RouteProviderError(f"Unexpected route response for {origin} -> {destination}") from exc
+
+
+class OpenRouteServiceProvider(RouteProvider):
+    """
+    OpenRouteService (https://openrouteservice.org/) heavy-goods-vehicle routing.
+    Locations missing from the offline gazetteer are geocoded with the ORS
+    geocoder before routing.
+    """
+
+    BASE_URL = 'https://api.openrouteservice.org'
+
+    def __init__(self, api_key: str, timeout: float = 5.0, session: Optional['requests.Session'] = None,
+                 base_url: str = None):
+        self.api_key = api_key
+        self.timeout = timeout
+        self.session = session or get_session()
+        self.base_url = (base_url or self.BASE_URL).rstrip('/')
+
+    def _get(self, path: str, params: Dict) -> Dict:
+        import requests
+        try:
+            response = self.session.get(
+                f"{self.base_url}{path}",
+                params=params,
+                headers={'Authorization': self.api_key},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError) as exc:
+            raise RouteProviderError(f"OpenRouteService request to {path} failed: {exc}") from exc
+
+    def geocode(self, location: str) -> List[float]:
+        """Return [lng, lat] for a free-text location"""
+        data = self._get('/geocode/search', {'text': location, 'size': 1})
+        features = data.get('features') or []
+        if not features:
+            raise RouteProviderError(f"Could not geocode location: {location}")
+        return features[0]['geometry']['coordinates']
+
+    def fetch_leg(self, origin: str, destination: str, index: int = 0,
+                  origin_point: Optional[Dict] = None, destination_point: Optional[Dict] = None) -> Dict:
+        # Only fall back to the ORS geocoder for places the offline index missed
+        start = [origin_point['lng'], origin_point['lat']] if origin_point else self.geocode(origin)
+        end = [destination_point['lng'], destination_point['lat']] if destination_point else self.geocode(destination)
+        data = self._get('/v2/directions/driving-hgv', {
+            'start': f"{start[0]},{start[1]}",
+            'end': f"{end[0]},{end[1]}",
+        })
+        try:
+            feature = data['features'][0]
+            summary = feature['properties']['summary']
+            coordinates = feature['geometry']['coordinates']
+        except (KeyError, IndexError) as exc:
+            raise RouteProviderError(f"Unexpected OpenRouteService response for {origin} -> {destination}") from exc
+        return {
+            'from': origin,
+            'to': destination,
+            'distance': summary['distance'] / METERS_PER_MILE,
+            'duration': summary['duration'] / 3600,
+            'points': [{'lat': lat, 'lng': lng} for lng, lat in coordinates],
+        }
+
+
+def get_route_provider() -> RouteProvider:
+    """Build the provider selected by settings.ROUTE_PROVIDER"""
+    config = settings.ROUTE_PROVIDER
+    backend = config['BACKEND']
+    if backend == 'mock':
+        return MockRouteProvider()
+    session = get_session(pool_size=config['POOL_SIZE'], retries=config['RETRIES'])
+    if backend == 'http':
+        return HTTPRouteProvider(config['BASE_URL'], timeout=config['TIMEOUT'], session=session)
+    if backend == 'ors':
+        return OpenRouteServiceProvider(config['API_KEY'], timeout=config['TIMEOUT'], session=session,
+                                        base_url=config['BASE_URL'] or None)
+    raise ValueError(f"Unknown route provider backend: {backend}")
@@ -0,0 +1,71 @@
+# backend/api/services/route_stub.py
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import parse_qs, urlparse
+
+AVERAGE_SPEED_MPH = 55
+
+
+def _coordinate(location: str) -> dict:
+    """Deterministic pseudo-coordinate inside the continental US"""
+    digest = hashlib.sha1(location.casefold().encode()).digest()
+    lat = 25 + digest[0] / 255 * 24
+    lng = -124 + digest[1] / 255 * 57
+    return {'lat': round(lat, 5), 'lng': round(lng, 5)}
+
+
+class StubRouteHandler(BaseHTTPRequestHandler):
+    """
+    Serves GET /route?from=...&to=... with the HTTPRouteProvider contract.
+    Distances are derived from a hash of the names, so results are stable.
+    """
+
+    # Artificial per-request latency in seconds, to exercise concurrent fetching
+    latency = 0.0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        if url.path != '/route' or 'from' not in query or 'to' not in query:
+            self.send_error(404)
+            return
+        origin, destination = query['from'][0], query['to'][0]
+        digest = hashlib.sha1(f"{origin.casefold()}|{destination.casefold()}".encode()).digest()
+        distance = 20 + int.from_bytes(digest[:2], 'big') % 1500
+        body = json.dumps({
+            'distance': distance,
+            'duration': round(distance / AVERAGE_SPEED_MPH, 3),
+            'points': [_coordinate(origin), _coordinate(destination)],
+        }).encode()
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_stub_server(host: str = '127.0.0.1', port: int = 0, latency: float = 0.0) -> ThreadingHTTPServer:
+    handler = type('ConfiguredStubRouteHandler', (StubRouteHandler,), {'latency': latency})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def stub_base_url(server: ThreadingHTTPServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
+
+
+def start_stub_server(host: str = '127.0.0.1', port: int = 0, latency: float = 0.0) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stub in a daemon thread; returns (server, base_url). Call server.shutdown() to stop."""
+    server = make_stub_server(host, port, latency)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, stub_base_url(server)
@@ -0,0 +1,112 @@
+# backend/api/services/sheet_store.py
+import hashlib
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+# Monotonic time of this process's last sweep; sweeps are throttled to one
+# per SHEET_STORE['PURGE_INTERVAL'] seconds
+_last_purge = 0.0
+_purge_lock = threading.Lock()
+
+class SheetStore:
+    """
+    Content-addressed storage for rendered log sheets (PNG or SVG).
+    Sheets are keyed by the SHA-256 of their bytes, so identical sheets are
+    stored once and a key always refers to the same image. A sheet id is the
+    bare digest for PNGs and "<digest>.svg" for SVGs.
+    Sheets not saved again for ttl seconds are deleted, then the oldest
+    until the store holds at most max_bytes; saving an existing sheet
+    refreshes its age.
+    """
+    
+    PREFIX = 'log_sheets'
+    CONTENT_TYPES = {'png': 'image/png', 'svg': 'image/svg+xml'}
+    
+    def __init__(self, storage=None, ttl: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.storage = storage or default_storage
+        self.ttl = settings.SHEET_STORE['TTL'] if ttl is None else ttl
+        self.max_bytes = settings.SHEET_STORE['MAX_BYTES'] if max_bytes is None else max_bytes
+    
+    def _path(self, digest: str, extension: str) -> str:
+        return f"{self.PREFIX}/{digest}.{extension}"
+    
+    @staticmethod
+    def parse_id(sheet_id: str) -> Tuple[str, str]:
+        """Split a sheet id into (digest, extension)"""
+        digest, _, extension = sheet_id.partition('.')
+        return digest, extension or 'png'
+    
+    def save(self, data: bytes, extension: str = 'png') -> str:
+        """Store the sheet if it is not already present and return its id"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest, extension)
+        if not self.storage.exists(path):
+            self.storage.save(path, ContentFile(data))
+        else:
+            self._touch(path)
+        self._maybe_purge()
+        return digest if extension == 'png' else f"{digest}.{extension}"
+    
+    def exists(self, digest: str, extension: str = 'png') -> bool:
+        return self.storage.exists(self._path(digest, extension))
+    
+    def load(self, digest: str, extension: str = 'png') -> Optional[bytes]:
+        """Return the sheet bytes for a digest, or None if unknown"""
+        path = self._path(digest, extension)
+        if not self.storage.exists(path):
+            return None
+        with self.storage.open(path, 'rb') as fh:
+            return fh.read()
+    
+    def purge(self) -> int:
+        """Delete expired sheets, then the oldest until under max_bytes; returns how many"""
+        try:
+            _, names = self.storage.listdir(self.PREFIX)
+        except FileNotFoundError:
+            return 0
+        cutoff = timezone.now() - timedelta(seconds=self.ttl)
+        sheets = []
+        for name in names:
+            path = f"{self.PREFIX}/{name}"
+            try:
+                sheets.append((self._modified(path), self.storage.size(path), path))
+            except FileNotFoundError:
+                continue  # deleted by another process meanwhile
+        sheets.sort()
+        total = sum(size for _, size, _ in sheets)
+        deleted = 0
+        for modified, size, path in sheets:
+            if modified >= cutoff and total <= self.max_bytes:
+                break
+            self.storage.delete(path)
+            total -= size
+            deleted += 1
+        return deleted
+    
+    def _modified(self, path: str) -> datetime:
+        modified = self.storage.get_modified_time(path)
+        return modified if timezone.is_aware(modified) else timezone.make_aware(modified)
+    
+    def _touch(self, path: str) -> None:
+        try:
+            os.utime(self.storage.path(path))
+        except (NotImplementedError, FileNotFoundError):
+            pass  # remote storage: the sheet keeps its first-save age
+    
+    def _maybe_purge(self) -> None:
+        global _last_purge
+        now = time.monotonic()
+        if now - _last_purge < settings.SHEET_STORE['PURGE_INTERVAL']:
+            return
+        with _purge_lock:
+            if now - _last_purge < settings.SHEET_STORE['PURGE_INTERVAL']:
+                return
+            _last_purge = now
+        self.purge()
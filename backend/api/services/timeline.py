@@ -0,0 +1,87 @@
+# backend/api/services/timeline.py
+from typing import List
+
+OFF_DUTY = 'off_duty'
+SLEEPER_BERTH = 'sleeper_berth'
+DRIVING = 'driving'
+ON_DUTY_NOT_DRIVING = 'on_duty_not_driving'
+STATUSES = (OFF_DUTY, SLEEPER_BERTH, DRIVING, ON_DUTY_NOT_DRIVING)
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class Segment:
+    """One duty-status interval; minutes are counted from midnight of the trip's first day"""
+
+    __slots__ = ('start_minute', 'duration', 'status')
+
+    def __init__(self, start_minute: float, duration: float, status: str):
+        self.start_minute = start_minute
+        self.duration = duration
+        self.status = status
+
+    @property
+    def end_minute(self) -> float:
+        return self.start_minute + self.duration
+
+    def __repr__(self):
+        return f"Segment({self.start_minute!r}, {self.duration!r}, {self.status!r})"
+
+    def __eq__(self, other):
+        return (isinstance(other, Segment) and self.start_minute == other.start_minute
+                and self.duration == other.duration and self.status == other.status)
+
+
+class TimelineBuilder:
+    """Appends consecutive duty-status intervals, merging runs of the same status"""
+
+    __slots__ = ('segments', 'clock')
+
+    def __init__(self, start_minute: float = 0):
+        self.segments: List[Segment] = []
+        self.clock = 0
+        if start_minute > 0:
+            self.add(OFF_DUTY, start_minute)
+
+    def add(self, status: str, minutes: float) -> None:
+        if minutes <= 0:
+            return
+        last = self.segments[-1] if self.segments else None
+        if last is not None and last.status == status:
+            last.duration += minutes
+        else:
+            self.segments.append(Segment(self.clock, minutes, status))
+        self.clock += minutes
+
+
+def split_by_day(segments: List[Segment], pad_last_day: bool = True) -> List[List[Segment]]:
+    """
+    Slice a timeline at midnight boundaries in one pass.
+    Returned segments start at the minute within their own calendar day; with
+    pad_last_day the final day is filled with off-duty time up to midnight.
+    """
+    days: List[List[Segment]] = []
+    current: List[Segment] = []
+    day_start = 0
+    for segment in segments:
+        start = segment.start_minute
+        end = start + segment.duration
+        while start < end:
+            day_end = day_start + MINUTES_PER_DAY
+            if start >= day_end:
+                days.append(current)
+                current = []
+                day_start = day_end
+                continue
+            piece_end = min(end, day_end)
+            current.append(Segment(start - day_start, piece_end - start, segment.status))
+            start = piece_end
+    if current or not days:
+        days.append(current)
+    if pad_last_day:
+        last = days[-1]
+        used = last[-1].end_minute if last else 0
+        if used < MINUTES_PER_DAY:
+            last.append(Segment(used, MINUTES_PER_DAY - used, OFF_DUTY))
+    return days
+
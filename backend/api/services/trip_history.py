@@ -0,0 +1,88 @@
+# backend/api/services/trip_history.py
+import base64
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from django.db.models import Q
+from ..models import Trip
+
+# Fields a history client may project; 'id' and 'trip_date' are always returned
+HISTORY_FIELDS = (
+    'driver_id', 'trip_date', 'created_at', 'current_location', 'pickup_location',
+    'dropoff_location', 'current_cycle_hours', 'total_distance', 'total_time',
+    'num_days', 'stops', 'log_sheet_ids',
+)
+DEFAULT_FIELDS = tuple(f for f in HISTORY_FIELDS if f not in ('stops', 'log_sheet_ids'))
+
+
+def trip_from_result(data: Dict, result: Dict, trip_date: Optional[date] = None) -> Trip:
+    """
+    Unsaved Trip for a planned request. Call before the log sheet digests are
+    replaced by URLs; inline images are not kept.
+    """
+    return Trip(
+        driver_id=data.get('driver_id', ''),
+        trip_date=trip_date or date.today(),
+        current_location=data['current_location'],
+        pickup_location=data['pickup_location'],
+        dropoff_location=data['dropoff_location'],
+        current_cycle_hours=data['current_cycle_hours'],
+        total_distance=result['total_distance'],
+        total_time=result['total_time'],
+        num_days=len(result['log_sheets']) or 1,
+        stops=result['stops'],
+        log_sheet_ids=[log['log_image_id'] for log in result['log_sheets'] if 'log_image_id' in log],
+    )
+
+
+def copy_trip(trip: Trip) -> Trip:
+    """Unsaved copy of trip with a new id and creation time"""
+    return Trip(**{
+        field.attname: getattr(trip, field.attname)
+        for field in Trip._meta.concrete_fields
+        if not field.primary_key
+    })
+
+
+def encode_cursor(trip_date: date, pk: int) -> str:
+    return base64.urlsafe_b64encode(f"{trip_date.isoformat()}:{pk}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    """Inverse of encode_cursor; raises ValueError for anything malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        day, pk = raw.split(':')
+        return date.fromisoformat(day), int(pk)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def query_history(start_date: Optional[date] = None, end_date: Optional[date] = None,
+                  driver_id: Optional[str] = None, cursor: Optional[str] = None,
+                  limit: int = 50, fields: Iterable[str] = DEFAULT_FIELDS) -> Tuple[List[Dict], Optional[str]]:
+    """
+    One page of trips, newest first, and the cursor for the next page.
+    Pages continue strictly after the (trip_date, id) of the previous page's
+    last row, so every page is an index range scan of limit + 1 rows rather
+    than an OFFSET that grows with the page number. Rows come back as dicts
+    of just the requested columns.
+    """
+    queryset = Trip.objects.all()
+    if driver_id is not None:
+        queryset = queryset.filter(driver_id=driver_id)
+    if start_date is not None:
+        queryset = queryset.filter(trip_date__gte=start_date)
+    if end_date is not None:
+        queryset = queryset.filter(trip_date__lte=end_date)
+    if cursor:
+        last_date, last_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(trip_date__lt=last_date) | Q(trip_date=last_date, id__lt=last_id)
+        )
+    columns = ['id', 'trip_date'] + [f for f in fields if f != 'trip_date']
+    rows = list(queryset.order_by('-trip_date', '-id').values(*columns)[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]['trip_date'], rows[-1]['id'])
+    return rows, next_cursor
@@ -0,0 +1,184 @@
+# backend/api/services/trip_jobs.py
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Dict, Optional, Tuple
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+from ..models import TripJob
+from .response_cache import response_key
+from .trip_history import trip_from_result
+from .trip_planner import get_trip_planner
+
+# Seconds between database checks while long-polling a job another process runs
+POLL_INTERVAL = 0.5
+
+
+def _plain(value: Dict) -> Dict:
+    """JSON-safe copy (dates as ISO strings, as in API responses) for a JSONField"""
+    return json.loads(json.dumps(value, cls=JSONEncoder))
+
+
+class QueueFull(Exception):
+    """Raised when a process already has its maximum of jobs queued or running"""
+
+
+def job_key(data: Dict, plan_date: date) -> str:
+    """
+    Dedup key for a validated request. Stored results hold sheet ids rather
+    than URLs and are rendered per read, so media type and host do not matter.
+    """
+    return response_key(data, plan_date, media_type='', base_url='')
+
+
+class TripJobQueue:
+    """
+    Plans trips on a bounded thread pool in this process, with the job rows
+    in the database so any process can report on them. Each process accepts
+    at most max_pending jobs that are queued or running; identical requests
+    in flight share one job. Finished results expire after result_ttl
+    seconds, and in-flight jobs older than timeout seconds (their process
+    died) are reported as failed.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 100, result_ttl: int = 3600,
+                 timeout: int = 900):
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='trip-job')
+        self._lock = threading.Lock()
+        # Jobs this process runs, set when they finish so long-polls wake at once
+        self._events: Dict[str, threading.Event] = {}
+
+    def submit(self, data: Dict, plan_date: Optional[date] = None) -> Tuple[TripJob, bool]:
+        """
+        Queue a validated trip request (cycle hours resolved). Returns the
+        job and whether it was newly created rather than an identical
+        in-flight one. Raises QueueFull when this process is at capacity.
+        """
+        plan_date = plan_date or date.today()
+        key = job_key(data, plan_date)
+        self.purge_expired()
+        existing = self._in_flight(key)
+        if existing is not None:
+            return existing, False
+        with self._lock:
+            if len(self._events) >= self.max_pending:
+                raise QueueFull(f"At most {self.max_pending} trip jobs can be pending")
+            try:
+                with transaction.atomic():
+                    job = TripJob.objects.create(request_key=key, request=_plain(data), plan_date=plan_date)
+            except IntegrityError:
+                # Another process queued the same request first
+                existing = self._in_flight(key)
+                if existing is not None:
+                    return existing, False
+                raise
+            job_id = str(job.pk)
+            self._events[job_id] = threading.Event()
+        self._pool.submit(self._run, job_id)
+        return job, True
+
+    def get(self, job_id, wait: float = 0) -> Optional[TripJob]:
+        """
+        The job, or None if unknown or expired. With wait, block up to that
+        many seconds for an in-flight job to finish before returning it.
+        """
+        deadline = time.monotonic() + wait
+        while True:
+            job = TripJob.objects.filter(pk=job_id).first()
+            if job is None or self._expired(job):
+                return None
+            if job.finished or self._abandon_if_stale(job):
+                return job
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return job
+            event = self._events.get(str(job.pk))
+            if event is not None:
+                event.wait(remaining)
+            else:
+                time.sleep(min(POLL_INTERVAL, remaining))
+
+    def purge_expired(self) -> int:
+        """Delete finished jobs past their expiry; returns how many"""
+        deleted, _ = TripJob.objects.filter(expires_at__lt=timezone.now()).delete()
+        return deleted
+
+    def pending(self) -> int:
+        """Jobs queued or running in this process"""
+        return len(self._events)
+
+    def _in_flight(self, key: str) -> Optional[TripJob]:
+        job = TripJob.objects.filter(request_key=key, status__in=TripJob.IN_FLIGHT).first()
+        if job is None or self._abandon_if_stale(job):
+            return None
+        return job
+
+    def _expired(self, job: TripJob) -> bool:
+        return job.expires_at is not None and job.expires_at < timezone.now()
+
+    def _abandon_if_stale(self, job: TripJob) -> bool:
+        """Fail an in-flight job whose process stopped working on it"""
+        if job.finished or job.created_at > timezone.now() - timedelta(seconds=self.timeout):
+            return False
+        self._finish(job, TripJob.FAILED, error="Job did not finish in time")
+        return True
+
+    def _finish(self, job: TripJob, status: str, result: Optional[Dict] = None, error: str = '') -> None:
+        now = timezone.now()
+        job.status, job.result, job.error = status, result, error
+        job.finished_at = now
+        job.expires_at = now + timedelta(seconds=self.result_ttl)
+        # Only an in-flight row is finished, so a late worker cannot overwrite an abandoned job
+        TripJob.objects.filter(pk=job.pk, status__in=TripJob.IN_FLIGHT).update(
+            status=status, result=result, error=error, finished_at=now, expires_at=job.expires_at,
+        )
+
+    def _run(self, job_id: str) -> None:
+        try:
+            # Claim the job unless it was given up on while it waited in the pool
+            if not TripJob.objects.filter(pk=job_id, status=TripJob.QUEUED).update(
+                    status=TripJob.RUNNING, started_at=timezone.now()):
+                return
+            job = TripJob.objects.get(pk=job_id)
+            data = job.request
+            try:
+                result = get_trip_planner().plan(data, start_date=job.plan_date)
+                trip_from_result(data, result, trip_date=job.plan_date).save()
+            except Exception as exc:
+                self._finish(job, TripJob.FAILED, error=str(exc) or exc.__class__.__name__)
+            else:
+                self._finish(job, TripJob.SUCCEEDED, result=_plain(result))
+        finally:
+            with self._lock:
+                event = self._events.pop(job_id, None)
+            if event is not None:
+                event.set()
+            # Pool threads outlive the job; do not leave their connections open
+            connections.close_all()
+
+
+_trip_job_queue = None
+_trip_job_queue_lock = threading.Lock()
+
+
+def get_trip_job_queue() -> TripJobQueue:
+    """Process-wide job queue configured from settings.TRIP_JOBS"""
+    global _trip_job_queue
+    if _trip_job_queue is None:
+        with _trip_job_queue_lock:
+            if _trip_job_queue is None:
+                config = settings.TRIP_JOBS
+                _trip_job_queue = TripJobQueue(
+                    max_workers=config['WORKERS'],
+                    max_pending=config['MAX_PENDING'],
+                    result_ttl=config['RESULT_TTL'],
+                    timeout=config['TIMEOUT'],
+                )
+    return _trip_job_queue
@@ -0,0 +1,131 @@
+# backend/api/services/trip_plan.py
+from typing import Dict, List, Optional, Sequence
+from .timeline import DRIVING, OFF_DUTY, ON_DUTY_NOT_DRIVING, Segment
+
+
+class Stop:
+    """A planned stop; mile_marker is rounded to 0.1 mile and duration is in minutes"""
+
+    __slots__ = ('type', 'mile_marker', 'duration', 'description', 'location', 'facility')
+
+    def __init__(self, stop_type: str, mile_marker: float, duration: int, description: str,
+                 location: Optional[Dict] = None, facility: Optional[Dict] = None):
+        self.type = stop_type
+        self.mile_marker = mile_marker
+        self.duration = duration
+        self.description = description
+        self.location = location
+        self.facility = facility
+
+    def to_dict(self) -> Dict:
+        """StopSerializer's wire format; location and facility only when known"""
+        stop = {
+            'type': self.type,
+            'mile_marker': self.mile_marker,
+            'duration': self.duration,
+            'description': self.description,
+        }
+        if self.location is not None:
+            stop['location'] = self.location
+        if self.facility is not None:
+            stop['facility'] = self.facility
+        return stop
+
+    def __repr__(self):
+        return f"Stop({self.type!r}, {self.mile_marker!r}, {self.duration!r}, {self.description!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Stop) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+
+class DutyDay:
+    """
+    Hours per duty status for one day. Plans count duty days (a rest starts
+    the next one) and track whether the 30-minute break was taken; log sheets
+    use calendar days and carry that day's Segments, counted from midnight.
+    """
+
+    __slots__ = ('driving', 'on_duty_not_driving', 'sleeper_berth', 'off_duty', 'break_taken',
+                 'segments', 'remarks')
+
+    def __init__(self, driving: float = 0, on_duty_not_driving: float = 0, sleeper_berth: float = 0,
+                 off_duty: float = 0, break_taken: bool = False, segments: Sequence[Segment] = (),
+                 remarks: Sequence[str] = ()):
+        self.driving = driving
+        self.on_duty_not_driving = on_duty_not_driving
+        self.sleeper_berth = sleeper_berth
+        self.off_duty = off_duty
+        self.break_taken = break_taken
+        self.segments = segments
+        self.remarks = remarks
+
+    @classmethod
+    def from_segments(cls, segments: List[Segment]) -> 'DutyDay':
+        """Totals for one calendar day's segments, which the day keeps"""
+        driving = on_duty = sleeper = off_duty = 0.0
+        for segment in segments:
+            status = segment.status
+            if status == DRIVING:
+                driving += segment.duration
+            elif status == ON_DUTY_NOT_DRIVING:
+                on_duty += segment.duration
+            elif status == OFF_DUTY:
+                off_duty += segment.duration
+            else:
+                sleeper += segment.duration
+        return cls(driving / 60, on_duty / 60, sleeper / 60, off_duty / 60, segments=segments)
+
+    def __repr__(self):
+        return (f"DutyDay(driving={self.driving!r}, on_duty_not_driving={self.on_duty_not_driving!r}, "
+                f"sleeper_berth={self.sleeper_berth!r}, off_duty={self.off_duty!r})")
+
+    def __eq__(self, other):
+        return isinstance(other, DutyDay) and all(
+            getattr(self, name) == getattr(other, name) for name in self.__slots__
+        )
+
+
+class TripPlan:
+    """
+    An HOS plan: stops in route order, duty-day totals, the duty-status
+    timeline (Segments from midnight of day one) and, for planning_mode
+    'optimized', the planner report. to_wire is the one conversion to the
+    API's dict format.
+    """
+
+    __slots__ = ('stops', 'days', 'timeline', 'planner')
+
+    def __init__(self, stops: List[Stop], days: List[DutyDay], timeline: List[Segment],
+                 planner: Optional[Dict] = None):
+        self.stops = stops
+        self.days = days
+        self.timeline = timeline
+        self.planner = planner
+
+    @property
+    def total_time(self) -> float:
+        """Driving, on-duty and off-duty hours over all duty days"""
+        return sum(d.driving + d.on_duty_not_driving + d.off_duty for d in self.days)
+
+    @property
+    def fuel_stops(self) -> List[Stop]:
+        return [stop for stop in self.stops if stop.type == 'fuel']
+
+    def to_wire(self) -> Dict:
+        """
+        stops, total_time, fuel_stops and (when set) planner as the trip
+        response carries them. Each stop is converted once; fuel_stops
+        reuses the same dicts.
+        """
+        stops, fuel_stops = [], []
+        for stop in self.stops:
+            wire = stop.to_dict()
+            stops.append(wire)
+            if stop.type == 'fuel':
+                fuel_stops.append(wire)
+        plan = {'stops': stops, 'total_time': self.total_time, 'fuel_stops': fuel_stops}
+        if self.planner is not None:
+            plan['planner'] = self.planner
+        return plan
@@ -0,0 +1,174 @@
+# backend/api/services/trip_planner.py
+import asyncio
+import threading
+from datetime import date
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Tuple
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from logs.models import DriverCycleState
+from .route_calculator import RouteCalculator
+from .hos_calculator import HOSCalculator
+from .log_generator import LogGenerator
+from .metrics import StageTimings
+from .poi_index import get_poi_index
+from .pools import EXECUTOR_THREAD, get_pool
+from .trip_plan import TripPlan
+
+_trip_planner = None
+_trip_planner_lock = threading.Lock()
+
+
+class TripPlanner:
+    """
+    Runs the route -> HOS plan -> ELD log pipeline for a validated trip request.
+    One instance can plan many trips, so bulk callers pay service setup once.
+    """
+    
+    def __init__(self, route_calculator: RouteCalculator = None, hos_calculator: HOSCalculator = None,
+                 log_generator: LogGenerator = None):
+        self.route_calculator = route_calculator or RouteCalculator()
+        self.hos_calculator = hos_calculator or HOSCalculator(
+            poi_index=get_poi_index(),
+            corridor_miles=settings.POI['CORRIDOR_MILES'],
+            lookback_miles=settings.POI['LOOKBACK_MILES'],
+        )
+        self.log_generator = log_generator or LogGenerator(
+            executor=settings.LOG_RENDER_EXECUTOR,
+            max_workers=settings.LOG_RENDER_WORKERS,
+            min_parallel_days=settings.LOG_RENDER_MIN_PARALLEL_DAYS,
+        )
+    
+    @staticmethod
+    def resolve_cycle_hours(trips: List[Dict], as_of: Optional[date] = None) -> None:
+        """
+        Fill in current_cycle_hours from each driver's logged cycle where the
+        request omitted it, with one query for the whole list
+        """
+        missing = [trip for trip in trips if trip.get('current_cycle_hours') is None]
+        if not missing:
+            return
+        used = DriverCycleState.used_hours({trip['driver_id'] for trip in missing}, as_of or date.today())
+        for trip in missing:
+            trip['current_cycle_hours'] = used[trip['driver_id']]
+    
+    def plan(self, data: Dict, include_logs: bool = True, start_date: Optional[date] = None,
+             timings: Optional[StageTimings] = None, binary_images: bool = False) -> Dict:
+        """
+        Plan one trip from TripRequestSerializer.validated_data.
+        With log_image_mode 'url' the log sheets carry a 'log_image_id' digest
+        that the caller turns into a URL. Stage durations are recorded in
+        timings when given. binary_images keeps inline PNGs as raw bytes.
+        """
+        timings = timings or StageTimings()
+        route, hos_plan = self._route_and_plan(data, start_date, timings)
+        
+        # Generate ELD log sheets as PNGs
+        logs = []
+        if include_logs:
+            inline_images = data.get('log_image_mode', 'inline') == 'inline'
+            with timings.stage('render'):
+                logs = self.log_generator.generate_logs(hos_plan, start_date=start_date,
+                                                        inline_images=inline_images,
+                                                        image_format=data.get('log_image_format', 'png'),
+                                                        binary_images=binary_images)
+        
+        return self._response(route, hos_plan, logs)
+    
+    def _plan_hos(self, data: Dict, route: Dict) -> TripPlan:
+        if data.get('planning_mode') == 'optimized':
+            return self.hos_calculator.plan_trip_optimized(route_data=route,
+                                                           current_cycle_hours=data['current_cycle_hours'],
+                                                           time_budget=settings.HOS_OPTIMIZER_BUDGET_MS / 1000)
+        return self.hos_calculator.plan_trip(route_data=route, current_cycle_hours=data['current_cycle_hours'])
+    
+    @staticmethod
+    def _response(route: Dict, hos_plan: TripPlan, logs: List[Dict]) -> Dict:
+        plan = hos_plan.to_wire()
+        response = {
+            'route': route,
+            'stops': plan['stops'],
+            'log_sheets': logs,
+            'total_distance': route['total_distance'],
+            'total_time': plan['total_time'],
+            'fuel_stops': plan['fuel_stops'],
+        }
+        if 'planner' in plan:
+            response['planner'] = plan['planner']
+        return response
+    
+    async def aplan(self, data: Dict, include_logs: bool = True, start_date: Optional[date] = None,
+                    timings: Optional[StageTimings] = None) -> Dict:
+        """
+        plan() for async views: the route is awaited, and HOS planning and log
+        rendering run on a bounded thread pool (ASYNC_RENDER_WORKERS), so the
+        event loop never runs CPU-bound work itself
+        """
+        timings = timings or StageTimings()
+        loop = asyncio.get_running_loop()
+        # Named, so renders that fan out to a thread pool of the same size
+        # never wait on their own workers
+        pool = get_pool(EXECUTOR_THREAD, settings.ASYNC_RENDER_WORKERS, name='async-plan')
+        if data.get('current_cycle_hours') is None:
+            with timings.stage('cycle'):
+                await sync_to_async(self.resolve_cycle_hours)([data], start_date)
+        with timings.stage('route'):
+            route = await self.route_calculator.acalculate(
+                data['current_location'],
+                data['pickup_location'],
+                data['dropoff_location']
+            )
+        with timings.stage('hos'):
+            hos_plan = await loop.run_in_executor(pool, self._plan_hos, data, route)
+        
+        logs = []
+        if include_logs:
+            inline_images = data.get('log_image_mode', 'inline') == 'inline'
+            with timings.stage('render'):
+                logs = await loop.run_in_executor(pool, partial(
+                    self.log_generator.generate_logs, hos_plan, start_date=start_date, inline_images=inline_images,
+                    image_format=data.get('log_image_format', 'png'),
+                ))
+        
+        return self._response(route, hos_plan, logs)
+    
+    def log_book(self, data: Dict, start_date: Optional[date] = None) -> Iterator[bytes]:
+        """
+        Plan the trip and return its log book as an iterator of PDF chunks.
+        Routing and planning happen here, so provider errors surface before
+        any bytes are streamed.
+        """
+        from logs.log_book_pdf import LogBookPDF  # reportlab is only needed for log books
+        _, hos_plan = self._route_and_plan(data, start_date, StageTimings())
+        return LogBookPDF().stream(self.log_generator.iter_days(hos_plan, start_date))
+    
+    def _route_and_plan(self, data: Dict, start_date: Optional[date], timings: StageTimings) -> Tuple[Dict, TripPlan]:
+        if data.get('current_cycle_hours') is None:
+            with timings.stage('cycle'):
+                self.resolve_cycle_hours([data], start_date)
+
+        # Calculate route (still mock distances/points in RouteCalculator)
+        with timings.stage('route'):
+            route = self.route_calculator.calculate(
+                data['current_location'],
+                data['pickup_location'],
+                data['dropoff_location']
+            )
+        
+        # Plan HOS based on route total distance
+        with timings.stage('hos'):
+            hos_plan = self._plan_hos(data, route)
+        return route, hos_plan
+
+
+def get_trip_planner() -> TripPlanner:
+    """
+    Process-wide planner configured from settings. Its services hold no
+    per-trip state, so requests and job threads share one instance.
+    """
+    global _trip_planner
+    if _trip_planner is None:
+        with _trip_planner_lock:
+            if _trip_planner is None:
+                _trip_planner = TripPlanner()
+    return _trip_planner
@@ -0,0 +1,29 @@
+# backend/api/services/warmup.py
+import gc
+from django.db import connections
+from django.urls import get_resolver
+from .fleet import get_fleet_simulator
+from .optional_deps import numpy
+from .trip_planner import get_trip_planner
+
+
+def warm_up() -> None:
+    """
+    Build the per-process services and sheet templates before the first
+    request. Called from the WSGI/ASGI entry points, so with gunicorn
+    --preload the work is done once in the master and shared by every
+    forked worker. The URLconf, and with it every view module, is loaded
+    too. Worker pools are left to start lazily after the fork, and any
+    database connection opened here is closed rather than inherited.
+    The warmed-up heap is then frozen out of garbage collection.
+    """
+    get_resolver().url_patterns
+    numpy()
+    planner = get_trip_planner()
+    planner.log_generator.warm_up()
+    get_fleet_simulator()
+    connections.close_all()
+    # Everything loaded so far lives as long as the process; freezing it keeps
+    # it out of garbage-collector passes, which then only scan request-time
+    # objects (and forked workers do not touch, and so copy, its pages)
+    gc.freeze()
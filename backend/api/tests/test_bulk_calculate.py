@@ -0,0 +1,79 @@
+# backend/api/tests/test_bulk_calculate.py
+import json
+from unittest import mock
+from django.db import DatabaseError
+from django.test import TestCase
+from django.urls import reverse
+from api.models import Trip
+from api.services.route_providers import RouteProviderError
+from api.services.trip_planner import get_trip_planner
+from api.views import BulkCalculateTripView
+
+TRIP = {
+    'current_location': 'Philadelphia, PA',
+    'pickup_location': 'New York, NY',
+    'dropoff_location': 'Washington, DC',
+    'current_cycle_hours': 12,
+}
+
+
+class BulkCalculateTripTests(TestCase):
+    def _post(self, body):
+        return self.client.post(reverse('calculate-trips-bulk'), body, content_type='application/json')
+
+    def _lines(self, response):
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        return [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+
+    def test_validation_errors(self):
+        self.assertEqual(self._post({'trips': []}).status_code, 400)
+        response = self._post({'trips': [dict(TRIP, current_cycle_hours=71)]})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('trips', response.json())
+        with self.settings(BULK_TRIP_MAX_TRIPS=1):
+            self.assertEqual(self._post({'trips': [TRIP, TRIP]}).status_code, 400)
+        self.assertEqual(Trip.objects.count(), 0)
+
+    def test_one_line_per_trip_in_order(self):
+        trips = [TRIP, dict(TRIP, current_cycle_hours=20), dict(TRIP, dropoff_location='Boston, MA')]
+        lines = self._lines(self._post({'trips': trips}))
+        self.assertEqual([line['index'] for line in lines], [0, 1, 2])
+        self.assertTrue(all('result' in line for line in lines))
+        self.assertEqual(lines[0]['result']['log_sheets'], [])
+        self.assertEqual(Trip.objects.count(), 3)
+        self.assertEqual(sorted(Trip.objects.values_list('current_cycle_hours', flat=True)), [12, 12, 20])
+
+    def test_failed_trip_gets_an_error_line_and_no_history(self):
+        planner = get_trip_planner()
+        plan = planner.plan
+
+        def failing(trip, **kwargs):
+            if trip['dropoff_location'] == 'Nowhere, ZZ':
+                raise RouteProviderError("Could not geocode location: Nowhere, ZZ")
+            return plan(trip, **kwargs)
+
+        with mock.patch.object(planner, 'plan', side_effect=failing):
+            lines = self._lines(self._post({'trips': [TRIP, dict(TRIP, dropoff_location='Nowhere, ZZ')]}))
+        self.assertIn('result', lines[0])
+        self.assertEqual(lines[1], {'index': 1, 'error': "Could not geocode location: Nowhere, ZZ"})
+        self.assertEqual(Trip.objects.count(), 1)
+
+    def test_history_is_saved_in_batches_and_when_the_client_disconnects(self):
+        with mock.patch.object(BulkCalculateTripView, 'HISTORY_BATCH_SIZE', 2):
+            response = self._post({'trips': [TRIP] * 5})
+            content = iter(response.streaming_content)
+            next(content)
+            next(content)
+            self.assertEqual(Trip.objects.count(), 0)
+            next(content)
+            self.assertEqual(Trip.objects.count(), 2)
+            # The server closes the response without reading the rest
+            response.close()
+        self.assertEqual(Trip.objects.count(), 3)
+
+    def test_failed_history_write_does_not_cut_the_stream(self):
+        with mock.patch.object(Trip.objects, 'bulk_create', side_effect=DatabaseError("disk full")):
+            with self.assertLogs('api.views', 'ERROR'):
+                lines = self._lines(self._post({'trips': [TRIP, TRIP]}))
+        self.assertEqual([line['index'] for line in lines], [0, 1])
+        self.assertTrue(all('result' in line for line in lines))
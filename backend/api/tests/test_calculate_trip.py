@@ -0,0 +1,127 @@
+# backend/api/tests/test_calculate_trip.py
+import threading
+from unittest import mock
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from api.models import Trip
+from api.services.response_cache import ResponseCache, get_response_cache
+from api.services.route_cache import get_route_cache
+from api.services.trip_planner import TripPlanner
+
+TRIP = {
+    'current_location': 'Philadelphia, PA',
+    'pickup_location': 'New York, NY',
+    'dropoff_location': 'Washington, DC',
+    'current_cycle_hours': 12,
+    'log_image_format': 'svg',
+}
+
+
+class CalculateTripCachingTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        get_route_cache().clear()
+        self.url = reverse('calculate-trip')
+
+    def _post(self, **headers):
+        return self.client.post(self.url, TRIP, content_type='application/json', headers=headers)
+
+    def test_repeat_post_is_served_from_the_cache_and_still_saved(self):
+        first = self._post()
+        second = self._post()
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(get_response_cache().stats()['hits'], 1)
+        trips = list(Trip.objects.order_by('id'))
+        self.assertEqual(len(trips), 2)
+        self.assertNotEqual(trips[0].pk, trips[1].pk)
+        self.assertEqual(trips[0].total_distance, trips[1].total_distance)
+        self.assertEqual(trips[0].stops, trips[1].stops)
+
+    def test_get_honours_if_none_match_and_writes_no_history(self):
+        first = self.client.get(self.url, TRIP)
+        self.assertEqual(first.status_code, 200)
+        etag = first['ETag']
+        self.assertIn('Accept', first['Vary'])
+
+        not_modified = self.client.get(self.url, TRIP, headers={'If-None-Match': etag})
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+        self.assertEqual(not_modified['ETag'], etag)
+
+        changed = self.client.get(self.url, dict(TRIP, current_cycle_hours=13), headers={'If-None-Match': etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], etag)
+        self.assertFalse(Trip.objects.exists())
+
+    def test_post_ignores_if_none_match(self):
+        etag = self._post()['ETag']
+        self.assertEqual(self._post(**{'If-None-Match': etag}).status_code, 200)
+
+    def test_media_type_is_part_of_the_etag(self):
+        as_json = self._post()
+        as_msgpack = self._post(Accept='application/msgpack')
+        self.assertEqual(as_msgpack['Content-Type'], 'application/msgpack')
+        self.assertNotEqual(as_msgpack['ETag'], as_json['ETag'])
+        self.assertEqual(get_response_cache().stats()['hits'], 0)
+
+
+class AsyncCalculateTripTests(TestCase):
+    def setUp(self):
+        get_response_cache().clear()
+        get_route_cache().clear()
+        self.url = reverse('calculate-trip-async')
+
+    async def test_round_trip_matches_the_sync_view_and_is_saved(self):
+        plan_threads = []
+        plan_hos = TripPlanner._plan_hos
+
+        def recording(planner, data, route):
+            plan_threads.append(threading.current_thread().name)
+            return plan_hos(planner, data, route)
+
+        with mock.patch.object(TripPlanner, '_plan_hos', recording):
+            response = await self.async_client.post(self.url, TRIP, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('hos', response['Server-Timing'])
+        data = response.json()
+        self.assertEqual(len(data['log_sheets']), 1)
+        self.assertTrue(data['log_sheets'][0]['log_svg'].startswith('<svg'))
+        # Planning ran on the bounded pool, not on the event loop
+        self.assertEqual(len(plan_threads), 1)
+        self.assertTrue(plan_threads[0].startswith('async-plan'))
+        self.assertEqual(await Trip.objects.acount(), 1)
+
+        expected = (await self.async_client.post(reverse('calculate-trip'), TRIP,
+                                                 content_type='application/json')).json()
+        self.assertEqual(data['stops'], expected['stops'])
+        self.assertEqual(data['total_time'], expected['total_time'])
+
+    async def test_invalid_requests(self):
+        response = await self.async_client.post(self.url, b'{', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = await self.async_client.post(self.url, dict(TRIP, current_cycle_hours=71),
+                                                content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('current_cycle_hours', response.json())
+        self.assertEqual(await Trip.objects.acount(), 0)
+
+
+class ResponseCacheTests(SimpleTestCase):
+    def test_evicts_least_recently_used_beyond_the_byte_limit(self):
+        cache = ResponseCache(max_entries=10, max_bytes=10)
+        cache.set('a', 'application/json', b'12345')
+        cache.set('b', 'application/json', b'12345')
+        cache.get('a')
+        cache.set('c', 'application/json', b'12345', history='trip')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), ('application/json', b'12345', None))
+        self.assertEqual(cache.get('c'), ('application/json', b'12345', 'trip'))
+        self.assertEqual(cache.stats()['bytes'], 10)
+
+    def test_entries_expire(self):
+        cache = ResponseCache(ttl=-1)
+        cache.set('a', 'application/json', b'{}')
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['size'], 0)
@@ -0,0 +1,92 @@
+# backend/api/tests/test_fleet.py
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from django.test import TestCase
+from api.services.fleet import FleetSimulator
+from api.services.route_cache import RouteCache
+from api.services.route_calculator import RouteCalculator
+from api.services.route_providers import MockRouteProvider
+from logs.models import DriverCycleState
+
+NOW = datetime(2024, 3, 4, 8, 0, tzinfo=timezone.utc)
+LOAD = {'pickup_location': 'Chicago, IL', 'dropoff_location': 'Indianapolis, IN'}
+# The mock provider's second leg, which is the loaded leg
+LOADED_MILES = 330
+
+
+class FleetRankingTests(TestCase):
+    def setUp(self):
+        self.provider = MockRouteProvider()
+        self.simulator = FleetSimulator(
+            route_calculator=RouteCalculator(cache=RouteCache(), provider=self.provider), executor='serial',
+        )
+
+    def _rank(self, drivers, **kwargs):
+        return self.simulator.rank(LOAD, drivers, now=NOW, **kwargs)
+
+    def _drivers(self):
+        return [
+            {'driver_id': 'far', 'current_location': 'Denver, CO', 'current_cycle_hours': 0},
+            {'driver_id': 'near', 'current_location': 'Milwaukee, WI', 'current_cycle_hours': 0},
+            {'driver_id': 'at-pickup', 'lat': 41.8781, 'lng': -87.6298, 'current_cycle_hours': 0},
+            # Also at the pickup, but out of hours: waits out a 34-hour restart
+            {'driver_id': 'out-of-hours', 'lat': 41.8781, 'lng': -87.6298, 'current_cycle_hours': 69},
+            {'driver_id': 'later', 'lat': 41.8781, 'lng': -87.6298, 'current_cycle_hours': 0,
+             'available_at': NOW + timedelta(hours=1)},
+        ]
+
+    def test_drivers_are_ranked_by_arrival(self):
+        result = self._rank(self._drivers())
+        rankings = result['rankings']
+        self.assertEqual([r['driver_id'] for r in rankings], ['at-pickup', 'later', 'near', 'out-of-hours', 'far'])
+        self.assertEqual([r['rank'] for r in rankings], [1, 2, 3, 4, 5])
+        arrivals = [r['arrival'] for r in rankings]
+        self.assertEqual(arrivals, sorted(arrivals))
+        self.assertEqual((result['loaded_miles'], result['drivers_ranked'], result['unresolved']),
+                         (LOADED_MILES, 5, []))
+
+        first = rankings[0]
+        self.assertEqual((first['deadhead_miles'], first['total_miles'], first['restarts']), (0, LOADED_MILES, 0))
+        self.assertEqual(first['arrival'], NOW + timedelta(hours=first['elapsed_hours']))
+        self.assertEqual(rankings[1]['arrival'], first['arrival'] + timedelta(hours=1))
+        self.assertEqual(rankings[3]['restarts'], 1)
+        self.assertGreater(rankings[2]['deadhead_miles'], 0)
+
+    def test_limit_keeps_the_best_drivers(self):
+        result = self._rank(self._drivers(), limit=2)
+        self.assertEqual([r['driver_id'] for r in result['rankings']], ['at-pickup', 'later'])
+        self.assertEqual(result['drivers_ranked'], 5)
+
+    def test_unresolved_drivers_are_reported_not_ranked(self):
+        drivers = self._drivers()[:2] + [{'driver_id': 'lost', 'current_location': 'Nowhere, ZZ',
+                                          'current_cycle_hours': 0}]
+        result = self._rank(drivers)
+        self.assertEqual([r['driver_id'] for r in result['rankings']], ['near', 'far'])
+        self.assertEqual(result['unresolved'], [{'driver_id': 'lost', 'error': "Unknown location: Nowhere, ZZ"}])
+
+    def test_unknown_pickup(self):
+        with self.assertRaises(ValueError):
+            self.simulator.rank(dict(LOAD, pickup_location='Nowhere, ZZ'), self._drivers(), now=NOW)
+
+    def test_cycle_hours_fall_back_to_the_ledger_as_of_availability(self):
+        DriverCycleState.log_day('ledger', NOW.date(), 600)
+        DriverCycleState.log_day('ledger-later', NOW.date(), 600)
+        drivers = [
+            {'driver_id': 'ledger', 'lat': 41.8781, 'lng': -87.6298},
+            # Eight days on, today's hours have left the 70-hour/8-day window
+            {'driver_id': 'ledger-later', 'lat': 41.8781, 'lng': -87.6298, 'available_at': NOW + timedelta(days=8)},
+            {'driver_id': 'unknown', 'lat': 41.8781, 'lng': -87.6298},
+        ]
+        rankings = {r['driver_id']: r for r in self._rank(drivers)['rankings']}
+        self.assertEqual(rankings['ledger']['current_cycle_hours'], 10)
+        self.assertEqual(rankings['ledger-later']['current_cycle_hours'], 0)
+        self.assertEqual(rankings['unknown']['current_cycle_hours'], 0)
+
+    def test_loaded_leg_is_routed_through_the_route_cache(self):
+        with mock.patch.object(self.provider, 'fetch_leg', wraps=self.provider.fetch_leg) as fetch_leg:
+            self._rank(self._drivers())
+            self._rank(self._drivers())
+        fetch_leg.assert_called_once()
+        self.assertEqual(fetch_leg.call_args.kwargs['index'], 1)
+        self.assertEqual(fetch_leg.call_args.kwargs['origin_point']['name'], 'Chicago, IL')
+        self.assertEqual(self.simulator.route_calculator.cache.stats()['hits'], 1)
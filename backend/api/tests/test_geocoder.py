@@ -0,0 +1,67 @@
+# backend/api/tests/test_geocoder.py
+from django.test import SimpleTestCase
+from api.services.geocoder import OfflineGeocoder, canonical_location
+
+ROWS = [
+    ('Columbus', 'OH', 39.9612, -82.9988),
+    ('Columbus', 'GA', 32.4610, -84.9877),
+    ('Philadelphia', 'PA', 39.9526, -75.1652),
+    ('Portland', 'OR', 45.5152, -122.6784),
+    ('Portland', 'ME', 43.6591, -70.2568),
+    ('St. Louis', 'MO', 38.6270, -90.1994),
+    ('Trenton', 'NJ', 40.2206, -74.7597),
+    ('Las Vegas', 'NV', 36.1699, -115.1398),
+]
+
+
+class CanonicalLocationTests(SimpleTestCase):
+    def test_country_suffix_is_dropped(self):
+        for location in ('Columbus, OH', 'Columbus, OH, USA', 'columbus oh usa', 'Columbus, Ohio, US',
+                         'Columbus, OH, United States of America', 'Columbus OH United States'):
+            with self.subTest(location=location):
+                self.assertEqual(canonical_location(location), 'columbus, oh')
+
+    def test_names_ending_in_a_country_code_are_kept(self):
+        self.assertEqual(canonical_location('Columbus'), 'columbus')
+        self.assertEqual(canonical_location('Columbus, GA'), 'columbus, ga')
+        self.assertEqual(canonical_location('Las Vegas, NV'), 'las vegas, nv')
+        self.assertEqual(canonical_location('Usa'), 'usa')
+
+    def test_state_names_and_saint_are_unified(self):
+        self.assertEqual(canonical_location('St. Louis, Missouri'), 'st louis, mo')
+        self.assertEqual(canonical_location('saint louis mo'), 'st louis, mo')
+        self.assertEqual(canonical_location('Trenton New Jersey'), 'trenton, nj')
+        self.assertEqual(canonical_location('  philadelphia ,PA. '), 'philadelphia, pa')
+
+
+class OfflineGeocoderTests(SimpleTestCase):
+    def setUp(self):
+        self.geocoder = OfflineGeocoder(ROWS)
+
+    def test_exact_lookup(self):
+        self.assertEqual(self.geocoder.lookup('Columbus, OH, USA'),
+                         {'name': 'Columbus, OH', 'lat': 39.9612, 'lng': -82.9988})
+        self.assertEqual(self.geocoder.lookup('St Louis, Missouri')['name'], 'St. Louis, MO')
+        self.assertIsNone(self.geocoder.lookup('Columbus'))
+        self.assertEqual(len(self.geocoder), len(ROWS))
+
+    def test_prefix_lookup(self):
+        self.assertEqual([r['name'] for r in self.geocoder.prefix('Colum')], ['Columbus, GA', 'Columbus, OH'])
+        self.assertEqual([r['name'] for r in self.geocoder.prefix('Columbus')], ['Columbus, GA', 'Columbus, OH'])
+        self.assertEqual([r['name'] for r in self.geocoder.prefix('saint lo')], ['St. Louis, MO'])
+        self.assertEqual(len(self.geocoder.prefix('Colum', limit=1)), 1)
+        self.assertEqual(self.geocoder.prefix('Denver'), [])
+
+    def test_fuzzy_lookup(self):
+        self.assertEqual(self.geocoder.fuzzy('Philadelpia, PA')[0]['name'], 'Philadelphia, PA')
+        self.assertEqual(self.geocoder.fuzzy('Colombus, OH', limit=1)[0]['name'], 'Columbus, OH')
+        self.assertEqual(self.geocoder.fuzzy('Denver, CO'), [])
+
+    def test_resolve_prefers_exact_then_unambiguous_prefix_then_fuzzy(self):
+        self.assertEqual(self.geocoder.resolve('Columbus, OH, USA')['name'], 'Columbus, OH')
+        self.assertEqual(self.geocoder.resolve('Trent')['name'], 'Trenton, NJ')
+        # Two Columbuses and two Portlands: ambiguous, not a typo
+        self.assertIsNone(self.geocoder.resolve('Columbus'))
+        self.assertIsNone(self.geocoder.resolve('Portland'))
+        self.assertEqual(self.geocoder.resolve('Philadelpia, PA')['name'], 'Philadelphia, PA')
+        self.assertIsNone(self.geocoder.resolve('Denver, CO'))
@@ -0,0 +1,46 @@
+# backend/api/tests/test_hos_batch.py
+import random
+from unittest import mock
+from django.test import SimpleTestCase
+from api.services import hos_batch
+from api.services.hos_calculator import HOSCalculator
+
+
+class PlanBatchTests(SimpleTestCase):
+    """plan_batch must match plan_trip trip for trip, with and without NumPy"""
+
+    def setUp(self):
+        self.calculator = HOSCalculator()
+        rng = random.Random(4)
+        self.distances = [rng.uniform(0, 6000) for _ in range(1500)]
+        self.cycles = [rng.choice([0, 10, 35.5, 60, 69, 70, rng.uniform(0, 70)]) for _ in range(1500)]
+        # Trips that use the cycle exactly, and whole days of driving
+        self.distances += [55 * (70 - c - 2) for c in range(69)] + [55.0 * x for x in range(100)]
+        self.cycles += list(range(69)) + [rng.uniform(0, 70) for _ in range(100)]
+
+    def _assert_matches_plan_trip(self):
+        batch = self.calculator.plan_batch(self.distances, self.cycles)
+        self.assertEqual(len(batch), len(self.distances))
+        for i, (distance, cycle) in enumerate(zip(self.distances, self.cycles)):
+            plan = self.calculator.plan_trip({'total_distance': distance}, cycle)
+            types = [stop.type for stop in plan.stops]
+            summary = batch.summary(i)
+            context = f"trip {i}: {distance} mi at {cycle} h"
+            self.assertEqual(summary['num_days'], len(plan.days), context)
+            self.assertEqual(summary['break_stops'], types.count('break'), context)
+            self.assertEqual(summary['rest_stops'], types.count('rest'), context)
+            self.assertEqual(summary['fuel_stops'], types.count('fuel'), context)
+            self.assertAlmostEqual(summary['total_time'], plan.total_time, places=6, msg=context)
+            self.assertAlmostEqual(batch.total_on_duty_not_driving[i],
+                                   sum(day.on_duty_not_driving for day in plan.days), places=9, msg=context)
+            for batch_day, day in zip(batch.days(i), plan.days):
+                self.assertAlmostEqual(batch_day.driving, day.driving, places=9, msg=context)
+                self.assertEqual(batch_day.on_duty_not_driving, day.on_duty_not_driving, context)
+                self.assertEqual(batch_day.break_taken, day.break_taken, context)
+
+    def test_matches_plan_trip(self):
+        self._assert_matches_plan_trip()
+
+    def test_matches_plan_trip_without_numpy(self):
+        with mock.patch.object(hos_batch, 'numpy', lambda: None):
+            self._assert_matches_plan_trip()
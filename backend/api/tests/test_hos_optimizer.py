@@ -0,0 +1,138 @@
+# backend/api/tests/test_hos_optimizer.py
+import itertools
+from unittest import mock
+from django.test import SimpleTestCase
+from api.services import hos_optimizer
+from api.services.hos_calculator import HOSCalculator
+from api.services.timeline import DRIVING, OFF_DUTY, ON_DUTY_NOT_DRIVING
+
+SPLIT_PAIRS = {420: 180, 180: 420, 480: 120, 120: 480}
+EPSILON = 1e-6
+
+
+def hos_violations(timeline, current_cycle_hours):
+    """
+    Independent check of a plan's duty-status timeline against the 11-hour,
+    14-hour, 8-hour break and 70-hour rules, with 7/3 and 8/2 split sleeper
+    pairs. Returns a description of each driving segment that ends over a
+    limit.
+    """
+    shift_driving = window = since_break = 0.0
+    cycle_left = (70 - current_cycle_hours) * 60
+    pending = None  # (split minutes, shift driving after it, window after it)
+    violations = []
+    for index, segment in enumerate(timeline):
+        minutes = segment.duration
+        if index == 0 and segment.status == OFF_DUTY and segment.start_minute == 0:
+            # Time before the trip starts; long enough, it is a restart
+            if minutes >= 34 * 60:
+                cycle_left = 70 * 60
+            continue
+        if segment.status == DRIVING:
+            shift_driving += minutes
+            window += minutes
+            since_break += minutes
+            cycle_left -= minutes
+            if pending is not None:
+                pending = (pending[0], pending[1] + minutes, pending[2] + minutes)
+            if (shift_driving > 660 + EPSILON or window > 840 + EPSILON or since_break > 480 + EPSILON
+                    or cycle_left < -EPSILON):
+                violations.append(f"segment {index}: driving {shift_driving:.1f}, window {window:.1f}, "
+                                  f"since break {since_break:.1f}, cycle left {cycle_left:.1f}")
+        elif segment.status == ON_DUTY_NOT_DRIVING:
+            window += minutes
+            cycle_left -= minutes
+            if minutes >= 30:
+                since_break = 0.0
+            if pending is not None:
+                pending = (pending[0], pending[1], pending[2] + minutes)
+        elif minutes >= 34 * 60:
+            shift_driving = window = since_break = 0.0
+            cycle_left = 70 * 60
+            pending = None
+        elif minutes >= 600:
+            shift_driving = window = since_break = 0.0
+            pending = None
+        else:
+            if minutes >= 30:
+                since_break = 0.0
+            if minutes in SPLIT_PAIRS:
+                if pending is not None and SPLIT_PAIRS[pending[0]] == minutes:
+                    # Pair complete: limits count from the end of the first period
+                    shift_driving, window = pending[1], pending[2]
+                else:
+                    window += minutes
+                pending = (minutes, 0.0, 0.0)
+            else:
+                window += minutes
+                if pending is not None:
+                    pending = (pending[0], pending[1], pending[2] + minutes)
+    return violations
+
+
+def elapsed_minutes(plan):
+    return plan.timeline[-1].end_minute - HOSCalculator.DEFAULT_START_MINUTE
+
+
+class PlanValidityTests(SimpleTestCase):
+    # Trips the search finishes well within its budget; ties with the greedy
+    # plan included (short trips), and trips that restart on the way
+    CASES = [(d, c) for d in (100, 442.6, 500, 700, 900, 1194.6, 1500, 2000, 2500) for c in (0, 1.5, 20, 50, 65)]
+
+    def setUp(self):
+        self.calculator = HOSCalculator()
+
+    def _assert_valid(self, plan, distance, cycle, context):
+        self.assertEqual(hos_violations(plan.timeline, cycle), [], context)
+        driving = sum(segment.duration for segment in plan.timeline if segment.status == DRIVING)
+        self.assertAlmostEqual(driving, distance / self.calculator.AVERAGE_SPEED_MPH * 60, places=6, msg=context)
+        # Day totals account for every on-duty minute, fuel stops included
+        on_duty = sum(segment.duration for segment in plan.timeline if segment.status == ON_DUTY_NOT_DRIVING)
+        self.assertAlmostEqual(sum(day.on_duty_not_driving for day in plan.days) * 60, on_duty, places=6, msg=context)
+
+    def test_greedy_plans_are_compliant(self):
+        for distance, cycle in self.CASES:
+            plan = self.calculator.plan_trip({'total_distance': distance}, cycle)
+            self._assert_valid(plan, distance, cycle, f"{distance} mi at {cycle} h")
+
+    def test_greedy_breaks_before_eight_hours_of_driving(self):
+        plan = self.calculator.plan_trip({'total_distance': 1194.6}, 1.5)
+        drives = [segment.duration for segment in plan.timeline if segment.status == DRIVING]
+        self.assertLessEqual(max(drives), 8 * 60 + EPSILON)
+
+    def test_optimized_plans_are_compliant_and_no_slower(self):
+        for distance, cycle in self.CASES:
+            context = f"{distance} mi at {cycle} h"
+            greedy = self.calculator.plan_trip({'total_distance': distance}, cycle)
+            plan = self.calculator.plan_trip_optimized({'total_distance': distance}, cycle, time_budget=5)
+            self.assertEqual(plan.planner['used'], 'optimized', context)
+            self._assert_valid(plan, distance, cycle, context)
+            self.assertLessEqual(elapsed_minutes(plan), elapsed_minutes(greedy) + EPSILON, context)
+
+    def test_split_sleeper_beats_the_greedy_plan(self):
+        plan = self.calculator.plan_trip_optimized({'total_distance': 1500}, 10, time_budget=5)
+        self.assertGreater(plan.planner['saved_hours'], 0)
+        self.assertTrue(any('split' in stop.description for stop in plan.stops))
+
+    def test_exhausted_budget_returns_the_greedy_plan(self):
+        plan = self.calculator.plan_trip_optimized({'total_distance': 3000}, 10, time_budget=0)
+        self.assertEqual((plan.planner['used'], plan.planner['reason']), ('greedy', 'budget'))
+        self.assertEqual(plan.planner['states'], 0)
+        self.assertEqual(plan.stops, self.calculator.plan_trip({'total_distance': 3000}, 10).stops)
+        self._assert_valid(plan, 3000, 10, "3000 mi at 10 h")
+
+    def test_budget_is_checked_between_successors(self):
+        # Every clock read takes a millisecond, so the budget runs out while
+        # the first state's successors are being generated
+        clock = itertools.count(0, 0.001)
+        with mock.patch.object(hos_optimizer.time, 'perf_counter', lambda: next(clock)):
+            plan = self.calculator.plan_trip_optimized({'total_distance': 3000}, 10, time_budget=0.0035)
+        self.assertEqual((plan.planner['used'], plan.planner['reason']), ('greedy', 'budget'))
+        self.assertEqual(plan.planner['states'], 1)
+
+    def test_searched_plan_is_not_built_after_the_budget(self):
+        found = (0.0, [])
+        with mock.patch.object(hos_optimizer._Search, 'run', return_value=found), \
+                mock.patch.object(hos_optimizer.time, 'perf_counter', side_effect=[0.0, 0.0, 1.0, 1.0]):
+            plan = self.calculator.plan_trip_optimized({'total_distance': 500}, 10, time_budget=0.5)
+        self.assertEqual((plan.planner['used'], plan.planner['reason']), ('greedy', 'budget'))
@@ -0,0 +1,61 @@
+# backend/api/tests/test_log_book.py
+import io
+import re
+from datetime import date
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from api.services.timeline import DRIVING, OFF_DUTY, Segment
+from api.services.trip_plan import DutyDay
+from logs.log_book_pdf import LogBookPDF
+
+TRIP = {
+    'current_location': 'Philadelphia, PA',
+    'pickup_location': 'New York, NY',
+    'dropoff_location': 'Washington, DC',
+    # Nearly out of cycle, so the trip waits out a restart and spans several days
+    'current_cycle_hours': 69,
+    'log_image_format': 'svg',
+}
+
+
+def page_count(pdf: bytes) -> int:
+    return len(re.findall(rb'/Type /Page\b', pdf))
+
+
+class LogBookPDFTests(SimpleTestCase):
+    def test_one_page_per_day(self):
+        segments = [Segment(0, 360, OFF_DUTY), Segment(360, 600, DRIVING), Segment(960, 480, OFF_DUTY)]
+        days = [(DutyDay.from_segments(segments), date(2024, 1, day)) for day in (1, 2, 3)]
+        out = io.BytesIO()
+        self.assertEqual(LogBookPDF().write(iter(days), {'name': 'Driver'}, out), 3)
+        self.assertEqual(page_count(out.getvalue()), 3)
+
+    def test_stream_is_chunked(self):
+        day = DutyDay.from_segments([Segment(0, 1440, OFF_DUTY)])
+        book = LogBookPDF()
+        book.CHUNK_SIZE = 512
+        chunks = list(book.stream([(day, date(2024, 1, 1))]))
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= 512 for chunk in chunks))
+        self.assertTrue(b''.join(chunks).startswith(b'%PDF'))
+
+
+class LogBookPDFViewTests(TestCase):
+    def test_pdf_has_a_page_per_log_sheet(self):
+        response = self.client.post(reverse('log-book'), TRIP, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="log-book.pdf"')
+        pdf = b''.join(response.streaming_content)
+        self.assertTrue(pdf.startswith(b'%PDF'))
+
+        trip = self.client.post(reverse('calculate-trip'), TRIP, content_type='application/json').json()
+        sheets = trip['log_sheets']
+        self.assertGreater(len(sheets), 1)
+        self.assertEqual(page_count(pdf), len(sheets))
+
+    def test_invalid_request(self):
+        response = self.client.post(reverse('log-book'), dict(TRIP, current_cycle_hours=71),
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('current_cycle_hours', response.json())
@@ -0,0 +1,72 @@
+# backend/api/tests/test_poi_index.py
+from django.test import SimpleTestCase
+from api.services.poi_index import FUEL, REST_AREA, TRUCK_STOP, Corridor, POIIndex
+from api.services.route_geometry import RouteGeometry
+
+
+def _facility(name, facility_type):
+    return {'name': name, 'type': facility_type, 'lat': 0.0, 'lng': 0.0}
+
+
+class CorridorTests(SimpleTestCase):
+    def setUp(self):
+        # Deliberately unsorted; the corridor orders entries by mile
+        self.truck_stop = _facility('B', TRUCK_STOP)
+        self.corridor = Corridor([
+            (300.0, 2.0, _facility('C', REST_AREA)),
+            (100.0, 0.5, _facility('A', FUEL)),
+            (200.0, 1.25, self.truck_stop),
+        ])
+
+    def test_last_before_is_the_furthest_facility_up_to_the_mile(self):
+        self.assertEqual(self.corridor.last_before(250)['name'], 'B')
+        self.assertEqual(self.corridor.last_before(200)['name'], 'B')  # inclusive upper bound
+        self.assertEqual(self.corridor.last_before(1000)['name'], 'C')
+        self.assertIsNone(self.corridor.last_before(99.9))
+
+    def test_after_is_exclusive(self):
+        self.assertEqual(self.corridor.last_before(250, after=150)['name'], 'B')
+        self.assertIsNone(self.corridor.last_before(250, after=200))
+
+    def test_types_skip_back_to_a_matching_facility(self):
+        self.assertEqual(self.corridor.last_before(350, types=(FUEL,))['name'], 'A')
+        self.assertIsNone(self.corridor.last_before(350, after=100, types=(FUEL,)))
+
+    def test_result_carries_position_without_touching_the_facility(self):
+        found = self.corridor.last_before(250)
+        self.assertEqual((found['mile'], found['offset_miles']), (200.0, 1.2))
+        self.assertNotIn('mile', self.truck_stop)
+        self.assertEqual(len(Corridor([])), 0)
+        self.assertIsNone(Corridor([]).last_before(10))
+
+
+class POIIndexCorridorTests(SimpleTestCase):
+    def setUp(self):
+        self.index = POIIndex([
+            ('On route', TRUCK_STOP, 40.0, -99.5),
+            ('Just north', FUEL, 40.1, -99.8),
+            ('Far north', FUEL, 41.0, -99.5),
+            ('Past the end', REST_AREA, 40.0, -98.8),
+        ])
+        self.geometry = RouteGeometry([(40.0, -100.0), (40.0, -99.0)])
+
+    def test_corridor_keeps_facilities_within_the_width(self):
+        corridor = self.index.corridor(self.geometry, width_miles=10)
+        self.assertEqual(len(corridor), 2)
+        on_route = corridor.last_before(self.geometry.length)
+        self.assertEqual(on_route['name'], 'On route')
+        self.assertAlmostEqual(on_route['mile'], self.geometry.length / 2, delta=0.5)
+        self.assertEqual(on_route['offset_miles'], 0.0)
+        north = corridor.last_before(on_route['mile'] - 1)
+        self.assertEqual(north['name'], 'Just north')
+        self.assertAlmostEqual(north['offset_miles'], 6.9, delta=0.2)
+
+    def test_road_miles_rescale_positions(self):
+        road_miles = self.geometry.length * 1.5
+        corridor = self.index.corridor(self.geometry, width_miles=10, road_miles=road_miles)
+        found = corridor.last_before(road_miles)
+        self.assertAlmostEqual(found['mile'], road_miles / 2, delta=0.5)
+
+    def test_near_is_sorted_by_distance(self):
+        names = [facility['name'] for facility in self.index.near(40.0, -99.5, 20)]
+        self.assertEqual(names, ['On route', 'Just north'])
@@ -0,0 +1,25 @@
+# backend/api/tests/test_pools.py
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from django.test import SimpleTestCase
+from api.services.pools import EXECUTOR_PROCESS, EXECUTOR_THREAD, get_pool
+
+
+class GetPoolTests(SimpleTestCase):
+    def test_pools_are_shared_per_kind_and_size(self):
+        pool = get_pool(EXECUTOR_THREAD, 2)
+        self.assertIsInstance(pool, ThreadPoolExecutor)
+        self.assertIs(get_pool(EXECUTOR_THREAD, 2), pool)
+        self.assertIsNot(get_pool(EXECUTOR_THREAD, 3), pool)
+
+    def test_named_pools_are_separate(self):
+        pool = get_pool(EXECUTOR_THREAD, 2, name='test-named')
+        self.assertIsNot(pool, get_pool(EXECUTOR_THREAD, 2))
+        self.assertIs(get_pool(EXECUTOR_THREAD, 2, name='test-named'), pool)
+        self.assertEqual(pool.submit(lambda: threading.current_thread().name).result()[:10], 'test-named')
+
+    def test_process_pools_do_not_fork_the_web_worker(self):
+        # Workers only start on the first submit, so nothing is launched here
+        pool = get_pool(EXECUTOR_PROCESS, 2)
+        self.assertIsInstance(pool, ProcessPoolExecutor)
+        self.assertIn(pool._mp_context.get_start_method(), ('forkserver', 'spawn'))
@@ -0,0 +1,50 @@
+# backend/api/tests/test_renderers.py
+import base64
+import json
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest import mock
+import msgpack
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+from api import renderers
+from api.renderers import MessagePackRenderer, ORJSONRenderer
+
+PAYLOAD = {
+    'total_distance': 225.5,
+    'trip_date': date(2024, 1, 2),
+    'created_at': datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+    'cost': Decimal('1.50'),
+    'stops': [{'type': 'fuel', 'duration': 30, 'description': 'Fuel – I-95'}],
+}
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def test_matches_the_stock_renderer(self):
+        self.assertEqual(
+            json.loads(ORJSONRenderer().render(PAYLOAD)),
+            json.loads(JSONRenderer().render(PAYLOAD)),
+        )
+
+    def test_bytes_are_base64(self):
+        body = json.loads(ORJSONRenderer().render({'log_image': b'\x89PNG'}))
+        self.assertEqual(base64.b64decode(body['log_image']), b'\x89PNG')
+
+    def test_indent_parameter(self):
+        body = ORJSONRenderer().render({'a': [1]}, 'application/json; indent=4')
+        self.assertEqual(body, b'{\n  "a": [\n    1\n  ]\n}')
+
+    def test_falls_back_without_orjson(self):
+        with mock.patch.object(renderers, 'orjson', None):
+            body = ORJSONRenderer().render(PAYLOAD)
+        self.assertEqual(body, JSONRenderer().render(PAYLOAD))
+
+
+class MessagePackRendererTests(SimpleTestCase):
+    def test_bytes_stay_binary(self):
+        body = msgpack.unpackb(MessagePackRenderer().render({'log_image': b'\x89PNG'}), raw=False)
+        self.assertEqual(body['log_image'], b'\x89PNG')
+
+    def test_other_types_follow_json(self):
+        body = msgpack.unpackb(MessagePackRenderer().render(PAYLOAD), raw=False)
+        self.assertEqual(body, json.loads(JSONRenderer().render(PAYLOAD)))
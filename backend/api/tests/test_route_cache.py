@@ -0,0 +1,72 @@
+# backend/api/tests/test_route_cache.py
+from unittest import mock
+from django.core.cache import caches
+from django.test import SimpleTestCase
+from api.services.route_cache import RouteCache, normalize_location
+
+
+class NormalizeLocationTests(SimpleTestCase):
+    def test_case_spacing_and_punctuation_are_ignored(self):
+        self.assertEqual(normalize_location("  New   York,NY. "), 'new york, ny')
+        cache = RouteCache()
+        self.assertEqual(cache.make_key('New York, NY', 'a', 'b'), cache.make_key(' new york ,ny', 'A', 'B'))
+        self.assertNotEqual(cache.make_key('a', 'b', 'c'), cache.make_key('b', 'a', 'c'))
+
+
+class RouteCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('api.services.route_cache.time.monotonic', side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.shared = caches['default']
+        self.shared.clear()
+        self.addCleanup(self.shared.clear)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = RouteCache(max_entries=2)
+        cache.set('a', {'route': 'a'})
+        cache.set('b', {'route': 'b'})
+        self.assertEqual(cache.get('a'), {'route': 'a'})  # b is now the oldest
+        cache.set('c', {'route': 'c'})
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), {'route': 'a'})
+        self.assertEqual(cache.get('c'), {'route': 'c'})
+        self.assertEqual(cache.stats()['size'], 2)
+
+    def test_entries_expire_after_the_ttl(self):
+        cache = RouteCache(ttl=60)
+        cache.set('a', {'route': 'a'})
+        self.now += 59
+        self.assertIsNotNone(cache.get('a'))
+        self.now += 1
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_hit_and_miss_counters(self):
+        cache = RouteCache()
+        self.assertIsNone(cache.get('a'))
+        cache.set('a', {'route': 'a'})
+        cache.get('a')
+        cache.get('a')
+        self.assertEqual(cache.stats(), {'hits': 2, 'shared_hits': 0, 'misses': 1, 'size': 1, 'max_entries': 1024})
+        cache.clear()
+        self.assertEqual(cache.stats(), {'hits': 0, 'shared_hits': 0, 'misses': 0, 'size': 0, 'max_entries': 1024})
+
+    def test_shared_alias_serves_routes_set_by_another_worker(self):
+        writer = RouteCache(shared_alias='default')
+        reader = RouteCache(shared_alias='default')
+        writer.set('a', {'route': 'a'})
+        self.assertEqual(reader.get('a'), {'route': 'a'})
+        # The shared hit is copied into the reader's own tier
+        self.assertEqual(reader.get('a'), {'route': 'a'})
+        stats = reader.stats()
+        self.assertEqual((stats['shared_hits'], stats['hits'], stats['misses'], stats['size']), (1, 1, 0, 1))
+
+    def test_shared_tier_outlives_local_eviction(self):
+        cache = RouteCache(max_entries=1, shared_alias='default')
+        cache.set('a', {'route': 'a'})
+        cache.set('b', {'route': 'b'})
+        self.assertEqual(cache.get('a'), {'route': 'a'})
+        self.assertEqual(cache.stats()['shared_hits'], 1)
+        self.assertIsNone(RouteCache(shared_alias='default').get('missing'))
@@ -0,0 +1,81 @@
+# backend/api/tests/test_route_geometry.py
+import math
+from unittest import mock
+import polyline
+from django.test import SimpleTestCase
+from api.services import route_geometry
+from api.services.route_geometry import EARTH_RADIUS_MILES, RouteGeometry, distances_to
+
+# One degree of longitude along the equator
+DEGREE = EARTH_RADIUS_MILES * math.pi / 180
+
+
+class RouteGeometryTests(SimpleTestCase):
+    def setUp(self):
+        # The repeated vertex is a zero-length segment
+        self.geometry = RouteGeometry([(0.0, 0.0), (0.0, 1.0), (0.0, 1.0), (0.0, 3.0)])
+
+    def test_cumulative_miles(self):
+        self.assertEqual(len(self.geometry), 4)
+        for actual, expected in zip(self.geometry.cumulative, (0, DEGREE, DEGREE, 3 * DEGREE)):
+            self.assertAlmostEqual(actual, expected, places=6)
+        self.assertAlmostEqual(self.geometry.length, 3 * DEGREE, places=6)
+
+    def test_locate_interpolates_within_a_segment(self):
+        self.assertAlmostEqual(self.geometry.locate(DEGREE / 4)['lng'], 0.25)
+        self.assertAlmostEqual(self.geometry.locate(2 * DEGREE)['lng'], 2.0)
+        self.assertAlmostEqual(self.geometry.locate(2.5 * DEGREE)['lat'], 0.0)
+
+    def test_locate_at_a_zero_length_segment(self):
+        self.assertAlmostEqual(self.geometry.locate(DEGREE)['lng'], 1.0)
+        self.assertAlmostEqual(self.geometry.locate(DEGREE + 1e-9)['lng'], 1.0)
+        still = RouteGeometry([(0.0, 1.0), (0.0, 1.0)])
+        self.assertEqual(still.length, 0.0)
+        self.assertEqual(still.locate(5), {'lat': 0.0, 'lng': 1.0})
+
+    def test_locate_clamps_to_the_ends(self):
+        self.assertEqual(self.geometry.locate(0), {'lat': 0.0, 'lng': 0.0})
+        self.assertEqual(self.geometry.locate(-10), {'lat': 0.0, 'lng': 0.0})
+        self.assertEqual(self.geometry.locate(self.geometry.length), {'lat': 0.0, 'lng': 3.0})
+        self.assertEqual(self.geometry.locate(10_000), {'lat': 0.0, 'lng': 3.0})
+
+    def test_degenerate_geometries(self):
+        self.assertIsNone(RouteGeometry([]).locate(1))
+        self.assertEqual(RouteGeometry([]).length, 0.0)
+        self.assertEqual(RouteGeometry([(1.0, 2.0)]).locate(1), {'lat': 1.0, 'lng': 2.0})
+
+    def test_locate_mile_scales_road_miles_onto_the_polyline(self):
+        # Road distance is twice the polyline length
+        road = 2 * self.geometry.length
+        self.assertAlmostEqual(self.geometry.locate_mile(road / 6, road)['lng'], 0.5)
+        self.assertEqual(self.geometry.locate_mile(road * 2, road), {'lat': 0.0, 'lng': 3.0})
+        self.assertEqual(self.geometry.locate_mile(10, 0), {'lat': 0.0, 'lng': 0.0})
+
+    def test_from_route_prefers_the_encoded_geometry(self):
+        points = [(40.0, -100.0), (40.5, -99.5)]
+        encoded = RouteGeometry.from_route({'geometry': polyline.encode(points), 'points': []})
+        plain = RouteGeometry.from_route({'points': [{'lat': lat, 'lng': lng} for lat, lng in points]})
+        self.assertEqual(len(encoded), 2)
+        self.assertAlmostEqual(encoded.length, plain.length, places=3)
+
+
+class VectorizedDistanceTests(SimpleTestCase):
+    LAT = [40.0, 40.2, 41.0, 39.5, 39.5, 42.1]
+    LNG = [-100.0, -99.1, -98.7, -97.0, -97.0, -95.3]
+
+    def _both(self, function):
+        vectorized = function()
+        with mock.patch.object(route_geometry, 'numpy', lambda: None):
+            scalar = function()
+        self.assertEqual(len(vectorized), len(scalar))
+        for a, b in zip(vectorized, scalar):
+            self.assertAlmostEqual(a, b, places=9)
+        return vectorized
+
+    def test_cumulative_miles_match_without_numpy(self):
+        self._both(lambda: RouteGeometry(list(zip(self.LAT, self.LNG))).cumulative)
+
+    def test_distances_to_match_without_numpy(self):
+        miles = self._both(lambda: distances_to(self.LAT, self.LNG, 40.0, -100.0))
+        self.assertEqual(miles[0], 0.0)
+        self.assertEqual(len(distances_to([], [], 0.0, 0.0)), 0)
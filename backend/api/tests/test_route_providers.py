@@ -0,0 +1,125 @@
+# backend/api/tests/test_route_providers.py
+import io
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from api.services.route_cache import RouteCache
+from api.services.route_calculator import RouteCalculator
+from api.services.route_providers import HTTPRouteProvider, RouteProviderError, get_session
+from api.services.route_stub import start_stub_server, stub_base_url
+
+
+def _serve(handler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class _ScriptedHandler(BaseHTTPRequestHandler):
+    """Answers each request with the next (status, body) of `responses`, repeating the last"""
+
+    responses = []
+    requests = 0
+
+    def do_GET(self):
+        cls = type(self)
+        status, body = cls.responses[min(cls.requests, len(cls.responses) - 1)]
+        cls.requests += 1
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _scripted(*responses):
+    return type('Handler', (_ScriptedHandler,), {'responses': list(responses), 'requests': 0})
+
+
+class StubServerTests(SimpleTestCase):
+    def setUp(self):
+        self.server, base_url = start_stub_server()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.provider = HTTPRouteProvider(base_url)
+
+    def test_legs_are_deterministic(self):
+        leg = self.provider.fetch_leg('Chicago, IL', 'Denver, CO', origin_point={'lat': 41.9, 'lng': -87.6},
+                                      destination_point={'lat': 39.7, 'lng': -105.0})
+        self.assertEqual((leg['from'], leg['to']), ('Chicago, IL', 'Denver, CO'))
+        self.assertTrue(20 <= leg['distance'] < 1520)
+        self.assertAlmostEqual(leg['duration'], leg['distance'] / 55, places=3)
+        self.assertEqual(len(leg['points']), 2)
+        self.assertEqual(self.provider.fetch_leg('chicago, il', 'DENVER, CO'), dict(leg, **{
+            'from': 'chicago, il', 'to': 'DENVER, CO'}))
+
+    def test_unknown_path_is_a_provider_error(self):
+        provider = HTTPRouteProvider(stub_base_url(self.server) + '/missing')
+        with self.assertRaises(RouteProviderError):
+            provider.fetch_leg('A', 'B')
+
+    def test_management_command_serves_until_interrupted(self):
+        out = io.StringIO()
+        with mock.patch('http.server.ThreadingHTTPServer.serve_forever', side_effect=KeyboardInterrupt):
+            call_command('run_route_stub', port=0, latency=0.5, stdout=out)
+        self.assertIn('ROUTE_PROVIDER=http ROUTE_PROVIDER_URL=http://127.0.0.1:', out.getvalue())
+
+
+class HTTPRouteProviderTests(SimpleTestCase):
+    LEG = {'distance': 100, 'duration': 2, 'points': []}
+
+    def _provider(self, handler, retries=2):
+        server = _serve(handler)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return HTTPRouteProvider(stub_base_url(server), timeout=2, session=get_session(retries=retries, backoff=0))
+
+    def test_server_errors_are_retried(self):
+        handler = _scripted((503, {}), (502, {}), (200, self.LEG))
+        leg = self._provider(handler).fetch_leg('A', 'B')
+        self.assertEqual((leg['distance'], leg['duration']), (100, 2))
+        self.assertEqual(handler.requests, 3)
+
+    def test_retries_are_bounded(self):
+        handler = _scripted((503, {}))
+        with self.assertRaises(RouteProviderError):
+            self._provider(handler, retries=1).fetch_leg('A', 'B')
+        self.assertEqual(handler.requests, 2)
+
+    def test_malformed_responses_are_provider_errors(self):
+        for body in ({'distance': 100}, ['not', 'an', 'object'], None):
+            with self.subTest(body=body), self.assertRaises(RouteProviderError):
+                self._provider(_scripted((200, body))).fetch_leg('A', 'B')
+
+
+class ConcurrentLegTests(SimpleTestCase):
+    LATENCY = 0.3
+
+    def setUp(self):
+        server, base_url = start_stub_server(latency=self.LATENCY)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.calculator = RouteCalculator(cache=RouteCache(), provider=HTTPRouteProvider(base_url))
+
+    def _assert_concurrent(self, calculate):
+        started = time.perf_counter()
+        route = calculate('Philadelphia, PA', 'New York, NY', 'Washington, DC')
+        elapsed = time.perf_counter() - started
+        self.assertEqual(len(route['segments']), 2)
+        # Two legs fetched one after the other would take at least twice the latency
+        self.assertLess(elapsed, self.LATENCY * 1.8)
+
+    def test_legs_are_fetched_concurrently(self):
+        self._assert_concurrent(self.calculator.calculate)
+
+    def test_async_legs_are_fetched_concurrently(self):
+        self._assert_concurrent(async_to_sync(self.calculator.acalculate))
@@ -0,0 +1,81 @@
+# backend/api/tests/test_sheet_store.py
+import os
+import tempfile
+import time
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from api.services.sheet_store import SheetStore
+
+# Sheets saved through the default storage in view tests land here
+_MEDIA = tempfile.TemporaryDirectory()
+
+
+class SheetStoreTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.storage = FileSystemStorage(location=self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _age(self, sheet_id, seconds):
+        path = self.storage.path(f"{SheetStore.PREFIX}/{sheet_id}.png")
+        then = time.time() - seconds
+        os.utime(path, (then, then))
+
+    def test_save_is_content_addressed(self):
+        store = SheetStore(self.storage)
+        first = store.save(b'png-bytes')
+        self.assertEqual(store.save(b'png-bytes'), first)
+        self.assertEqual(store.load(first), b'png-bytes')
+        self.assertTrue(store.save(b'<svg/>', 'svg').endswith('.svg'))
+
+    def test_purge_removes_expired_sheets(self):
+        store = SheetStore(self.storage, ttl=60, max_bytes=10 ** 6)
+        old, fresh = store.save(b'old'), store.save(b'fresh')
+        self._age(old, 120)
+        self.assertEqual(store.purge(), 1)
+        self.assertIsNone(store.load(old))
+        self.assertEqual(store.load(fresh), b'fresh')
+
+    def test_saving_again_refreshes_age(self):
+        store = SheetStore(self.storage, ttl=60, max_bytes=10 ** 6)
+        sheet = store.save(b'reused')
+        self._age(sheet, 120)
+        store.save(b'reused')
+        self.assertEqual(store.purge(), 0)
+
+    def test_purge_enforces_size_cap_oldest_first(self):
+        store = SheetStore(self.storage, ttl=3600, max_bytes=10)
+        first, second = store.save(b'a' * 6), store.save(b'b' * 6)
+        self._age(first, 30)
+        self.assertEqual(store.purge(), 1)
+        self.assertIsNone(store.load(first))
+        self.assertEqual(store.load(second), b'b' * 6)
+
+
+@override_settings(MEDIA_ROOT=_MEDIA.name)
+class LogSheetImageViewTests(SimpleTestCase):
+    def setUp(self):
+        self.sheet = SheetStore().save(b'png-bytes')
+        self.url = reverse('log-sheet-image', kwargs={'digest': self.sheet, 'extension': 'png'})
+
+    def test_serves_sheet_cacheable_for_the_store_ttl(self):
+        with self.settings(SHEET_STORE=dict(settings.SHEET_STORE, TTL=600)):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'png-bytes')
+        self.assertEqual(response['Cache-Control'], 'public, max-age=600, immutable')
+        self.assertEqual(response['ETag'], f'"{self.sheet}"')
+
+    def test_if_none_match(self):
+        for header in (f'"{self.sheet}"', '*'):
+            self.assertEqual(self.client.get(self.url, headers={'If-None-Match': header}).status_code, 304)
+
+    def test_unknown_sheet_is_404_even_for_a_wildcard(self):
+        url = reverse('log-sheet-image', kwargs={'digest': '0' * 64, 'extension': 'png'})
+        self.assertEqual(self.client.get(url).status_code, 404)
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': '*'}).status_code, 404)
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': f'"{"0" * 64}"'}).status_code, 404)
@@ -0,0 +1,64 @@
+# backend/api/tests/test_timeline.py
+from django.test import SimpleTestCase
+from api.services.timeline import (
+    DRIVING, MINUTES_PER_DAY, OFF_DUTY, ON_DUTY_NOT_DRIVING, Segment, TimelineBuilder, split_by_day,
+)
+
+
+def _timeline(*pieces):
+    builder = TimelineBuilder()
+    for status, minutes in pieces:
+        builder.add(status, minutes)
+    return builder.segments
+
+
+class TimelineBuilderTests(SimpleTestCase):
+    def test_runs_of_one_status_are_merged(self):
+        builder = TimelineBuilder(start_minute=360)
+        builder.add(DRIVING, 60)
+        builder.add(DRIVING, 30)
+        builder.add(ON_DUTY_NOT_DRIVING, 0)
+        builder.add(ON_DUTY_NOT_DRIVING, 15)
+        self.assertEqual(builder.segments, [
+            Segment(0, 360, OFF_DUTY), Segment(360, 90, DRIVING), Segment(450, 15, ON_DUTY_NOT_DRIVING),
+        ])
+        self.assertEqual(builder.clock, 465)
+
+
+class SplitByDayTests(SimpleTestCase):
+    def test_segment_crossing_midnight_is_split(self):
+        timeline = _timeline((OFF_DUTY, 1380), (DRIVING, 120), (ON_DUTY_NOT_DRIVING, 30))
+        days = split_by_day(timeline, pad_last_day=False)
+        self.assertEqual(days, [
+            [Segment(0, 1380, OFF_DUTY), Segment(1380, 60, DRIVING)],
+            [Segment(0, 60, DRIVING), Segment(60, 30, ON_DUTY_NOT_DRIVING)],
+        ])
+
+    def test_segment_longer_than_a_day_covers_every_day(self):
+        # A 34-hour restart starting at 20:00
+        days = split_by_day(_timeline((DRIVING, 1200), (OFF_DUTY, 34 * 60), (DRIVING, 60)), pad_last_day=False)
+        self.assertEqual(len(days), 3)
+        self.assertEqual(days[1], [Segment(0, MINUTES_PER_DAY, OFF_DUTY)])
+        self.assertEqual(days[2], [Segment(0, 360, OFF_DUTY), Segment(360, 60, DRIVING)])
+
+    def test_every_day_but_the_last_is_complete(self):
+        days = split_by_day(_timeline((OFF_DUTY, 480), (DRIVING, 3000)), pad_last_day=False)
+        for day in days[:-1]:
+            self.assertEqual(sum(segment.duration for segment in day), MINUTES_PER_DAY)
+            self.assertEqual(day[-1].end_minute, MINUTES_PER_DAY)
+
+    def test_pad_last_day_fills_to_midnight(self):
+        timeline = _timeline((OFF_DUTY, 360), (DRIVING, 1200))
+        padded = split_by_day(timeline)
+        self.assertEqual(padded[-1], [Segment(0, 120, DRIVING), Segment(120, 1320, OFF_DUTY)])
+        self.assertEqual(split_by_day(timeline, pad_last_day=False)[-1], [Segment(0, 120, DRIVING)])
+        # The input timeline is left untouched
+        self.assertEqual(timeline[-1], Segment(360, 1200, DRIVING))
+
+    def test_timeline_ending_at_midnight_adds_no_empty_day(self):
+        days = split_by_day(_timeline((OFF_DUTY, 600), (DRIVING, 840)))
+        self.assertEqual(days, [[Segment(0, 600, OFF_DUTY), Segment(600, 840, DRIVING)]])
+
+    def test_empty_timeline(self):
+        self.assertEqual(split_by_day([], pad_last_day=False), [[]])
+        self.assertEqual(split_by_day([]), [[Segment(0, MINUTES_PER_DAY, OFF_DUTY)]])
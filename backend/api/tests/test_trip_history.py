@@ -0,0 +1,71 @@
+# backend/api/tests/test_trip_history.py
+from datetime import date, timedelta
+from django.test import TestCase
+from django.urls import reverse
+from api.models import Trip
+from api.services.trip_history import decode_cursor, encode_cursor, query_history
+
+
+def _trip(day, driver_id=''):
+    return Trip(
+        driver_id=driver_id, trip_date=day, current_location='A', pickup_location='B',
+        dropoff_location='C', current_cycle_hours=0, total_distance=100, total_time=4, num_days=1,
+    )
+
+
+class TripHistoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        start = date(2024, 1, 1)
+        # Several trips per day, so pages split inside a date
+        Trip.objects.bulk_create(
+            [_trip(start + timedelta(days=i // 3), driver_id='d1' if i % 2 else 'd2') for i in range(20)]
+        )
+
+    def _all_pages(self, **filters):
+        rows, cursor, pages = [], None, 0
+        while True:
+            page, cursor = query_history(cursor=cursor, limit=4, **filters)
+            rows += page
+            pages += 1
+            if cursor is None:
+                return rows, pages
+
+    def test_pages_cover_every_trip_once_newest_first(self):
+        rows, pages = self._all_pages()
+        self.assertEqual(pages, 5)
+        expected = list(Trip.objects.order_by('-trip_date', '-id').values_list('id', flat=True))
+        self.assertEqual([row['id'] for row in rows], expected)
+
+    def test_filters_apply_across_pages(self):
+        rows, _ = self._all_pages(driver_id='d1', start_date=date(2024, 1, 2), end_date=date(2024, 1, 5))
+        expected = Trip.objects.filter(driver_id='d1', trip_date__range=(date(2024, 1, 2), date(2024, 1, 5)))
+        self.assertEqual({row['id'] for row in rows}, set(expected.values_list('id', flat=True)))
+        self.assertTrue(all(row['driver_id'] == 'd1' for row in rows))
+
+    def test_rows_written_after_a_page_do_not_shift_later_pages(self):
+        first, cursor = query_history(limit=4)
+        _trip(date(2030, 1, 1)).save()
+        second, _ = query_history(cursor=cursor, limit=4)
+        self.assertFalse({row['id'] for row in first} & {row['id'] for row in second})
+        self.assertLess(second[0]['trip_date'], date(2030, 1, 1))
+
+    def test_fields_projection(self):
+        rows, _ = query_history(limit=1, fields=['total_time'])
+        self.assertEqual(set(rows[0]), {'id', 'trip_date', 'total_time'})
+
+    def test_cursor_round_trip_and_rejection(self):
+        self.assertEqual(decode_cursor(encode_cursor(date(2024, 1, 2), 7)), (date(2024, 1, 2), 7))
+        with self.assertRaises(ValueError):
+            decode_cursor('not-a-cursor')
+        response = self.client.get(reverse('trip-history'), {'cursor': 'bogus'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_endpoint_returns_next_cursor(self):
+        response = self.client.get(reverse('trip-history'), {'limit': 15})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(len(body['trips']), 15)
+        rest = self.client.get(reverse('trip-history'), {'limit': 15, 'cursor': body['next_cursor']}).json()
+        self.assertEqual(len(rest['trips']), 5)
+        self.assertIsNone(rest['next_cursor'])
@@ -0,0 +1,138 @@
+# backend/api/tests/test_trip_jobs.py
+import uuid
+from datetime import date, timedelta
+from unittest import mock
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from api.models import Trip, TripJob
+from api.serializers import TripRequestSerializer
+from api.services import trip_jobs
+from api.services.trip_jobs import QueueFull, TripJobQueue, job_key
+
+TRIP = {
+    'current_location': 'Philadelphia, PA',
+    'pickup_location': 'New York, NY',
+    'dropoff_location': 'Washington, DC',
+    'current_cycle_hours': 12,
+    'log_image_format': 'svg',
+}
+
+
+def _validated(**overrides):
+    serializer = TripRequestSerializer(data=dict(TRIP, **overrides))
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+class TripJobQueueTests(TestCase):
+    def setUp(self):
+        # Jobs stay queued until a test runs them inline with _run
+        self.queue = TripJobQueue(max_workers=1, max_pending=2, result_ttl=60, timeout=300)
+        patcher = mock.patch.object(self.queue._pool, 'submit')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.queue._pool.shutdown)
+
+    def _run(self, job):
+        with mock.patch.object(trip_jobs.connections, 'close_all'):
+            self.queue._run(str(job.pk))
+        return TripJob.objects.get(pk=job.pk)
+
+    def test_identical_requests_share_an_in_flight_job(self):
+        job, created = self.queue.submit(_validated())
+        again, created_again = self.queue.submit(_validated())
+        self.assertEqual((created, created_again), (True, False))
+        self.assertEqual(again.pk, job.pk)
+        self.assertEqual(self.queue.pending(), 1)
+
+        other, created_other = self.queue.submit(_validated(current_cycle_hours=13))
+        self.assertTrue(created_other)
+        self.assertNotEqual(other.pk, job.pk)
+
+    def test_plan_date_is_part_of_the_key(self):
+        data = _validated()
+        self.assertNotEqual(job_key(data, date(2024, 1, 1)), job_key(data, date(2024, 1, 2)))
+        job, _ = self.queue.submit(data, plan_date=date(2024, 1, 1))
+        other, created = self.queue.submit(data, plan_date=date(2024, 1, 2))
+        self.assertTrue(created)
+        self.assertNotEqual(other.pk, job.pk)
+
+    def test_one_in_flight_row_per_key(self):
+        job, _ = self.queue.submit(_validated())
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            TripJob.objects.create(request_key=job.request_key, request=job.request)
+
+    def test_queue_full(self):
+        self.queue.submit(_validated(current_cycle_hours=1))
+        self.queue.submit(_validated(current_cycle_hours=2))
+        with self.assertRaises(QueueFull):
+            self.queue.submit(_validated(current_cycle_hours=3))
+        # A duplicate of an in-flight job is not a new pending job
+        self.assertFalse(self.queue.submit(_validated(current_cycle_hours=1))[1])
+
+    def test_finished_job_expires_and_no_longer_deduplicates(self):
+        job, _ = self.queue.submit(_validated())
+        job = self._run(job)
+        self.assertEqual(job.status, TripJob.SUCCEEDED)
+        self.assertEqual(self.queue.pending(), 0)
+        self.assertEqual(len(job.result['log_sheets']), 1)
+        self.assertEqual(job.expires_at, job.finished_at + timedelta(seconds=60))
+        self.assertEqual(Trip.objects.count(), 1)
+
+        again, created = self.queue.submit(_validated())
+        self.assertTrue(created)
+        self.assertNotEqual(again.pk, job.pk)
+
+    def test_expired_jobs_are_hidden_and_purged(self):
+        job = self._run(self.queue.submit(_validated())[0])
+        TripJob.objects.filter(pk=job.pk).update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertIsNone(self.queue.get(job.pk))
+        self.assertEqual(self.queue.purge_expired(), 1)
+        self.assertFalse(TripJob.objects.filter(pk=job.pk).exists())
+
+    def test_stale_in_flight_job_is_failed_and_replaced(self):
+        job, _ = self.queue.submit(_validated())
+        TripJob.objects.filter(pk=job.pk).update(created_at=timezone.now() - timedelta(seconds=301))
+        stale = self.queue.get(job.pk)
+        self.assertEqual(stale.status, TripJob.FAILED)
+        self.assertEqual(stale.error, "Job did not finish in time")
+        self.assertIsNotNone(stale.expires_at)
+        # A worker that finishes late cannot overwrite the failure
+        self.assertEqual(self._run(job).status, TripJob.FAILED)
+
+        replacement, created = self.queue.submit(_validated())
+        self.assertTrue(created)
+        self.assertNotEqual(replacement.pk, job.pk)
+
+    def test_wait_returns_unfinished_job_after_timeout(self):
+        job, _ = self.queue.submit(_validated())
+        self.assertEqual(self.queue.get(job.pk, wait=0.01).status, TripJob.QUEUED)
+
+
+class TripJobEndpointTests(TestCase):
+    def setUp(self):
+        self.queue = TripJobQueue(max_workers=1)
+        self.addCleanup(self.queue._pool.shutdown)
+        for patcher in (mock.patch.object(self.queue._pool, 'submit'),
+                        mock.patch('api.views.get_trip_job_queue', return_value=self.queue)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_submit_deduplicates_and_polls(self):
+        first = self.client.post(reverse('trip-jobs'), TRIP, content_type='application/json')
+        second = self.client.post(reverse('trip-jobs'), TRIP, content_type='application/json')
+        self.assertEqual((first.status_code, second.status_code), (202, 202))
+        self.assertEqual((first.json()['deduplicated'], second.json()['deduplicated']), (False, True))
+        self.assertEqual(second.json()['id'], first.json()['id'])
+        self.assertEqual(first['Location'], first.json()['status_url'])
+
+        status = self.client.get(first['Location'])
+        self.assertEqual(status.status_code, 200)
+        self.assertEqual(status.json()['status'], TripJob.QUEUED)
+        self.assertNotIn('deduplicated', status.json())
+
+    def test_unknown_job_is_404(self):
+        url = reverse('trip-job-detail', kwargs={'job_id': uuid.uuid4()})
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -1,8 +1,18 @@
-from django.urls import path
+from django.urls import path, re_path
 from . import views
 
 urlpatterns = [
     path('health/', views.HealthCheckView.as_view(), name='health-check'),
+    path('metrics/', views.MetricsView.as_view(), name='metrics'),
     path('calculate-trip/', views.CalculateTripView.as_view(), name='calculate-trip'),
+    path('calculate-trip/async/', views.AsyncCalculateTripView.as_view(), name='calculate-trip-async'),
+    path('calculate-trips/bulk/', views.BulkCalculateTripView.as_view(), name='calculate-trips-bulk'),
+    path('trip-jobs/', views.TripJobView.as_view(), name='trip-jobs'),
+    path('trip-jobs/<uuid:job_id>/', views.TripJobDetailView.as_view(), name='trip-job-detail'),
+    path('fleet/earliest-arrival/', views.FleetEarliestArrivalView.as_view(), name='fleet-earliest-arrival'),
+    path('log-book/', views.LogBookPDFView.as_view(), name='log-book'),
+    re_path(r'^log-sheets/(?P<digest>[0-9a-f]{64})\.(?P<extension>png|svg)$', views.LogSheetImageView.as_view(), name='log-sheet-image'),
+    path('drivers/<str:driver_id>/duty-days/', views.DriverDutyDayView.as_view(), name='driver-duty-days'),
+    path('drivers/<str:driver_id>/cycle/', views.DriverCycleView.as_view(), name='driver-cycle'),
     path('trip-history/', views.TripHistoryView.as_view(), name='trip-history'),
 ]
\ No newline at end of file
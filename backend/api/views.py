@@ -1,16 +1,62 @@
 # backend/api/views.py
+import json
+import logging
+from datetime import date
+from django.conf import settings
+from django.db import DatabaseError
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.decorators import method_decorator
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from drf_spectacular.utils import extend_schema, OpenApiParameter
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.fields import DateField
+from rest_framework.exceptions import ValidationError
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 from drf_spectacular.types import OpenApiTypes
 from .serializers import (
+    BulkTripRequestSerializer,
+    CycleStatusSerializer,
+    DutyDaySerializer,
+    FleetSimulationRequestSerializer,
+    TripHistoryQuerySerializer,
+    TripJobQuerySerializer,
+    TripJobSerializer,
     TripRequestSerializer, 
     TripResponseSerializer
 )
-from .services.route_calculator import RouteCalculator
-from .services.hos_calculator import HOSCalculator
-from .services.log_generator import LogGenerator
+from .renderers import ORJSONRenderer, binary_images
+from .services.fleet import get_fleet_simulator
+from .services.metrics import StageTimings, registry
+from .services.response_cache import get_response_cache, response_key
+from .services.route_cache import get_route_cache
+from .services.route_providers import RouteProviderError
+from .services.sheet_store import SheetStore
+from .services.trip_history import copy_trip, query_history, trip_from_result
+from .services.trip_jobs import QueueFull, get_trip_job_queue
+from .services.trip_planner import TripPlanner, get_trip_planner
+from .models import Trip
+from logs.models import DriverCycleState
+
+logger = logging.getLogger(__name__)
+
+def _log_sheet_url(request, sheet_id):
+    digest, extension = SheetStore.parse_id(sheet_id)
+    return request.build_absolute_uri(
+        reverse('log-sheet-image', kwargs={'digest': digest, 'extension': extension})
+    )
+
+def _attach_log_image_urls(request, logs):
+    """Replace stored sheet ids with absolute URLs to the image endpoint"""
+    for log in logs:
+        sheet_id = log.pop('log_image_id', None)
+        if sheet_id is not None:
+            log['log_image_url'] = _log_sheet_url(request, sheet_id)
 
 class HealthCheckView(APIView):
     @extend_schema(
@@ -29,6 +75,41 @@ class HealthCheckView(APIView):
             "version": "1.0.0"
         })
 
+class MetricsView(APIView):
+    def perform_content_negotiation(self, request, force=False):
+        # Scrapers ask for text/plain or OpenMetrics; the body is always Prometheus text
+        return super().perform_content_negotiation(request, force=True)
+
+    @extend_schema(
+        summary="Metrics",
+        description="Per-stage trip calculation and log sheet render histograms plus route cache counters, in Prometheus text format",
+        responses={(200, 'text/plain'): OpenApiTypes.STR},
+        tags=["Health"]
+    )
+    def get(self, request):
+        """
+        Returns this worker process's metrics for Prometheus to scrape
+        """
+        cache_stats = get_route_cache().stats()
+        response_stats = get_response_cache().stats()
+        samples = {
+            'route_cache_hits_total': ('counter', 'Route lookups served from the in-process cache', cache_stats['hits']),
+            'route_cache_shared_hits_total': ('counter', 'Route lookups served from the shared cache tier',
+                                              cache_stats['shared_hits']),
+            'route_cache_misses_total': ('counter', 'Route lookups that called the provider', cache_stats['misses']),
+            'route_cache_entries': ('gauge', 'Routes held in the in-process cache', cache_stats['size']),
+            'route_cache_max_entries': ('gauge', 'Capacity of the in-process route cache', cache_stats['max_entries']),
+            'response_cache_hits_total': ('counter', 'Trip responses served from the response cache',
+                                          response_stats['hits']),
+            'response_cache_misses_total': ('counter', 'Trip responses that had to be computed',
+                                            response_stats['misses']),
+            'response_cache_entries': ('gauge', 'Trip responses held in the response cache', response_stats['size']),
+            'response_cache_bytes': ('gauge', 'Body bytes held in the response cache', response_stats['bytes']),
+            'trip_jobs_pending': ('gauge', 'Trip jobs queued or running in this process',
+                                  get_trip_job_queue().pending()),
+        }
+        return HttpResponse(registry.render(samples), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 class CalculateTripView(APIView):
     @extend_schema(
         summary="Calculate Trip Route",
@@ -43,13 +124,14 @@ class CalculateTripView(APIView):
         The API returns:
         - Complete route with waypoints
         - All required stops (rest, fuel, breaks)
-        - ELD log sheets for each day
+        - ELD log sheets for each day (inline base64, or URLs with log_image_mode='url')
         - Total time and distance calculations
         """,
         request=TripRequestSerializer,
         responses={
             200: TripResponseSerializer,
             400: dict,
+            502: dict,
         },
         tags=["Trip Planning"]
     )
@@ -57,64 +139,492 @@ class CalculateTripView(APIView):
         """
         Calculate a compliant trip route with all required stops
         """
+        return self._calculate(request, request.data, conditional=False, save_history=True)
+    
+    @extend_schema(
+        summary="Calculate Trip Route (GET)",
+        description="""
+        Same as POST with the trip fields as query parameters. Responses carry
+        an ETag derived from the canonical request and plan date; send it back
+        in If-None-Match to get 304 Not Modified without any work being done.
+        GET is a safe method, so trips calculated this way are not saved to
+        trip history.
+        """,
+        parameters=[TripRequestSerializer],
+        responses={
+            200: TripResponseSerializer,
+            304: OpenApiResponse(description="Not modified"),
+            400: dict,
+            502: dict,
+        },
+        tags=["Trip Planning"]
+    )
+    def get(self, request):
+        """
+        Calculate a trip from query parameters, honouring If-None-Match
+        """
+        return self._calculate(request, request.query_params, conditional=True, save_history=False)
+    
+    def _calculate(self, request, payload, conditional, save_history):
+        self.timings = StageTimings()
+        self.etag = self.cache_key = self.history = None
+        with self.timings.stage('validate'):
+            serializer = TripRequestSerializer(data=payload)
+            valid = serializer.is_valid()
+        if not valid:
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        if data.get('current_cycle_hours') is None:
+            # The ledger can change between calls, so resolve it before hashing
+            with self.timings.stage('cycle'):
+                TripPlanner.resolve_cycle_hours([data])
+        
+        # Identical inputs on the same day give identical bytes: answer from the cache
+        key = response_key(data, date.today(), request.accepted_media_type, request.build_absolute_uri('/'))
+        self.etag = f'"{key}"'
+        if conditional and self.etag in parse_etags(request.headers.get('If-None-Match', '')):
+            return HttpResponseNotModified()
+        with self.timings.stage('cache'):
+            cached = get_response_cache().get(key)
+        if cached is not None:
+            content_type, body, history = cached
+            if save_history:
+                with self.timings.stage('history'):
+                    copy_trip(history).save()
+            return HttpResponse(body, content_type=content_type)
+        
+        try:
+            response_data = get_trip_planner().plan(data, timings=self.timings, binary_images=binary_images(request))
+        except RouteProviderError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_502_BAD_GATEWAY)
+        self.history = trip_from_result(data, response_data)
+        if save_history:
+            with self.timings.stage('history'):
+                copy_trip(self.history).save()
+        _attach_log_image_urls(request, response_data['log_sheets'])
+        self.cache_key = key
+        return Response(response_data, status=status.HTTP_200_OK)
+    
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Render here rather than in Django's handler so JSON encoding is timed
+        # and the rendered bytes can be cached
+        response = super().finalize_response(request, response, *args, **kwargs)
+        timings = getattr(self, 'timings', None)
+        if timings is None:
+            return response
+        if isinstance(response, Response):
+            with timings.stage('serialize'):
+                response.render()
+            if self.cache_key is not None and response.status_code == status.HTTP_200_OK:
+                get_response_cache().set(self.cache_key, response['Content-Type'], response.content, self.history)
+        if self.etag is not None and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = self.etag
+            patch_vary_headers(response, ['Accept'])
+        response['Server-Timing'] = timings.server_timing()
+        return response
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncCalculateTripView(View):
+    """
+    Native async twin of CalculateTripView for ASGI servers. Route legs are
+    awaited concurrently, and HOS planning and log rendering run on a bounded
+    thread pool, so one worker can keep many slow-route requests in flight
+    without planning on the event loop. It takes the
+    calculate-trip request body and answers with the same fields, always as
+    JSON: there is no msgpack negotiation, no ETag and no response cache, so
+    every request is planned and saved to history.
+    """
+    
+    async def post(self, request):
+        try:
+            payload = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({"detail": "JSON parse error"}, status=status.HTTP_400_BAD_REQUEST)
+        timings = StageTimings()
+        with timings.stage('validate'):
+            serializer = TripRequestSerializer(data=payload)
+            valid = serializer.is_valid()
+        if not valid:
+            return JsonResponse(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            response_data = await get_trip_planner().aplan(serializer.validated_data, timings=timings)
+        except RouteProviderError as exc:
+            return JsonResponse({"detail": str(exc)}, status=status.HTTP_502_BAD_GATEWAY)
+        with timings.stage('history'):
+            await trip_from_result(serializer.validated_data, response_data).asave()
+        _attach_log_image_urls(request, response_data['log_sheets'])
+        with timings.stage('serialize'):
+            response = JsonResponse(response_data, encoder=JSONEncoder)
+        response['Server-Timing'] = timings.server_timing()
+        return response
+
+class BulkCalculateTripView(APIView):
+    # Planned trips are written to history in batches of this many rows
+    HISTORY_BATCH_SIZE = 100
+
+    @extend_schema(
+        summary="Calculate Trips in Bulk",
+        description="""
+        Plans a list of trips and streams one NDJSON line per trip as soon as it
+        is finished: `{"index": 0, "result": {...}}`, or `{"index": 0, "error": "..."}`
+        if the route for that trip could not be planned. Log sheets are only rendered
+        when `include_logs` is true.
+        """,
+        request=BulkTripRequestSerializer,
+        responses={
+            (200, 'application/x-ndjson'): OpenApiTypes.STR,
+            400: dict,
+        },
+        tags=["Trip Planning"]
+    )
+    def post(self, request):
+        """
+        Stream compliant trip plans for many trips
+        """
+        serializer = BulkTripRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        trips = serializer.validated_data['trips']
+        include_logs = serializer.validated_data['include_logs']
+        planner = get_trip_planner()
+        # One query for every driver whose cycle hours come from the ledger
+        planner.resolve_cycle_hours(trips)
+
+        def save_history(rows):
+            # Trips already streamed stay streamed: a failed history write is
+            # logged rather than cutting the response off mid-body
+            try:
+                Trip.objects.bulk_create(rows)
+            except DatabaseError:
+                logger.exception("Could not save %d bulk trips to history", len(rows))
+
+        def results():
+            renderer = ORJSONRenderer()
+            history = []
+            try:
+                for index, trip in enumerate(trips):
+                    try:
+                        result = planner.plan(trip, include_logs=include_logs)
+                    except (RouteProviderError, ValueError) as exc:
+                        line = {'index': index, 'error': str(exc)}
+                    else:
+                        history.append(trip_from_result(trip, result))
+                        _attach_log_image_urls(request, result['log_sheets'])
+                        line = {'index': index, 'result': result}
+                    yield renderer.render(line) + b'\n'
+                    if len(history) >= self.HISTORY_BATCH_SIZE:
+                        save_history(history)
+                        history = []
+            finally:
+                # Also runs when the server closes the response early because
+                # the client went away, so every planned trip is kept
+                if history:
+                    save_history(history)
+
+        return StreamingHttpResponse(results(), content_type='application/x-ndjson')
+
+def _trip_job_payload(request, job, deduplicated=None):
+    payload = {
+        'id': job.id,
+        'status': job.status,
+        'status_url': request.build_absolute_uri(reverse('trip-job-detail', kwargs={'job_id': job.id})),
+        'created_at': job.created_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+        'expires_at': job.expires_at,
+    }
+    if deduplicated is not None:
+        payload['deduplicated'] = deduplicated
+    if job.status == job.SUCCEEDED:
+        result = job.result
+        _attach_log_image_urls(request, result['log_sheets'])
+        payload['result'] = result
+    elif job.status == job.FAILED:
+        payload['error'] = job.error
+    return payload
+
+class TripJobView(APIView):
+    @extend_schema(
+        summary="Submit Trip Job",
+        description="""
+        Queues a trip for background planning and answers 202 at once with a
+        job id and `status_url`. Poll that URL (with `?wait=seconds` to
+        long-poll) until the job has succeeded or failed; the result is the
+        calculate-trip response. An identical request already queued or
+        running returns that job (`deduplicated: true`). Answers 503 with
+        Retry-After when this worker already has its maximum of pending jobs.
+        """,
+        request=TripRequestSerializer,
+        responses={202: TripJobSerializer, 400: dict, 503: dict},
+        tags=["Trip Planning"]
+    )
+    def post(self, request):
+        """
+        Queue a trip calculation
+        """
         serializer = TripRequestSerializer(data=request.data)
-        if serializer.is_valid():
-            data = serializer.validated_data
-
-            # Calculate route (still mock distances/points in RouteCalculator)
-            route_calc = RouteCalculator()
-            route = route_calc.calculate(
-                data['current_location'],
-                data['pickup_location'],
-                data['dropoff_location']
-            )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        # Resolved here so the dedup key reflects the ledger at submit time
+        TripPlanner.resolve_cycle_hours([data])
+        try:
+            job, created = get_trip_job_queue().submit(data)
+        except QueueFull as exc:
+            response = Response({"detail": str(exc)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+            response['Retry-After'] = '5'
+            return response
+        payload = _trip_job_payload(request, job, deduplicated=not created)
+        response = Response(payload, status=status.HTTP_202_ACCEPTED)
+        response['Location'] = payload['status_url']
+        return response
 
-            # Plan HOS based on route total distance
-            hos = HOSCalculator()
-            hos_plan = hos.plan_trip(route_data=route, current_cycle_hours=data['current_cycle_hours'])
+class TripJobDetailView(APIView):
+    @extend_schema(
+        summary="Get Trip Job",
+        description="""
+        Status of a background trip job, with the calculate-trip response once
+        it has succeeded or the error once it has failed. With `wait`, an
+        unfinished job is held open until it finishes or the wait runs out.
+        Finished jobs are deleted after TRIP_JOB_RESULT_TTL seconds (404).
+        """,
+        parameters=[TripJobQuerySerializer],
+        responses={200: TripJobSerializer, 400: dict, 404: dict},
+        tags=["Trip Planning"]
+    )
+    def get(self, request, job_id):
+        """
+        Poll or long-poll a trip job
+        """
+        serializer = TripJobQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        wait = min(serializer.validated_data['wait'], settings.TRIP_JOBS['MAX_WAIT'])
+        job = get_trip_job_queue().get(job_id, wait=wait)
+        if job is None:
+            return Response({"detail": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(_trip_job_payload(request, job))
 
-            # Generate ELD log sheets as base64 PNGs
-            log_gen = LogGenerator()
-            logs = log_gen.generate_logs(hos_plan)
+class FleetEarliestArrivalView(APIView):
+    @extend_schema(
+        summary="Rank Drivers by Earliest Arrival",
+        description="""
+        Plans one load for every candidate driver and ranks them by the earliest
+        HOS-compliant delivery time. Each driver's trip covers an estimated
+        deadhead to pickup plus the routed pickup -> dropoff leg, planned against
+        that driver's remaining cycle hours (from the duty-day ledger when
+        `current_cycle_hours` is omitted). Large fleets are planned on a process pool.
+        Drivers whose location cannot be resolved are listed under `unresolved`.
+        """,
+        request=FleetSimulationRequestSerializer,
+        responses={200: dict, 400: dict, 502: dict},
+        tags=["Drivers"]
+    )
+    def post(self, request):
+        """
+        Ranked earliest compliant arrival times for a load
+        """
+        timings = StageTimings()
+        with timings.stage('validate'):
+            serializer = FleetSimulationRequestSerializer(data=request.data)
+            valid = serializer.is_valid()
+        if not valid:
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        try:
+            result = get_fleet_simulator().rank(data['load'], data['drivers'], limit=data.get('limit'), timings=timings)
+        except ValueError as exc:
+            return Response({"load": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+        except RouteProviderError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_502_BAD_GATEWAY)
+        response = Response(result)
+        response['Server-Timing'] = timings.server_timing()
+        return response
+
+class LogBookPDFView(APIView):
+    @extend_schema(
+        summary="Export Log Book PDF",
+        description="""
+        Plans the trip and streams its ELD log book as a vector PDF, one page
+        per calendar day. Much smaller than the per-day PNG sheets.
+        """,
+        request=TripRequestSerializer,
+        responses={
+            (200, 'application/pdf'): OpenApiTypes.BINARY,
+            400: dict,
+            502: dict,
+        },
+        tags=["Trip Planning"]
+    )
+    def post(self, request):
+        """
+        Stream the multi-day log book for a trip
+        """
+        serializer = TripRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            chunks = get_trip_planner().log_book(serializer.validated_data)
+        except RouteProviderError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_502_BAD_GATEWAY)
+        response = StreamingHttpResponse(chunks, content_type='application/pdf')
+        response['Content-Disposition'] = 'attachment; filename="log-book.pdf"'
+        return response
 
-            response_data = {
-                'route': route,
-                'stops': hos_plan['stops'],
-                'log_sheets': logs,
-                'total_distance': route['total_distance'],
-                'total_time': hos_plan['total_time'],
-                'fuel_stops': hos_plan['fuel_stops'],
-            }
+class LogSheetImageView(APIView):
 
-            return Response(response_data, status=status.HTTP_200_OK)
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    def perform_content_negotiation(self, request, force=False):
+        # Image clients send Accept: image/png; errors still render as JSON
+        return super().perform_content_negotiation(request, force=True)
 
-class TripHistoryView(APIView):
     @extend_schema(
-        summary="Get Trip History",
-        description="Retrieve historical trip data",
+        summary="Get Log Sheet Image",
+        description="Serve a rendered ELD log sheet (PNG or SVG) by its content hash",
         parameters=[
             OpenApiParameter(
-                name='start_date',
-                type=OpenApiTypes.DATE,
-                location=OpenApiParameter.QUERY,
-                description='Start date for history query',
-                required=False
+                name='digest',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.PATH,
+                description='SHA-256 of the sheet bytes'
             ),
             OpenApiParameter(
-                name='end_date',
+                name='extension',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.PATH,
+                enum=['png', 'svg'],
+            ),
+        ],
+        responses={
+            (200, 'image/png'): OpenApiTypes.BINARY,
+            (200, 'image/svg+xml'): OpenApiTypes.STR,
+            304: OpenApiResponse(description="Not modified"),
+            404: dict,
+        },
+        tags=["Trip Planning"]
+    )
+    def get(self, request, digest, extension):
+        """
+        Returns the raw sheet bytes with a strong ETag. Sheets are
+        content-addressed, so a URL always maps to the same bytes, but the
+        store deletes them after its TTL; caches may keep them that long.
+        """
+        store = SheetStore()
+        etag = f'"{digest}"'
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if (etag in if_none_match or '*' in if_none_match) and store.exists(digest, extension):
+            response = HttpResponseNotModified()
+        else:
+            data = store.load(digest, extension)
+            if data is None:
+                return Response({"detail": "Log sheet not found"}, status=status.HTTP_404_NOT_FOUND)
+            response = HttpResponse(data, content_type=SheetStore.CONTENT_TYPES[extension])
+        response['ETag'] = etag
+        response['Cache-Control'] = f'public, max-age={store.ttl}, immutable'
+        return response
+
+def _cycle_status(driver_id, state, as_of):
+    ledger = state.get_ledger() if state is not None else None
+    used = ledger.used_minutes(as_of) / 60 if ledger else 0.0
+    return {
+        'driver_id': driver_id,
+        'as_of': as_of,
+        'used_hours': round(used, 2),
+        'remaining_hours': round(max(0.0, 70 - used), 2),
+        'last_logged_day': state.last_day if state else None,
+        'last_restart': state.last_restart if state else None,
+    }
+
+class DriverDutyDayView(APIView):
+    @extend_schema(
+        summary="Log Driver Duty Day",
+        description="""
+        Folds one calendar day into the driver's rolling 70-hour/8-day ledger.
+        Days must be logged in chronological order; unlogged days count as off duty.
+        Logging the latest day again replaces it, for corrections.
+        Sending duty-status segments lets 34-hour restarts be detected exactly.
+        """,
+        request=DutyDaySerializer,
+        responses={200: CycleStatusSerializer, 400: dict},
+        tags=["Drivers"]
+    )
+    def post(self, request, driver_id):
+        """
+        Record a driver's duty day and return the updated cycle status
+        """
+        serializer = DutyDaySerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        data = serializer.validated_data
+        try:
+            state = DriverCycleState.log_day(
+                driver_id,
+                data['date'],
+                data['on_duty_hours'] * 60,
+                data.get('segments'),
+            )
+        except ValueError as exc:
+            return Response({"date": [str(exc)]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(CycleStatusSerializer(_cycle_status(driver_id, state, data['date'])).data)
+
+class DriverCycleView(APIView):
+    @extend_schema(
+        summary="Get Driver Cycle Status",
+        description="Hours used and remaining in the driver's 70-hour/8-day cycle",
+        parameters=[
+            OpenApiParameter(
+                name='as_of',
                 type=OpenApiTypes.DATE,
                 location=OpenApiParameter.QUERY,
-                description='End date for history query',
+                description='Day to evaluate the cycle on (defaults to today)',
                 required=False
             ),
         ],
-        responses={200: dict},
+        responses={200: CycleStatusSerializer, 400: dict},
+        tags=["Drivers"]
+    )
+    def get(self, request, driver_id):
+        """
+        Returns the driver's current cycle usage
+        """
+        as_of = date.today()
+        if 'as_of' in request.query_params:
+            try:
+                as_of = DateField().to_internal_value(request.query_params['as_of'])
+            except ValidationError as exc:
+                return Response({"as_of": exc.detail}, status=status.HTTP_400_BAD_REQUEST)
+        state = DriverCycleState.objects.filter(driver_id=driver_id).first()
+        return Response(CycleStatusSerializer(_cycle_status(driver_id, state, as_of)).data)
+
+class TripHistoryView(APIView):
+    @extend_schema(
+        summary="Get Trip History",
+        description="""
+        Retrieve calculated trips, newest first, one page at a time.
+        Pass the returned `next_cursor` as `cursor` to fetch the following page;
+        it is null on the last page. `fields` limits the columns returned
+        (`stops` and `log_sheet_ids` are left out unless requested).
+        """,
+        parameters=[TripHistoryQuerySerializer],
+        responses={200: dict, 400: dict},
         tags=["Trip History"]
     )
     def get(self, request):
         """
         Get historical trip data within date range
         """
-        # Implementation here
-        return Response({"trips": []})
\ No newline at end of file
+        serializer = TripHistoryQuerySerializer(data=request.query_params)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        params = serializer.validated_data
+        trips, next_cursor = query_history(
+            start_date=params.get('start_date'),
+            end_date=params.get('end_date'),
+            driver_id=params.get('driver_id'),
+            cursor=params.get('cursor'),
+            limit=params['limit'],
+            fields=params['fields'],
+        )
+        for trip in trips:
+            if 'log_sheet_ids' in trip:
+                trip['log_sheet_urls'] = [_log_sheet_url(request, sheet_id) for sheet_id in trip.pop('log_sheet_ids')]
+        return Response({"trips": trips, "next_cursor": next_cursor})
@@ -1,3 +1,9 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import DriverCycleState
+
+
+@admin.register(DriverCycleState)
+class DriverCycleStateAdmin(admin.ModelAdmin):
+    list_display = ('driver_id', 'last_day', 'last_restart', 'updated_at')
+    search_fields = ('driver_id',)
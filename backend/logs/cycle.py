@@ -0,0 +1,133 @@
+# backend/logs/cycle.py
+from datetime import date
+from typing import Iterable, List, Optional
+
+CYCLE_DAYS = 8
+CYCLE_LIMIT_MINUTES = 70 * 60
+RESTART_MINUTES = 34 * 60
+MINUTES_PER_DAY = 24 * 60
+ON_DUTY_STATUSES = ('driving', 'on_duty_not_driving')
+
+
+class CycleLedger:
+    """
+    Rolling 70-hour/8-day ledger for one driver.
+    On-duty minutes live in a fixed 8-slot ring indexed by day ordinal, with a
+    running total, so logging a day and querying the remaining cycle are O(1)
+    no matter how long the driver's history is. A run of 34 consecutive
+    off-duty hours is detected while logging and clears the ring (restart).
+    The state from before the newest day is kept, so logging that day again
+    replaces it (including any restart it completed) instead of adding to it.
+    """
+
+    __slots__ = ('slots', 'last_day', 'total', 'off_duty_streak', 'last_restart', 'previous')
+
+    def __init__(self, slots: Optional[List[int]] = None, last_day: Optional[int] = None,
+                 off_duty_streak: int = 0, last_restart: Optional[int] = None,
+                 previous: Optional[dict] = None):
+        self.slots = list(slots) if slots else [0] * CYCLE_DAYS
+        self.last_day = last_day          # date ordinal of the newest logged day
+        self.total = sum(self.slots)
+        self.off_duty_streak = off_duty_streak  # off-duty minutes ending at the end of last_day
+        self.last_restart = last_restart  # date ordinal on which the latest restart completed
+        self.previous = previous          # _snapshot() taken before last_day was logged
+
+    def _snapshot(self) -> dict:
+        return {
+            'slots': list(self.slots),
+            'last_day': self.last_day,
+            'off_duty_streak': self.off_duty_streak,
+            'last_restart': self.last_restart,
+        }
+
+    def _restore(self, snapshot: dict) -> None:
+        self.slots = list(snapshot['slots'])
+        self.total = sum(self.slots)
+        self.last_day = snapshot['last_day']
+        self.off_duty_streak = snapshot['off_duty_streak']
+        self.last_restart = snapshot['last_restart']
+
+    def _advance(self, day: int) -> None:
+        """Roll the ring forward to day, dropping days that leave the 8-day window"""
+        if self.last_day is None:
+            self.last_day = day
+            return
+        gap = day - self.last_day
+        for offset in range(1, min(gap, CYCLE_DAYS) + 1):
+            slot = (self.last_day + offset) % CYCLE_DAYS
+            self.total -= self.slots[slot]
+            self.slots[slot] = 0
+        if gap > 1:
+            # Unlogged days in between are off duty
+            self._add_off_duty((gap - 1) * MINUTES_PER_DAY, self.last_day + gap - 1)
+        self.last_day = day
+
+    def _add_off_duty(self, minutes: float, day: int) -> None:
+        self.off_duty_streak += minutes
+        if self.off_duty_streak >= RESTART_MINUTES and self.total > 0:
+            self.slots = [0] * CYCLE_DAYS
+            self.total = 0
+            self.last_restart = day
+
+    def _add_on_duty(self, minutes: float, day: int) -> None:
+        slot = day % CYCLE_DAYS
+        self.slots[slot] += minutes
+        self.total += minutes
+        self.off_duty_streak = 0
+
+    def log_day(self, day: date, on_duty_minutes: float, segments: Iterable = None) -> None:
+        """
+        Log one calendar day. With duty-status segments (timeline records or
+        dicts with 'status'/'duration' in minutes, in chronological order) the
+        off-duty streak is tracked exactly; otherwise on-duty time is assumed
+        to be one block and the rest of the day off duty. Logging the newest
+        day again replaces it; earlier days cannot be changed.
+        """
+        ordinal = day.toordinal()
+        if self.last_day is not None and ordinal < self.last_day:
+            raise ValueError("Days must be logged in chronological order")
+        if ordinal == self.last_day:
+            if self.previous is None:
+                raise ValueError("This day was logged before corrections were recorded and cannot be replaced")
+            self._restore(self.previous)
+        self.previous = self._snapshot()
+        self._advance(ordinal)
+        if segments is None:
+            if on_duty_minutes > 0:
+                self._add_on_duty(on_duty_minutes, ordinal)
+            self._add_off_duty(MINUTES_PER_DAY - on_duty_minutes, ordinal)
+            return
+        for segment in segments:
+            if isinstance(segment, dict):
+                status, duration = segment['status'], segment['duration']
+            else:
+                status, duration = segment.status, segment.duration
+            if status in ON_DUTY_STATUSES:
+                self._add_on_duty(duration, ordinal)
+            else:
+                self._add_off_duty(duration, ordinal)
+
+    def used_minutes(self, as_of: Optional[date] = None) -> float:
+        """On-duty minutes counted in the 8-day window ending on as_of (default: last logged day)"""
+        if self.last_day is None:
+            return 0
+        if as_of is None:
+            return self.total
+        gap = as_of.toordinal() - self.last_day
+        if gap <= 0:
+            return self.total
+        if gap >= CYCLE_DAYS or self.off_duty_streak + gap * MINUTES_PER_DAY - MINUTES_PER_DAY >= RESTART_MINUTES:
+            # Everything rolled out, or the idle days themselves form a restart
+            return 0
+        used = self.total
+        for offset in range(1, gap + 1):
+            used -= self.slots[(self.last_day + offset) % CYCLE_DAYS]
+        return used
+
+    def remaining_minutes(self, as_of: Optional[date] = None) -> float:
+        return max(0, CYCLE_LIMIT_MINUTES - self.used_minutes(as_of))
+
+    def to_state(self) -> dict:
+        state = self._snapshot()
+        state['previous'] = self.previous
+        return state
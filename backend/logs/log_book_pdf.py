@@ -0,0 +1,209 @@
+# backend/logs/log_book_pdf.py
+import tempfile
+from datetime import date
+from typing import Dict, Iterable, Iterator, Tuple
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import landscape, letter
+from reportlab.pdfgen import canvas
+from api.services.trip_plan import DutyDay
+
+STATUS_ROWS = {
+    'off_duty': 0,
+    'sleeper_berth': 1,
+    'driving': 2,
+    'on_duty_not_driving': 3,
+}
+STATUS_LABELS = ['Off Duty', 'Sleeper Berth', 'Driving', 'On Duty', '(Not Driving)']
+
+
+class LogBookPDF:
+    """
+    Multi-day ELD log book as a vector PDF, one page per calendar day.
+    Uses the same sheet layout as LogSheetDrawer (in its 1200x800 pixel
+    coordinates, scaled onto a landscape letter page). The static sheet is
+    drawn once per document as a form XObject that every page references,
+    so a page only adds its own duty-status lines, totals and text.
+    """
+
+    SHEET_WIDTH = 1200
+    SHEET_HEIGHT = 800
+    FORM_NAME = 'log_sheet'
+    CHUNK_SIZE = 64 * 1024
+    # The finished document is spooled here before streaming; larger books spill to disk
+    SPOOL_MAX_BYTES = 1024 * 1024
+
+    def __init__(self):
+        self.page_width, self.page_height = landscape(letter)
+        self.scale = min(self.page_width / self.SHEET_WIDTH, self.page_height / self.SHEET_HEIGHT)
+        self.offset_y = (self.page_height - self.SHEET_HEIGHT * self.scale) / 2
+        self.grid_start_x = 150
+        self.grid_start_y = 250
+        self.grid_width = 960
+        self.grid_height = 320
+
+    def _x(self, x: float) -> float:
+        return x * self.scale
+
+    def _y(self, y: float) -> float:
+        # Sheet coordinates grow downwards, PDF coordinates upwards
+        return self.page_height - self.offset_y - y * self.scale
+
+    def _line(self, c, x1, y1, x2, y2):
+        c.line(self._x(x1), self._y(y1), self._x(x2), self._y(y2))
+
+    def _rect(self, c, x1, y1, x2, y2):
+        c.rect(self._x(x1), self._y(y2), self._x(x2 - x1), (y2 - y1) * self.scale)
+
+    def _text(self, c, x, y, text, size):
+        # y is the top of the text box, as with PIL's default anchor
+        c.setFont('Helvetica', size * self.scale)
+        c.drawString(self._x(x), self._y(y + size * 0.8), text)
+
+    def write(self, days: Iterable[Tuple[DutyDay, date]], driver_info: Dict, fileobj) -> int:
+        """
+        Write the log book for (day_data, date) pairs to fileobj and return
+        the number of pages. Days are consumed one at a time.
+        """
+        c = canvas.Canvas(fileobj, pagesize=(self.page_width, self.page_height), pageCompression=1)
+        c.setTitle("Driver's Daily Log")
+        c.beginForm(self.FORM_NAME)
+        self._draw_static(c)
+        c.endForm()
+        pages = 0
+        for day_data, current_date in days:
+            c.doForm(self.FORM_NAME)
+            self._draw_info_values(c, current_date, driver_info)
+            self._draw_duty_status_lines(c, day_data)
+            self._draw_totals(c, day_data)
+            self._draw_remarks(c, day_data)
+            c.showPage()
+            pages += 1
+        c.save()
+        return pages
+
+    def stream(self, days: Iterable[Tuple[DutyDay, date]], driver_info: Dict = None) -> Iterator[bytes]:
+        """
+        Render the log book and yield it in CHUNK_SIZE pieces. reportlab
+        keeps every page until save(), so the whole document is built before
+        the first chunk; only the transfer is chunked, from a spool that
+        spills to disk past SPOOL_MAX_BYTES.
+        """
+        driver_info = driver_info or {"name": "Driver"}
+        with tempfile.SpooledTemporaryFile(max_size=self.SPOOL_MAX_BYTES) as spool:
+            self.write(days, driver_info, spool)
+            spool.seek(0)
+            while True:
+                chunk = spool.read(self.CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+    def _draw_static(self, c):
+        """Header, info boxes, grid, totals heading and remarks box"""
+        c.setStrokeColor(colors.black)
+        c.setFillColor(colors.black)
+        c.setFont('Helvetica-Bold', 20 * self.scale)
+        c.drawCentredString(self._x(self.SHEET_WIDTH / 2), self._y(37), "DRIVER'S DAILY LOG")
+        c.setFont('Helvetica', 12 * self.scale)
+        c.drawCentredString(self._x(self.SHEET_WIDTH / 2), self._y(59), "(ONE CALENDAR DAY - 24 HOURS)")
+
+        boxes = [
+            (50, 100, 300, "Date:"), (320, 100, 600, "Driver:"),
+            (50, 140, 300, "From:"), (320, 140, 600, "To:"),
+            (50, 180, 400, "Carrier:"), (420, 180, 700, "Truck/Trailer:"),
+        ]
+        c.setLineWidth(self.scale)
+        for x1, y1, x2, label in boxes:
+            self._rect(c, x1, y1, x2, y1 + 30)
+            self._text(c, x1 + 5, y1 + 5, label, 14)
+
+        hour_width = self.grid_width / 24
+        status_height = self.grid_height / 4
+        top = self.grid_start_y
+        bottom = top + self.grid_height
+        left = self.grid_start_x
+        right = left + self.grid_width
+        for i, label in enumerate(STATUS_LABELS[:3]):
+            self._text(c, 70, top + i * status_height + status_height / 2 - 7, label, 14)
+        self._text(c, 70, top + 3 * status_height + status_height / 2 - 16, STATUS_LABELS[3], 14)
+        self._text(c, 70, top + 3 * status_height + status_height / 2, STATUS_LABELS[4], 14)
+
+        # 15-minute marks first so hour lines are drawn over them
+        c.setStrokeColor(colors.lightgrey)
+        c.setLineWidth(self.scale)
+        for hour in range(24):
+            for quarter in range(1, 4):
+                x = left + hour * hour_width + quarter * hour_width / 4
+                self._line(c, x, top, x, bottom)
+        for hour in range(25):
+            x = left + hour * hour_width
+            c.setStrokeColor(colors.black if hour % 6 == 0 else colors.grey)
+            c.setLineWidth((2 if hour in (0, 24) else 1) * self.scale)
+            self._line(c, x, top, x, bottom)
+        c.setStrokeColor(colors.black)
+        for i in range(5):
+            y = top + i * status_height
+            c.setLineWidth((2 if i in (0, 4) else 1) * self.scale)
+            self._line(c, left, y, right, y)
+        c.setFont('Helvetica', 12 * self.scale)
+        for hour in range(24):
+            c.drawCentredString(self._x(left + hour * hour_width + hour_width / 2), self._y(top - 6), str(hour))
+
+        frame_top = bottom + 40
+        c.setLineWidth(self.scale)
+        self._text(c, right - 200, frame_top, "TOTAL HOURS", 14)
+        self._rect(c, 50, frame_top, right - 250, frame_top + 100)
+        self._text(c, 55, frame_top + 5, "REMARKS:", 14)
+
+    def _draw_info_values(self, c, current_date: date, driver_info: Dict):
+        values = [
+            (100, 100, current_date.strftime("%m/%d/%Y")),
+            (380, 100, driver_info.get('name', 'Driver')),
+            (100, 140, driver_info.get('from', '-')),
+            (370, 140, driver_info.get('to', '-')),
+            (110, 180, driver_info.get('carrier', '-')),
+            (520, 180, driver_info.get('truck', '-')),
+        ]
+        c.setFillColor(colors.black)
+        for x, y, text in values:
+            self._text(c, x, y + 5, text, 14)
+
+    def _draw_duty_status_lines(self, c, day_data: DutyDay):
+        """Plots the day's timeline Segments, as LogSheetDrawer does"""
+        status_height = self.grid_height / 4
+        minute_width = self.grid_width / (24 * 60)
+        segments = day_data.segments
+        c.setStrokeColor(colors.green)
+        previous_y = None
+        for segment in segments:
+            status, start, duration = segment.status, segment.start_minute, segment.duration
+            if status not in STATUS_ROWS:
+                continue
+            y = self.grid_start_y + STATUS_ROWS[status] * status_height + status_height / 2
+            x_start = self.grid_start_x + start * minute_width
+            x_end = self.grid_start_x + (start + duration) * minute_width
+            if previous_y is not None and previous_y != y:
+                c.setLineWidth(2 * self.scale)
+                self._line(c, x_start, previous_y, x_start, y)
+            c.setLineWidth((4 if status == 'driving' else 3) * self.scale)
+            self._line(c, x_start, y, x_end, y)
+            previous_y = y
+
+    def _draw_totals(self, c, day_data: DutyDay):
+        y = self.grid_start_y + self.grid_height + 40 + 25
+        x = self.grid_start_x + self.grid_width - 200
+        totals = [
+            ('Off Duty:', day_data.off_duty),
+            ('Sleeper:', day_data.sleeper_berth),
+            ('Driving:', day_data.driving),
+            ('On Duty:', day_data.on_duty_not_driving),
+        ]
+        for label, hours in totals:
+            self._text(c, x, y, f"{label} {hours:.1f}", 12)
+            y += 20
+
+    def _draw_remarks(self, c, day_data: DutyDay):
+        y = self.grid_start_y + self.grid_height + 40 + 25
+        for remark in day_data.remarks[:3]:
+            self._text(c, 60, y, remark, 12)
+            y += 20
@@ -3,6 +3,41 @@ from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime, timedelta
 import io
 import base64
+import threading
+import time
+from trucking_hos.metrics import registry
+from api.services.timeline import Segment
+
+SHEET_METRIC = 'log_sheet_render_seconds'
+SHEET_HELP = 'Time spent per ELD log sheet, by phase'
+
+# Static sheet layers (header, info boxes, 24-hour grid) keyed by font set and
+# geometry. Rendered once per process and copied onto every new sheet.
+_TEMPLATE_CACHE = {}
+_TEMPLATE_LOCK = threading.Lock()
+
+# (large, medium, small, key) font set, loaded once per process; a failed
+# truetype lookup walks the system font directories, so it is not repeated
+_FONTS = None
+_FONTS_LOCK = threading.Lock()
+
+def _get_fonts():
+    """Return the shared font set, loading Arial or Pillow's default on first use"""
+    global _FONTS
+    if _FONTS is None:
+        with _FONTS_LOCK:
+            if _FONTS is None:
+                try:
+                    _FONTS = (
+                        ImageFont.truetype("arial.ttf", 20),
+                        ImageFont.truetype("arial.ttf", 14),
+                        ImageFont.truetype("arial.ttf", 12),
+                        ('arial.ttf', 20, 14, 12),
+                    )
+                except OSError:
+                    default = ImageFont.load_default()
+                    _FONTS = (default, default, default, ('default',))
+    return _FONTS
 
 class LogSheetDrawer:
     """
@@ -18,48 +53,80 @@ class LogSheetDrawer:
         self.grid_width = 960
         self.grid_height = 320
         
-        # Try to load fonts
-        try:
-            self.font_large = ImageFont.truetype("arial.ttf", 20)
-            self.font_medium = ImageFont.truetype("arial.ttf", 14)
-            self.font_small = ImageFont.truetype("arial.ttf", 12)
-        except:
-            self.font_large = ImageFont.load_default()
-            self.font_medium = ImageFont.load_default()
-            self.font_small = ImageFont.load_default()
+        self.font_large, self.font_medium, self.font_small, self.font_key = _get_fonts()
+
+    def warm_up(self):
+        """Render the static template now so the first request does not pay for it"""
+        self._get_static_template()
     
     def draw_log_sheet(self, day_data, date, driver_info):
         """
         Creates a complete ELD log sheet matching FMCSA format
         """
-        img = Image.new('RGB', (self.width, self.height), 'white')
+        img_str = base64.b64encode(self.render_png(day_data, date, driver_info)).decode()
+        
+        return {
+            'image': img_str,
+            'date': date.isoformat(),
+            'totals': {
+                'driving': day_data.driving,
+                'on_duty': day_data.on_duty_not_driving,
+                'sleeper': day_data.sleeper_berth,
+                'off_duty': day_data.off_duty
+            }
+        }
+    
+    def render_png(self, day_data, date, driver_info):
+        """
+        Renders the log sheet and returns the raw PNG bytes
+        """
+        start = time.perf_counter()
+        img = self._get_static_template().copy()
         draw = ImageDraw.Draw(img)
         
-        # Draw all components
-        self._draw_header(draw, date, driver_info)
-        self._draw_info_section(draw, driver_info)
-        self._draw_grid(draw)
+        # Static layers come from the template; only draw what changes per day
+        self._draw_info_values(draw, driver_info)
         self._draw_duty_status_lines(draw, day_data)
         self._draw_totals(draw, day_data)
         self._draw_remarks(draw, day_data)
+        drawn = time.perf_counter()
         
-        # Convert to base64
         buffer = io.BytesIO()
         img.save(buffer, format='PNG')
-        img_str = base64.b64encode(buffer.getvalue()).decode()
-        
-        return {
-            'image': img_str,
-            'date': date.isoformat(),
-            'totals': {
-                'driving': day_data.get('driving', 0),
-                'on_duty': day_data.get('on_duty_not_driving', 0),
-                'sleeper': day_data.get('sleeper_berth', 0),
-                'off_duty': day_data.get('off_duty', 0)
-            }
-        }
+        registry.observe(SHEET_METRIC, drawn - start, SHEET_HELP, phase='draw')
+        registry.observe(SHEET_METRIC, time.perf_counter() - drawn, SHEET_HELP, phase='encode')
+        return buffer.getvalue()
     
-    def _draw_header(self, draw, date, driver_info):
+    def _template_key(self):
+        return (
+            self.font_key, self.width, self.height,
+            self.grid_start_x, self.grid_start_y, self.grid_width, self.grid_height,
+        )
+    
+    def _get_static_template(self):
+        """Return the cached static layers for this font set and sheet size"""
+        key = self._template_key()
+        template = _TEMPLATE_CACHE.get(key)
+        if template is None:
+            with _TEMPLATE_LOCK:
+                template = _TEMPLATE_CACHE.get(key)
+                if template is None:
+                    template = self._render_static_template()
+                    _TEMPLATE_CACHE[key] = template
+        return template
+    
+    def _render_static_template(self):
+        """Draw everything that does not depend on the day being logged"""
+        img = Image.new('RGB', (self.width, self.height), 'white')
+        draw = ImageDraw.Draw(img)
+        self._draw_header(draw)
+        self._draw_info_section(draw)
+        self._draw_grid(draw)
+        self._draw_totals_frame(draw)
+        self._draw_remarks_frame(draw)
+        return img
+    
+    def _draw_header(self, draw):
         """Draw the header section"""
         # Title
         draw.text((self.width // 2, 30), "DRIVER'S DAILY LOG", 
@@ -67,43 +134,47 @@ class LogSheetDrawer:
         draw.text((self.width // 2, 55), "(ONE CALENDAR DAY - 24 HOURS)", 
                  fill='black', anchor='mm', font=self.font_small)
     
-    def _draw_info_section(self, draw, driver_info):
-        """Draw driver and vehicle information section"""
+    def _draw_info_section(self, draw):
+        """Draw driver and vehicle information boxes and labels"""
         y_start = 100
         
-        # Date box
+        # Date and driver name boxes
         draw.rectangle([(50, y_start), (300, y_start + 30)], outline='black')
         draw.text((55, y_start + 5), "Date:", fill='black', font=self.font_medium)
-        draw.text((100, y_start + 5), datetime.now().strftime("%m/%d/%Y"), 
-                 fill='black', font=self.font_medium)
-        
-        # Driver name box
         draw.rectangle([(320, y_start), (600, y_start + 30)], outline='black')
         draw.text((325, y_start + 5), "Driver:", fill='black', font=self.font_medium)
-        draw.text((380, y_start + 5), driver_info.get('name', 'Driver'), 
-                 fill='black', font=self.font_medium)
         
         # From/To boxes
         y_start += 40
         draw.rectangle([(50, y_start), (300, y_start + 30)], outline='black')
         draw.text((55, y_start + 5), "From:", fill='black', font=self.font_medium)
-        draw.text((100, y_start + 5), driver_info.get('from', '—'), 
-                 fill='black', font=self.font_medium)
-        
         draw.rectangle([(320, y_start), (600, y_start + 30)], outline='black')
         draw.text((325, y_start + 5), "To:", fill='black', font=self.font_medium)
-        draw.text((370, y_start + 5), driver_info.get('to', '—'), 
-                 fill='black', font=self.font_medium)
         
         # Carrier and Truck/Trailer
         y_start += 40
         draw.rectangle([(50, y_start), (400, y_start + 30)], outline='black')
         draw.text((55, y_start + 5), "Carrier:", fill='black', font=self.font_medium)
-        draw.text((110, y_start + 5), driver_info.get('carrier', '—'), 
-                 fill='black', font=self.font_medium)
-        
         draw.rectangle([(420, y_start), (700, y_start + 30)], outline='black')
         draw.text((425, y_start + 5), "Truck/Trailer:", fill='black', font=self.font_medium)
+    
+    def _draw_info_values(self, draw, driver_info):
+        """Fill in the driver and vehicle information boxes"""
+        y_start = 100
+        draw.text((100, y_start + 5), datetime.now().strftime("%m/%d/%Y"), 
+                 fill='black', font=self.font_medium)
+        draw.text((380, y_start + 5), driver_info.get('name', 'Driver'), 
+                 fill='black', font=self.font_medium)
+        
+        y_start += 40
+        draw.text((100, y_start + 5), driver_info.get('from', '—'), 
+                 fill='black', font=self.font_medium)
+        draw.text((370, y_start + 5), driver_info.get('to', '—'), 
+                 fill='black', font=self.font_medium)
+        
+        y_start += 40
+        draw.text((110, y_start + 5), driver_info.get('carrier', '—'), 
+                 fill='black', font=self.font_medium)
         draw.text((520, y_start + 5), driver_info.get('truck', '—'), 
                  fill='black', font=self.font_medium)
     
@@ -153,9 +224,12 @@ class LogSheetDrawer:
                              fill='lightgray', width=1)
     
     def _draw_duty_status_lines(self, draw, day_data):
-        """Draw the actual duty status lines based on segments"""
+        """
+        Draw the actual duty status lines based on the day's timeline Segments
+        (start_minute/duration in minutes), or on segments laid out from its totals.
+        """
         status_height = self.grid_height / 4
-        hour_width = self.grid_width / 24
+        minute_width = self.grid_width / (24 * 60)
         
         # Status row indices
         status_rows = {
@@ -166,29 +240,34 @@ class LogSheetDrawer:
         }
         
         # Get segments from day_data (or use defaults)
-        segments = day_data.get('segments', [])
+        segments = day_data.segments
         
         if not segments:
             # Create default segments from totals
             segments = self._create_segments_from_totals(day_data)
         
-        # Draw each segment
+        # Draw each segment, joining status changes with a vertical line
+        previous_y = None
         for segment in segments:
-            status = segment['status']
-            start_hour = segment['start_hour']
-            duration = segment['duration']
+            status = segment.status
+            start = segment.start_minute
+            duration = segment.duration
             
             if status in status_rows:
                 row_idx = status_rows[status]
                 y = self.grid_start_y + row_idx * status_height + status_height/2
                 
-                x_start = self.grid_start_x + start_hour * hour_width
-                x_end = self.grid_start_x + (start_hour + duration) * hour_width
+                x_start = self.grid_start_x + start * minute_width
+                x_end = self.grid_start_x + (start + duration) * minute_width
+                
+                if previous_y is not None and previous_y != y:
+                    draw.line([(x_start, previous_y), (x_start, y)], fill='green', width=2)
                 
                 # Draw thicker line for driving
                 line_width = 4 if status == 'driving' else 3
                 draw.line([(x_start, y), (x_end, y)], 
                          fill='green', width=line_width)
+                previous_y = y
     
     def _create_segments_from_totals(self, day_data):
         """Create segments from total hours if segments not provided"""
@@ -196,78 +275,57 @@ class LogSheetDrawer:
         current_hour = 0
         
         # Off duty at start
-        off_start = day_data.get('off_duty', 0)
+        off_start = day_data.off_duty
         if off_start > 0:
-            segments.append({
-                'status': 'off_duty',
-                'start_hour': current_hour,
-                'duration': min(off_start, 8)
-            })
+            segments.append(Segment(current_hour * 60, min(off_start, 8) * 60, 'off_duty'))
             current_hour += min(off_start, 8)
         
         # On duty for pickup
-        on_duty_pickup = day_data.get('on_duty_not_driving', 0)
+        on_duty_pickup = day_data.on_duty_not_driving
         if on_duty_pickup > 0:
-            segments.append({
-                'status': 'on_duty_not_driving',
-                'start_hour': current_hour,
-                'duration': min(on_duty_pickup/2, 1)
-            })
+            segments.append(Segment(current_hour * 60, min(on_duty_pickup/2, 1) * 60, 'on_duty_not_driving'))
             current_hour += min(on_duty_pickup/2, 1)
         
         # Driving
-        driving = day_data.get('driving', 0)
+        driving = day_data.driving
         if driving > 0:
-            segments.append({
-                'status': 'driving',
-                'start_hour': current_hour,
-                'duration': driving
-            })
+            segments.append(Segment(current_hour * 60, driving * 60, 'driving'))
             current_hour += driving
         
         # On duty for dropoff
         if on_duty_pickup > 1:
-            segments.append({
-                'status': 'on_duty_not_driving',
-                'start_hour': current_hour,
-                'duration': min(on_duty_pickup/2, 1)
-            })
+            segments.append(Segment(current_hour * 60, min(on_duty_pickup/2, 1) * 60, 'on_duty_not_driving'))
             current_hour += min(on_duty_pickup/2, 1)
         
         # Sleeper berth if any
-        sleeper = day_data.get('sleeper_berth', 0)
+        sleeper = day_data.sleeper_berth
         if sleeper > 0:
-            segments.append({
-                'status': 'sleeper_berth',
-                'start_hour': current_hour,
-                'duration': sleeper
-            })
+            segments.append(Segment(current_hour * 60, sleeper * 60, 'sleeper_berth'))
             current_hour += sleeper
         
         # Fill remaining with off duty
         if current_hour < 24:
-            segments.append({
-                'status': 'off_duty',
-                'start_hour': current_hour,
-                'duration': 24 - current_hour
-            })
+            segments.append(Segment(current_hour * 60, (24 - current_hour) * 60, 'off_duty'))
         
         return segments
     
-    def _draw_totals(self, draw, day_data):
-        """Draw the totals section"""
+    def _draw_totals_frame(self, draw):
+        """Draw the totals heading"""
         y_start = self.grid_start_y + self.grid_height + 40
         x_start = self.grid_start_x + self.grid_width - 200
         
         draw.text((x_start, y_start), "TOTAL HOURS", 
                  fill='black', font=self.font_medium)
-        
-        y_start += 25
+    
+    def _draw_totals(self, draw, day_data):
+        """Draw the totals section"""
+        y_start = self.grid_start_y + self.grid_height + 40 + 25
+        x_start = self.grid_start_x + self.grid_width - 200
         totals = [
-            ('Off Duty:', day_data.get('off_duty', 0)),
-            ('Sleeper:', day_data.get('sleeper_berth', 0)),
-            ('Driving:', day_data.get('driving', 0)),
-            ('On Duty:', day_data.get('on_duty_not_driving', 0))
+            ('Off Duty:', day_data.off_duty),
+            ('Sleeper:', day_data.sleeper_berth),
+            ('Driving:', day_data.driving),
+            ('On Duty:', day_data.on_duty_not_driving)
         ]
         
         for label, hours in totals:
@@ -275,17 +333,20 @@ class LogSheetDrawer:
                      fill='black', font=self.font_small)
             y_start += 20
     
-    def _draw_remarks(self, draw, day_data):
-        """Draw the remarks section"""
+    def _draw_remarks_frame(self, draw):
+        """Draw the empty remarks box"""
         y_start = self.grid_start_y + self.grid_height + 40
         
-        # Draw remarks box
         draw.rectangle([(50, y_start), (self.grid_start_x + self.grid_width - 250, y_start + 100)], 
                       outline='black')
         draw.text((55, y_start + 5), "REMARKS:", fill='black', font=self.font_medium)
+    
+    def _draw_remarks(self, draw, day_data):
+        """Draw the remarks section"""
+        y_start = self.grid_start_y + self.grid_height + 40
         
         # Add any remarks from day_data
-        remarks = day_data.get('remarks', [])
+        remarks = day_data.remarks
         y_offset = 25
         for remark in remarks[:3]:  # Limit to 3 remarks
             draw.text((60, y_start + y_offset), remark, 
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.7 on 2026-10-17 10:35
+
+from django.db import migrations, models
+import logs.models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DriverCycleState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('driver_id', models.CharField(max_length=64, unique=True)),
+                ('ring', models.JSONField(default=logs.models._empty_ring, help_text='On-duty minutes per day slot (day ordinal % 8)')),
+                ('last_day', models.DateField(blank=True, null=True)),
+                ('off_duty_streak_minutes', models.FloatField(default=0)),
+                ('last_restart', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['driver_id'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-17 11:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='drivercyclestate',
+            name='previous_state',
+            field=models.JSONField(blank=True, help_text='Ledger state before last_day was logged, so that day can be logged again as a correction', null=True),
+        ),
+    ]
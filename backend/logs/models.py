@@ -1,3 +1,68 @@
-from django.db import models
+from datetime import date
 
-# Create your models here.
+from django.db import models, transaction
+
+from .cycle import CYCLE_DAYS, CycleLedger
+
+
+def _empty_ring():
+    return [0] * CYCLE_DAYS
+
+
+class DriverCycleState(models.Model):
+    """
+    Persisted CycleLedger for one driver: the 8-day ring of on-duty minutes
+    plus the bookkeeping needed to keep updating it incrementally.
+    """
+    driver_id = models.CharField(max_length=64, unique=True)
+    ring = models.JSONField(default=_empty_ring, help_text="On-duty minutes per day slot (day ordinal % 8)")
+    last_day = models.DateField(null=True, blank=True)
+    off_duty_streak_minutes = models.FloatField(default=0)
+    last_restart = models.DateField(null=True, blank=True)
+    previous_state = models.JSONField(
+        null=True, blank=True,
+        help_text="Ledger state before last_day was logged, so that day can be logged again as a correction"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['driver_id']
+
+    def __str__(self):
+        return self.driver_id
+
+    def get_ledger(self) -> CycleLedger:
+        return CycleLedger(
+            slots=self.ring,
+            last_day=self.last_day.toordinal() if self.last_day else None,
+            off_duty_streak=self.off_duty_streak_minutes,
+            last_restart=self.last_restart.toordinal() if self.last_restart else None,
+            previous=self.previous_state,
+        )
+
+    def set_ledger(self, ledger: CycleLedger) -> None:
+        self.ring = list(ledger.slots)
+        self.last_day = date.fromordinal(ledger.last_day) if ledger.last_day else None
+        self.off_duty_streak_minutes = ledger.off_duty_streak
+        self.last_restart = date.fromordinal(ledger.last_restart) if ledger.last_restart else None
+        self.previous_state = ledger.previous
+
+    @classmethod
+    def log_day(cls, driver_id: str, day: date, on_duty_minutes: float, segments=None) -> 'DriverCycleState':
+        """Fold one logged day into the driver's ledger under a row lock"""
+        with transaction.atomic():
+            state, _ = cls.objects.select_for_update().get_or_create(driver_id=driver_id)
+            ledger = state.get_ledger()
+            ledger.log_day(day, on_duty_minutes, segments)
+            state.set_ledger(ledger)
+            state.save()
+        return state
+
+    @classmethod
+    def used_hours(cls, driver_ids, as_of: date = None) -> dict:
+        """Cycle hours used per driver in one query; unknown drivers have used none"""
+        states = {s.driver_id: s for s in cls.objects.filter(driver_id__in=list(driver_ids))}
+        return {
+            driver_id: (states[driver_id].get_ledger().used_minutes(as_of) / 60 if driver_id in states else 0.0)
+            for driver_id in driver_ids
+        }
@@ -0,0 +1,175 @@
+# backend/logs/svg_drawer.py
+import threading
+from xml.sax.saxutils import escape
+
+# Static markup keyed by sheet geometry, built once per process
+_TEMPLATE_CACHE = {}
+_TEMPLATE_LOCK = threading.Lock()
+
+STATUS_ROWS = {
+    'off_duty': 0,
+    'sleeper_berth': 1,
+    'driving': 2,
+    'on_duty_not_driving': 3,
+}
+
+
+def _n(value):
+    """Compact coordinate: one decimal, no trailing zeros"""
+    text = f"{value:.1f}"
+    return text[:-2] if text.endswith('.0') else text
+
+
+class SVGLogSheetDrawer:
+    """
+    Vector twin of LogSheetDrawer with the same 1200x800 layout.
+    The header, boxes and grid are a cached markup prefix; each sheet only
+    appends its text values and three paths (driving, other statuses and
+    status-change connectors), so a sheet is a few KB of text.
+    """
+
+    def __init__(self):
+        self.width = 1200
+        self.height = 800
+        self.grid_start_x = 150
+        self.grid_start_y = 250
+        self.grid_width = 960
+        self.grid_height = 320
+
+    def warm_up(self):
+        """Build the static markup now so the first request does not pay for it"""
+        self._get_static_template()
+
+    def render_svg(self, day_data, date, driver_info):
+        """Returns the sheet as an SVG document string"""
+        parts = [self._get_static_template()]
+        self._draw_info_values(parts, date, driver_info)
+        self._draw_duty_status_lines(parts, day_data)
+        self._draw_totals(parts, day_data)
+        self._draw_remarks(parts, day_data)
+        parts.append('</svg>')
+        return ''.join(parts)
+
+    def _get_static_template(self):
+        key = (self.width, self.height, self.grid_start_x, self.grid_start_y, self.grid_width, self.grid_height)
+        template = _TEMPLATE_CACHE.get(key)
+        if template is None:
+            with _TEMPLATE_LOCK:
+                template = _TEMPLATE_CACHE.get(key)
+                if template is None:
+                    template = self._render_static_template()
+                    _TEMPLATE_CACHE[key] = template
+        return template
+
+    @staticmethod
+    def _text(parts, x, y, text, size, **attrs):
+        # y is the top of the text box, matching PIL's default anchor
+        extra = ''.join(f' {name.replace("_", "-")}="{value}"' for name, value in attrs.items())
+        parts.append(f'<text x="{_n(x)}" y="{_n(y + size * 0.8)}" font-size="{size}"{extra}>{escape(str(text))}</text>')
+
+    def _render_static_template(self):
+        parts = [
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {self.width} {self.height}" '
+            f'width="{self.width}" height="{self.height}" font-family="Arial, Helvetica, sans-serif">',
+            f'<rect width="{self.width}" height="{self.height}" fill="#fff"/>',
+        ]
+        # Header
+        self._text(parts, self.width / 2, 20, "DRIVER'S DAILY LOG", 20, text_anchor='middle', font_weight='bold')
+        self._text(parts, self.width / 2, 49, "(ONE CALENDAR DAY - 24 HOURS)", 12, text_anchor='middle')
+
+        # Info boxes
+        boxes = [
+            (50, 100, 300, "Date:"), (320, 100, 600, "Driver:"),
+            (50, 140, 300, "From:"), (320, 140, 600, "To:"),
+            (50, 180, 400, "Carrier:"), (420, 180, 700, "Truck/Trailer:"),
+        ]
+        parts.append('<g fill="none" stroke="#000">')
+        for x1, y1, x2, _ in boxes:
+            parts.append(f'<rect x="{x1}" y="{y1}" width="{x2 - x1}" height="30"/>')
+        parts.append('</g>')
+        for x1, y1, _, label in boxes:
+            self._text(parts, x1 + 5, y1 + 5, label, 14)
+
+        # Grid: quarter-hour marks, hour lines, status rows, labels
+        hour_width = self.grid_width / 24
+        status_height = self.grid_height / 4
+        top, left = self.grid_start_y, self.grid_start_x
+        bottom, right = top + self.grid_height, left + self.grid_width
+        quarters = ''.join(
+            f'M{_n(left + hour * hour_width + q * hour_width / 4)} {top}V{bottom}'
+            for hour in range(24) for q in range(1, 4)
+        )
+        parts.append(f'<path d="{quarters}" stroke="#d3d3d3" stroke-width="1"/>')
+        grey = ''.join(f'M{_n(left + h * hour_width)} {top}V{bottom}' for h in range(25) if h % 6)
+        parts.append(f'<path d="{grey}" stroke="#808080" stroke-width="1"/>')
+        for hour in (6, 12, 18):
+            parts.append(f'<path d="M{_n(left + hour * hour_width)} {top}V{bottom}" stroke="#000" stroke-width="1"/>')
+        rows = ''.join(f'M{left} {_n(top + i * status_height)}H{right}' for i in range(1, 4))
+        parts.append(f'<path d="{rows}" stroke="#000" stroke-width="1"/>')
+        parts.append(f'<path d="M{left} {top}H{right}M{left} {bottom}H{right}M{left} {top}V{bottom}M{right} {top}V{bottom}" '
+                     f'stroke="#000" stroke-width="2"/>')
+        for hour in range(24):
+            self._text(parts, left + hour * hour_width + hour_width / 2, top - 16, hour, 12, text_anchor='middle')
+        for i, label in enumerate(['Off Duty', 'Sleeper Berth', 'Driving']):
+            self._text(parts, 70, top + i * status_height + status_height / 2 - 7, label, 14)
+        self._text(parts, 70, top + 3 * status_height + status_height / 2 - 16, 'On Duty', 14)
+        self._text(parts, 70, top + 3 * status_height + status_height / 2, '(Not Driving)', 14)
+
+        # Totals heading and remarks box
+        frame_top = bottom + 40
+        self._text(parts, right - 200, frame_top, "TOTAL HOURS", 14)
+        parts.append(f'<rect x="50" y="{frame_top}" width="{right - 250 - 50}" height="100" fill="none" stroke="#000"/>')
+        self._text(parts, 55, frame_top + 5, "REMARKS:", 14)
+        return ''.join(parts)
+
+    def _draw_info_values(self, parts, date, driver_info):
+        values = [
+            (100, 100, date.strftime("%m/%d/%Y")),
+            (380, 100, driver_info.get('name', 'Driver')),
+            (100, 140, driver_info.get('from', '—')),
+            (370, 140, driver_info.get('to', '—')),
+            (110, 180, driver_info.get('carrier', '—')),
+            (520, 180, driver_info.get('truck', '—')),
+        ]
+        for x, y, text in values:
+            self._text(parts, x, y + 5, text, 14)
+
+    def _draw_duty_status_lines(self, parts, day_data):
+        """Plots the day's timeline Segments, as LogSheetDrawer does"""
+        status_height = self.grid_height / 4
+        minute_width = self.grid_width / (24 * 60)
+        driving, other, connectors = [], [], []
+        previous_y = None
+        for segment in day_data.segments:
+            status, start, duration = segment.status, segment.start_minute, segment.duration
+            if status not in STATUS_ROWS:
+                continue
+            y = _n(self.grid_start_y + STATUS_ROWS[status] * status_height + status_height / 2)
+            x_start = _n(self.grid_start_x + start * minute_width)
+            x_end = _n(self.grid_start_x + (start + duration) * minute_width)
+            if previous_y is not None and previous_y != y:
+                connectors.append(f'M{x_start} {previous_y}V{y}')
+            (driving if status == 'driving' else other).append(f'M{x_start} {y}H{x_end}')
+            previous_y = y
+        for path, width in ((connectors, 2), (other, 3), (driving, 4)):
+            if path:
+                parts.append(f'<path d="{"".join(path)}" stroke="#008000" stroke-width="{width}" fill="none"/>')
+
+    def _draw_totals(self, parts, day_data):
+        y = self.grid_start_y + self.grid_height + 40 + 25
+        x = self.grid_start_x + self.grid_width - 200
+        totals = [
+            ('Off Duty:', day_data.off_duty),
+            ('Sleeper:', day_data.sleeper_berth),
+            ('Driving:', day_data.driving),
+            ('On Duty:', day_data.on_duty_not_driving),
+        ]
+        for label, hours in totals:
+            self._text(parts, x, y, f"{label} {hours:.1f}", 12)
+            y += 20
+
+    def _draw_remarks(self, parts, day_data):
+        y = self.grid_start_y + self.grid_height + 40 + 25
+        for remark in day_data.remarks[:3]:
+            self._text(parts, 60, y, remark, 12)
+            y += 20
@@ -1,3 +1,147 @@
-from django.test import TestCase
+# backend/logs/tests.py
+from datetime import date, timedelta
+from xml.etree import ElementTree
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from api.services.timeline import DRIVING, OFF_DUTY, ON_DUTY_NOT_DRIVING, SLEEPER_BERTH, Segment
+from api.services.trip_plan import DutyDay
+from .cycle import CycleLedger
+from .models import DriverCycleState
+from .svg_drawer import SVGLogSheetDrawer
 
-# Create your tests here.
+SVG = '{http://www.w3.org/2000/svg}'
+
+DAY = date(2024, 3, 4)
+
+
+def _segments(*pairs):
+    return [{'status': status, 'duration': minutes} for status, minutes in pairs]
+
+
+class CycleLedgerTests(SimpleTestCase):
+    def test_window_drops_days_older_than_eight(self):
+        ledger = CycleLedger()
+        for i in range(9):
+            ledger.log_day(DAY + timedelta(days=i), 600)
+        self.assertEqual(ledger.used_minutes(), 8 * 600)
+        self.assertEqual(ledger.used_minutes(DAY + timedelta(days=9)), 7 * 600)
+        # Two idle days after a 14-hour evening off add up to a restart
+        self.assertEqual(ledger.used_minutes(DAY + timedelta(days=10)), 0)
+
+    def test_34_hours_off_across_midnight_is_a_restart(self):
+        ledger = CycleLedger()
+        ledger.log_day(DAY, 600, _segments(('off_duty', 540), ('driving', 600), ('off_duty', 300)))
+        ledger.log_day(DAY + timedelta(days=1), 0, _segments(('off_duty', 1440)))
+        self.assertEqual(ledger.used_minutes(), 600)  # 29 hours off so far
+        ledger.log_day(DAY + timedelta(days=2), 300,
+                       _segments(('off_duty', 480), ('driving', 300), ('off_duty', 660)))
+        self.assertEqual(ledger.used_minutes(), 300)
+        self.assertEqual(ledger.last_restart, (DAY + timedelta(days=2)).toordinal())
+
+    def test_unlogged_days_count_as_off_duty(self):
+        ledger = CycleLedger()
+        ledger.log_day(DAY, 600)
+        ledger.log_day(DAY + timedelta(days=3), 60)
+        self.assertEqual(ledger.used_minutes(), 60)
+        self.assertEqual(ledger.last_restart, (DAY + timedelta(days=2)).toordinal())
+
+    def test_relogging_a_day_replaces_it(self):
+        ledger = CycleLedger()
+        ledger.log_day(DAY, 300)
+        ledger.log_day(DAY + timedelta(days=1), 600)
+        ledger.log_day(DAY + timedelta(days=1), 480)
+        self.assertEqual(ledger.used_minutes(), 780)
+
+    def test_relogging_an_off_day_does_not_fake_a_restart(self):
+        ledger = CycleLedger()
+        ledger.log_day(DAY, 600, _segments(('off_duty', 600), ('driving', 600), ('off_duty', 240)))
+        day = DAY + timedelta(days=1)
+        # 28 hours off; counting the day twice would make it 52 and wipe the cycle
+        ledger.log_day(day, 0, _segments(('off_duty', 1440)))
+        ledger.log_day(day, 0, _segments(('off_duty', 1440)))
+        self.assertEqual(ledger.used_minutes(), 600)
+        self.assertEqual(ledger.off_duty_streak, 1680)
+        self.assertIsNone(ledger.last_restart)
+
+    def test_relogging_undoes_a_restart_the_day_completed(self):
+        ledger = CycleLedger()
+        ledger.log_day(DAY, 600, _segments(('off_duty', 600), ('driving', 600), ('off_duty', 240)))
+        ledger.log_day(DAY + timedelta(days=1), 0, _segments(('off_duty', 1440)))
+        ledger.log_day(DAY + timedelta(days=2), 0, _segments(('off_duty', 1440)))
+        self.assertEqual(ledger.used_minutes(), 0)
+        ledger.log_day(DAY + timedelta(days=2), 600, _segments(('driving', 600), ('off_duty', 840)))
+        self.assertEqual(ledger.used_minutes(), 1200)
+        self.assertIsNone(ledger.last_restart)
+
+    def test_earlier_days_are_rejected_without_changing_state(self):
+        ledger = CycleLedger()
+        ledger.log_day(DAY, 600)
+        state = ledger.to_state()
+        with self.assertRaises(ValueError):
+            ledger.log_day(DAY - timedelta(days=1), 60)
+        self.assertEqual(ledger.to_state(), state)
+
+    def test_day_logged_without_a_snapshot_cannot_be_replaced(self):
+        ledger = CycleLedger(slots=[60] + [0] * 7, last_day=DAY.toordinal())
+        with self.assertRaises(ValueError):
+            ledger.log_day(DAY, 120)
+
+
+class DriverCycleStateTests(TestCase):
+    def test_correction_is_persisted_and_applied(self):
+        DriverCycleState.log_day('d1', DAY, 600)
+        DriverCycleState.log_day('d1', DAY + timedelta(days=1), 600)
+        DriverCycleState.log_day('d1', DAY + timedelta(days=1), 120)
+        self.assertEqual(DriverCycleState.used_hours(['d1'], DAY + timedelta(days=1)), {'d1': 12.0})
+
+    def test_duty_day_endpoint_accepts_a_correction(self):
+        url = reverse('driver-duty-days', args=['d2'])
+        self.client.post(url, {'date': DAY.isoformat(), 'on_duty_hours': 10}, content_type='application/json')
+        response = self.client.post(url, {'date': DAY.isoformat(), 'on_duty_hours': 8},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['used_hours'], 8)
+        response = self.client.post(url, {'date': (DAY - timedelta(days=1)).isoformat(), 'on_duty_hours': 8},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class SVGLogSheetDrawerTests(SimpleTestCase):
+    def _render(self, segments, driver_info=None, remarks=()):
+        day = DutyDay.from_segments(segments)
+        day.remarks = remarks
+        svg = SVGLogSheetDrawer().render_svg(day, DAY, driver_info or {'name': 'Driver'})
+        return ElementTree.fromstring(svg)
+
+    def _duty_paths(self, root):
+        # Duty-status lines are the only green strokes, one path per group
+        return {path.get('stroke-width'): path.get('d') for path in root.iter(f'{SVG}path')
+                if path.get('stroke') == '#008000'}
+
+    def test_sheet_is_valid_svg_with_one_path_per_status_group(self):
+        root = self._render([
+            Segment(0, 360, OFF_DUTY), Segment(360, 240, DRIVING), Segment(600, 30, ON_DUTY_NOT_DRIVING),
+            Segment(630, 180, DRIVING), Segment(810, 600, SLEEPER_BERTH), Segment(1410, 30, OFF_DUTY),
+        ])
+        self.assertEqual(root.tag, f'{SVG}svg')
+        self.assertEqual(root.get('viewBox'), '0 0 1200 800')
+        paths = self._duty_paths(root)
+        self.assertEqual(set(paths), {'2', '3', '4'})
+        # Connectors, then off duty/sleeper/on duty, then driving
+        self.assertEqual(paths['2'].count('M'), 5)
+        self.assertEqual(paths['3'].count('M'), 4)
+        self.assertEqual(paths['4'].count('M'), 2)
+
+    def test_empty_groups_are_left_out(self):
+        paths = self._duty_paths(self._render([Segment(0, 1440, OFF_DUTY)]))
+        self.assertEqual(set(paths), {'3'})
+
+    def test_driver_text_is_escaped(self):
+        name = 'Bob <b>& "Sons"</b>'
+        root = self._render([Segment(0, 1440, OFF_DUTY)], {'name': name, 'carrier': 'A&B <Freight>'},
+                            remarks=['Fuel <stop> & rest'])
+        texts = [text.text for text in root.iter(f'{SVG}text')]
+        self.assertIn(name, texts)
+        self.assertIn('A&B <Freight>', texts)
+        self.assertIn('Fuel <stop> & rest', texts)
+        self.assertEqual(list(root.iter(f'{SVG}b')), [])
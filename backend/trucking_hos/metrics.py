@@ -0,0 +1,107 @@
+# backend/trucking_hos/metrics.py
+import threading
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+# Seconds; spans sub-millisecond planning up to multi-second renders
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus model; observe() is O(log buckets)"""
+
+    __slots__ = ('buckets', 'counts', 'total', 'count', '_lock')
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+    def snapshot(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            return list(self.counts), self.total, self.count
+
+
+class MetricsRegistry:
+    """
+    In-process histograms keyed by metric name and label values. Each worker
+    process keeps its own registry; renders done in a process pool are not
+    observed here.
+    """
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], Histogram] = {}
+        self._help: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, help_text: str = '', **labels) -> Histogram:
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    histogram = Histogram()
+                    self._histograms[key] = histogram
+                    self._help.setdefault(name, help_text)
+        return histogram
+
+    def observe(self, name: str, value: float, help_text: str = '', **labels) -> None:
+        self.histogram(name, help_text, **labels).observe(value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._help.clear()
+
+    def render(self, samples: Optional[Dict[str, Tuple[str, str, float]]] = None) -> str:
+        """
+        Prometheus text exposition format (version 0.0.4). samples adds
+        unlabelled values owned elsewhere, as name -> (type, help, value).
+        """
+        lines = []
+        with self._lock:
+            items = sorted(self._histograms.items())
+            help_texts = dict(self._help)
+        current = None
+        for (name, labels), histogram in items:
+            if name != current:
+                current = name
+                if help_texts.get(name):
+                    lines.append(f"# HELP {name} {help_texts[name]}")
+                lines.append(f"# TYPE {name} histogram")
+            counts, total, count = histogram.snapshot()
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f"{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {total!r}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+        for name, (metric_type, help_text, value) in sorted((samples or {}).items()):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"{name} {value}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+registry = MetricsRegistry()
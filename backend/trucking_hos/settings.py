@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/4.2/ref/settings/
 
 from pathlib import Path
 import os
+from importlib.util import find_spec
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -59,7 +60,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'trucking_hos.middleware.AsyncWhiteNoiseMiddleware',
 ]
 
 CORS_ALLOWED_ORIGINS = [
@@ -87,12 +88,54 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
     ],
+    # orjson-backed JSON first (the default for */*); MessagePack when installed
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-    ],
+        'api.renderers.ORJSONRenderer',
+    ] + (['api.renderers.MessagePackRenderer'] if find_spec('msgpack') else []),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
 }
 
+# ELD log rendering: 'serial', 'thread' or 'process'. Trips with fewer days
+# than LOG_RENDER_MIN_PARALLEL_DAYS always render serially.
+LOG_RENDER_EXECUTOR = os.getenv('LOG_RENDER_EXECUTOR', 'serial')
+LOG_RENDER_WORKERS = int(os.getenv('LOG_RENDER_WORKERS', '0')) or None
+LOG_RENDER_MIN_PARALLEL_DAYS = int(os.getenv('LOG_RENDER_MIN_PARALLEL_DAYS', '3'))
+# Threads the async trip endpoint hands HOS planning and log rendering to (per process)
+ASYNC_RENDER_WORKERS = int(os.getenv('ASYNC_RENDER_WORKERS', '4'))
+
+# Upper bound on trips accepted by one bulk planning request
+BULK_TRIP_MAX_TRIPS = int(os.getenv('BULK_TRIP_MAX_TRIPS', '50000'))
+
+# Fleet earliest-arrival simulation: drivers are planned on a 'serial',
+# 'thread' or 'process' pool; fleets smaller than FLEET_SIM_MIN_PARALLEL_DRIVERS
+# stay serial, where pool overhead would outweigh the planning itself.
+# Process pools start their workers from a forkserver, not the web worker.
+FLEET_SIM_EXECUTOR = os.getenv('FLEET_SIM_EXECUTOR', 'process')
+FLEET_SIM_WORKERS = int(os.getenv('FLEET_SIM_WORKERS', '0')) or None
+FLEET_SIM_MIN_PARALLEL_DRIVERS = int(os.getenv('FLEET_SIM_MIN_PARALLEL_DRIVERS', '500'))
+FLEET_SIM_MAX_DRIVERS = int(os.getenv('FLEET_SIM_MAX_DRIVERS', '20000'))
+
+# Background trip jobs (POST /api/trip-jobs/): each process plans them on
+# WORKERS threads and accepts at most MAX_PENDING queued or running. Results
+# are kept RESULT_TTL seconds; GET long-polls for at most MAX_WAIT seconds; jobs
+# still in flight after TIMEOUT seconds (their process died) are failed.
+TRIP_JOBS = {
+    'WORKERS': int(os.getenv('TRIP_JOB_WORKERS', '2')),
+    'MAX_PENDING': int(os.getenv('TRIP_JOB_MAX_PENDING', '100')),
+    'RESULT_TTL': int(os.getenv('TRIP_JOB_RESULT_TTL', '3600')),
+    'MAX_WAIT': float(os.getenv('TRIP_JOB_MAX_WAIT', '30')),
+    'TIMEOUT': int(os.getenv('TRIP_JOB_TIMEOUT', '900')),
+}
+
+# Soft search time for planning_mode 'optimized' per trip; the greedy plan is
+# returned when the split sleeper-berth search does not finish in time
+HOS_OPTIMIZER_BUDGET_MS = float(os.getenv('HOS_OPTIMIZER_BUDGET_MS', '50'))
+
+# Build the planner, fleet simulator and log sheet templates when the WSGI/ASGI
+# application loads (before forking under gunicorn --preload) instead of on
+# each worker's first request
+WARM_UP_ON_START = os.getenv('WARM_UP_ON_START', '1') == '1'
+
 # Add SPECTACULAR settings
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Trucking HOS Planner API',
@@ -135,6 +178,65 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Add a shared backend (e.g. Redis or Memcached) under another alias and point
+# ROUTE_CACHE_SHARED_ALIAS at it to share routes between workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'trucking-hos-default',
+    },
+}
+
+ROUTE_CACHE = {
+    'MAX_ENTRIES': int(os.getenv('ROUTE_CACHE_MAX_ENTRIES', '1024')),
+    'TTL': int(os.getenv('ROUTE_CACHE_TTL', '3600')),  # seconds
+    'SHARED_ALIAS': os.getenv('ROUTE_CACHE_SHARED_ALIAS') or None,
+}
+
+# Rendered calculate-trip responses, keyed by the canonical request hash (also the ETag)
+RESPONSE_CACHE = {
+    'MAX_ENTRIES': int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '256')),
+    'MAX_BYTES': int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(32 * 1024 * 1024))),
+    'TTL': int(os.getenv('RESPONSE_CACHE_TTL', '600')),  # seconds
+}
+
+
+# Routing backend: 'mock' (fixed demo route), 'http' (generic JSON contract,
+# e.g. `python manage.py run_route_stub`) or 'ors' (OpenRouteService).
+# TIMEOUT is per leg request in seconds; RETRIES covers connection errors and 429/5xx.
+# POOL_SIZE keep-alive connections are shared by LEG_WORKERS threads per process
+# that fetch the legs of every trip concurrently.
+ROUTE_PROVIDER = {
+    'BACKEND': os.getenv('ROUTE_PROVIDER', 'mock'),
+    'BASE_URL': os.getenv('ROUTE_PROVIDER_URL', ''),
+    'API_KEY': os.getenv('ORS_API_KEY', ''),
+    'TIMEOUT': float(os.getenv('ROUTE_PROVIDER_TIMEOUT', '5')),
+    'RETRIES': int(os.getenv('ROUTE_PROVIDER_RETRIES', '2')),
+    'POOL_SIZE': int(os.getenv('ROUTE_PROVIDER_POOL_SIZE', '16')),
+    'LEG_WORKERS': int(os.getenv('ROUTE_PROVIDER_LEG_WORKERS', '16')),
+}
+
+
+# Offline geocoder: CSV with city,state,lat,lng columns. Empty uses the
+# bundled api/data/us_cities.csv.
+GEOCODER = {
+    'GAZETTEER': os.getenv('GEOCODER_GAZETTEER', ''),
+}
+
+# Truck stops / fuel stations that planned rests, breaks and fuel stops snap
+# to: facilities within CORRIDOR_MILES of the route, at most LOOKBACK_MILES
+# before the point where the stop falls due. DATASET defaults to the bundled CSV.
+POI = {
+    'ENABLED': os.getenv('POI_ENABLED', '1') == '1',
+    'DATASET': os.getenv('POI_DATASET', ''),
+    'CORRIDOR_MILES': float(os.getenv('POI_CORRIDOR_MILES', '10')),
+    'LOOKBACK_MILES': float(os.getenv('POI_LOOKBACK_MILES', '60')),
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -177,6 +279,15 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Log sheets stored for log_image_mode 'url' (MEDIA_ROOT/log_sheets). Sheets not
+# rendered again for TTL seconds are deleted, then the oldest until the store is
+# under MAX_BYTES. A sweep runs on save, at most every PURGE_INTERVAL seconds per process.
+SHEET_STORE = {
+    'TTL': int(os.getenv('SHEET_STORE_TTL', str(24 * 3600))),
+    'MAX_BYTES': int(os.getenv('SHEET_STORE_MAX_BYTES', str(512 * 1024 * 1024))),
+    'PURGE_INTERVAL': int(os.getenv('SHEET_STORE_PURGE_INTERVAL', '300')),
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
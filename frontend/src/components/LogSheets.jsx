@@ -13,11 +13,15 @@ export default function LogSheets({ sheets }) {
                 Driving: {sheet.driving_hours}h • On Duty: {sheet.on_duty_hours}h • Off Duty: {sheet.off_duty_hours}h
               </div>
             </div>
-            {sheet.log_image && sheet.log_image.startsWith("base64_") === false ? (
+            {sheet.log_svg || sheet.log_image_url || (sheet.log_image && sheet.log_image.startsWith("base64_") === false) ? (
               <img
                 className="w-full max-h-[700px] object-contain bg-gray-50"
                 alt={`Log sheet day ${sheet.day}`}
-                src={`data:image/png;base64,${sheet.log_image}`}
+                src={
+                  sheet.log_svg
+                    ? `data:image/svg+xml;charset=utf-8,${encodeURIComponent(sheet.log_svg)}`
+                    : sheet.log_image_url || `data:image/png;base64,${sheet.log_image}`
+                }
               />
             ) : (
               <div className="p-6 text-gray-700 bg-yellow-50 rounded">